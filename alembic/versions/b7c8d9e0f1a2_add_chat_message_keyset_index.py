@@ -0,0 +1,30 @@
+"""add_chat_message_keyset_index
+
+Revision ID: b7c8d9e0f1a2
+Revises: abc789def012
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c8d9e0f1a2'
+down_revision: Union[str, None] = 'abc789def012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keyset pagination of channel messages on (channel_id, created_at, id)
+    op.create_index(
+        'ix_chat_messages_channel_created_id',
+        'chat_messages',
+        ['channel_id', 'created_at', 'id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_chat_messages_channel_created_id', table_name='chat_messages')
@@ -0,0 +1,30 @@
+"""add_trades_user_status_close_index
+
+Revision ID: c8d9e0f1a2b3
+Revises: g6f7e8d9c0a1
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8d9e0f1a2b3'
+down_revision: Union[str, None] = 'g6f7e8d9c0a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Trade history: filter by user and status, order and page by close time
+    op.create_index(
+        'idx_trades_user_status_close',
+        'trades',
+        ['user_id', 'status', 'close_time']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_trades_user_status_close', table_name='trades')
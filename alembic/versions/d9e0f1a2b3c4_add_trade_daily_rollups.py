@@ -0,0 +1,75 @@
+"""add_trade_daily_rollups
+
+Revision ID: d9e0f1a2b3c4
+Revises: c8d9e0f1a2b3
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9e0f1a2b3c4'
+down_revision: Union[str, None] = 'c8d9e0f1a2b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Per-day closed trade aggregates keyed by user, strategy, symbol and day
+    op.create_table(
+        'trade_daily_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('strategy_id', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('symbol', sa.String(length=20), nullable=False),
+        sa.Column('trade_date', sa.Date(), nullable=False),
+        sa.Column('trade_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('winning_trades', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('losing_trades', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('total_pnl', sa.Numeric(precision=14, scale=2), nullable=False, server_default='0'),
+        sa.Column('gross_profit', sa.Numeric(precision=14, scale=2), nullable=False, server_default='0'),
+        sa.Column('gross_loss', sa.Numeric(precision=14, scale=2), nullable=False, server_default='0'),
+        sa.Column('max_win', sa.Numeric(precision=12, scale=2), nullable=True),
+        sa.Column('max_loss', sa.Numeric(precision=12, scale=2), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'strategy_id', 'symbol', 'trade_date', name='uq_trade_rollups_key')
+    )
+    op.create_index(op.f('ix_trade_daily_rollups_id'), 'trade_daily_rollups', ['id'], unique=False)
+    op.create_index('idx_trade_rollups_user_date', 'trade_daily_rollups', ['user_id', 'trade_date'], unique=False)
+
+    # Seed rollups from existing trade history
+    op.execute("""
+        INSERT INTO trade_daily_rollups (
+            user_id, strategy_id, symbol, trade_date,
+            trade_count, winning_trades, losing_trades,
+            total_pnl, gross_profit, gross_loss, max_win, max_loss, updated_at
+        )
+        SELECT
+            user_id,
+            COALESCE(strategy_id, 0),
+            symbol,
+            DATE(close_time),
+            COUNT(id),
+            SUM(CASE WHEN COALESCE(realized_pnl, 0) > 0 THEN 1 ELSE 0 END),
+            SUM(CASE WHEN COALESCE(realized_pnl, 0) < 0 THEN 1 ELSE 0 END),
+            SUM(COALESCE(realized_pnl, 0)),
+            SUM(CASE WHEN realized_pnl > 0 THEN realized_pnl ELSE 0 END),
+            SUM(CASE WHEN realized_pnl < 0 THEN -realized_pnl ELSE 0 END),
+            MAX(CASE WHEN realized_pnl > 0 THEN realized_pnl END),
+            MIN(CASE WHEN realized_pnl < 0 THEN realized_pnl END),
+            CURRENT_TIMESTAMP
+        FROM trades
+        WHERE status = 'closed' AND close_time IS NOT NULL
+        GROUP BY user_id, COALESCE(strategy_id, 0), symbol, DATE(close_time)
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_trade_rollups_user_date', table_name='trade_daily_rollups')
+    op.drop_index(op.f('ix_trade_daily_rollups_id'), table_name='trade_daily_rollups')
+    op.drop_table('trade_daily_rollups')
@@ -0,0 +1,28 @@
+"""add_admin_metrics_range_indexes
+
+Revision ID: e0f1a2b3c4d5
+Revises: d9e0f1a2b3c4
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e0f1a2b3c4d5'
+down_revision: Union[str, None] = 'd9e0f1a2b3c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Range predicates used by the admin metrics snapshot
+    op.create_index(op.f('ix_users_created_at'), 'users', ['created_at'], unique=False)
+    op.create_index(op.f('ix_activated_strategies_last_triggered'), 'activated_strategies', ['last_triggered'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_activated_strategies_last_triggered'), table_name='activated_strategies')
+    op.drop_index(op.f('ix_users_created_at'), table_name='users')
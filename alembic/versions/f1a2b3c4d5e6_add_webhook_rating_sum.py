@@ -0,0 +1,37 @@
+"""add_webhook_rating_sum
+
+Revision ID: f1a2b3c4d5e6
+Revises: e0f1a2b3c4d5
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a2b3c4d5e6'
+down_revision: Union[str, None] = 'e0f1a2b3c4d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Running sum of ratings so votes update the average in O(1)
+    op.add_column('webhooks', sa.Column('rating_sum', sa.Integer(), nullable=False, server_default='0'))
+
+    # Rebuild sum, count and average from existing ratings
+    op.execute("""
+        UPDATE webhooks SET
+            rating_sum = COALESCE((SELECT SUM(r.rating) FROM webhook_ratings r WHERE r.webhook_id = webhooks.id), 0),
+            total_ratings = (SELECT COUNT(*) FROM webhook_ratings r WHERE r.webhook_id = webhooks.id)
+    """)
+    op.execute("""
+        UPDATE webhooks SET
+            rating = CASE WHEN total_ratings > 0 THEN CAST(rating_sum AS FLOAT) / total_ratings ELSE 0 END
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('webhooks', 'rating_sum')
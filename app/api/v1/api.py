@@ -2,6 +2,8 @@
 from fastapi import APIRouter, Depends
 import logging
 
+from app.core.lazy_imports import LazyRouter
+
 # Setup logging for import debugging
 logger = logging.getLogger(__name__)
 logger.info("Starting API router imports...")
@@ -10,12 +12,9 @@ try:
     from .endpoints import auth, broker, subscription, webhooks, strategy, tradovate, binance, futures_contracts
     logger.info("Basic endpoints imported successfully")
     
-    from .endpoints import admin
-    logger.info("Admin endpoint imported successfully")
-    
     # Import missing endpoints that are expected by frontend
-    from .endpoints import chat, feature_flags, interactivebrokers
-    logger.info("Chat, feature flags, and Interactive Brokers endpoints imported successfully")
+    from .endpoints import chat, feature_flags
+    logger.info("Chat and feature flags endpoints imported successfully")
 except Exception as e:
     logger.error(f"Error importing endpoints: {e}")
     import traceback
@@ -40,15 +39,12 @@ api_router.include_router(webhooks.router, prefix="/webhooks", tags=["webhooks"]
 api_router.include_router(strategy.router, prefix="/strategies", tags=["strategies"])
 api_router.include_router(subscription.router, prefix="/subscriptions", tags=["subscriptions"])
 
-# Register admin router with logging
-try:
-    logger.info("Registering admin router...")
-    api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
-    logger.info(f"Admin router registered successfully with {len(admin.router.routes)} routes")
-    for route in admin.router.routes:
-        logger.info(f"Admin route: {route.methods} {route.path}")
-except Exception as e:
-    logger.error(f"Error registering admin router: {e}")
+# Rarely used subsystems are imported on their first request instead of at
+# boot; main mounts these under /api/v1
+lazy_routers = {
+    "/admin": LazyRouter("app.api.v1.endpoints.admin"),
+    "/brokers/interactivebrokers": LazyRouter("app.api.v1.endpoints.interactivebrokers"),
+}
 
 # Register missing routers that are expected by frontend
 try:
@@ -60,9 +56,6 @@ try:
     api_router.include_router(feature_flags.router, prefix="/beta", tags=["features"])
     logger.info("Feature flags router registered")
     
-    api_router.include_router(interactivebrokers.router, prefix="/brokers/interactivebrokers", tags=["interactive-brokers"])
-    logger.info("Interactive Brokers router registered")
-    
     api_router.include_router(futures_contracts.router, prefix="/futures-contracts", tags=["futures-contracts"])
     logger.info("All missing routers registered successfully")
 except Exception as e:
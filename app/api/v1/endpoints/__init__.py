@@ -9,7 +9,6 @@ from . import strategy
 from . import subscriptions as subscription
 from . import tradovate
 from . import webhooks
-from . import admin
 
 __all__ = [
     "auth",
@@ -19,6 +18,5 @@ __all__ = [
     "strategy",
     "subscription",
     "tradovate",
-    "webhooks",
-    "admin"
+    "webhooks"
 ]
\ No newline at end of file
@@ -1,5 +1,6 @@
 # app/api/v1/endpoints/admin.py
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel, Field
@@ -24,6 +25,8 @@ from app.models.subscription import Subscription
 from app.models.chat import UserChatRole
 from app.core.config import settings
 from app.models.maintenance import MaintenanceSettings
+from app.services.admin_metrics import admin_metrics_snapshot
+from app.services.admin_users import get_user_directory_page, iter_user_export
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -108,11 +111,15 @@ class AdminOverviewStats(BaseModel):
     active_users: int
     trades_today: int
     total_revenue: float
+    snapshot_at: Optional[str] = None
+    snapshot_age_seconds: Optional[float] = None
     
 class UserMetrics(BaseModel):
     total: int
     by_tier: Dict[str, int]
     growth_rate: float
+    snapshot_at: Optional[str] = None
+    snapshot_age_seconds: Optional[float] = None
 
 # Add new models for comprehensive system status
 class ServiceStatus(BaseModel):
@@ -372,64 +379,20 @@ async def get_admin_overview_stats(
     db: Session = Depends(get_db),
     admin_user: User = Depends(get_admin_user)
 ):
-    """Get overview statistics for admin dashboard"""
+    """Get overview statistics for admin dashboard (served from the metrics snapshot)"""
     try:
-        # Total users
-        total_users = db.query(func.count(User.id)).scalar() or 0
-        
-        # New signups - today, this week, this month
-        today = datetime.utcnow().date()
-        week_ago = today - timedelta(days=7)
-        month_ago = today - timedelta(days=30)
-        
-        new_signups_today = db.query(func.count(User.id)).filter(
-            func.date(User.created_at) == today
-        ).scalar() or 0
-        
-        new_signups_week = db.query(func.count(User.id)).filter(
-            User.created_at >= week_ago
-        ).scalar() or 0
-        
-        new_signups_month = db.query(func.count(User.id)).filter(
-            User.created_at >= month_ago
-        ).scalar() or 0
-        
-        # Active users (logged in within last 30 days)
-        # Assuming you have a last_login field or similar
-        # For now, let's count users with active subscriptions as active
-        active_users = db.query(func.count(distinct(Subscription.user_id))).filter(
-            Subscription.status == 'active'
-        ).scalar() or 0
-        
-        # Trades today - count strategies triggered today
-        trades_today = db.query(func.count(ActivatedStrategy.id)).filter(
-            func.date(ActivatedStrategy.last_triggered) == today
-        ).scalar() or 0
-        
-        # Total revenue (from active subscriptions)
-        # This is a simplified calculation
-        revenue_by_tier = {
-            'starter': 47,
-            'pro': 97,
-            'elite': 197
-        }
-        
-        total_revenue = 0
-        for tier, price in revenue_by_tier.items():
-            count = db.query(func.count(Subscription.id)).filter(
-                Subscription.tier == tier,
-                Subscription.status == 'active'
-            ).scalar() or 0
-            total_revenue += count * price
+        snapshot = await asyncio.to_thread(admin_metrics_snapshot.get_snapshot)
         
         return AdminOverviewStats(
-            total_users=total_users,
-            new_signups_today=new_signups_today,
-            new_signups_week=new_signups_week,
-            new_signups_month=new_signups_month,
-            active_users=active_users,
-            trades_today=trades_today,
-            total_revenue=total_revenue
+            total_users=snapshot["total_users"],
+            new_signups_today=snapshot["new_signups_today"],
+            new_signups_week=snapshot["new_signups_week"],
+            new_signups_month=snapshot["new_signups_month"],
+            active_users=snapshot["active_users"],
+            trades_today=snapshot["trades_today"],
+            total_revenue=snapshot["total_revenue"],
+            snapshot_at=snapshot["snapshot_at"],
+            snapshot_age_seconds=snapshot["snapshot_age_seconds"]
         )
         
     except Exception as e:
@@ -444,44 +407,16 @@ async def get_user_metrics(
     db: Session = Depends(get_db),
     admin_user: User = Depends(get_admin_user)
 ):
-    """Get detailed user metrics for admin dashboard"""
+    """Get detailed user metrics for admin dashboard (served from the metrics snapshot)"""
     try:
-        # Total users
-        total = db.query(func.count(User.id)).scalar() or 0
-        
-        # Users by subscription tier
-        by_tier = {}
-        for tier in ['starter', 'pro', 'elite']:
-            count = db.query(func.count(Subscription.id)).filter(
-                Subscription.tier == tier,
-                Subscription.status == 'active'
-            ).scalar() or 0
-            by_tier[tier] = count
-        
-        # Growth rate (comparing this month to last month)
-        today = datetime.utcnow().date()
-        this_month_start = today.replace(day=1)
-        last_month_start = (this_month_start - timedelta(days=1)).replace(day=1)
-        
-        users_this_month = db.query(func.count(User.id)).filter(
-            User.created_at >= this_month_start
-        ).scalar() or 0
-        
-        users_last_month = db.query(func.count(User.id)).filter(
-            and_(
-                User.created_at >= last_month_start,
-                User.created_at < this_month_start
-            )
-        ).scalar() or 0
-        
-        growth_rate = 0
-        if users_last_month > 0:
-            growth_rate = ((users_this_month - users_last_month) / users_last_month) * 100
+        snapshot = await asyncio.to_thread(admin_metrics_snapshot.get_snapshot)
         
         return UserMetrics(
-            total=total,
-            by_tier=by_tier,
-            growth_rate=round(growth_rate, 2)
+            total=snapshot["total_users"],
+            by_tier=snapshot["by_tier"],
+            growth_rate=snapshot["growth_rate"],
+            snapshot_at=snapshot["snapshot_at"],
+            snapshot_age_seconds=snapshot["snapshot_age_seconds"]
         )
         
     except Exception as e:
@@ -769,101 +704,15 @@ async def get_users_complete(
 ):
     """Get complete user data with roles, subscriptions, and account info"""
     try:
-        # Start with a simple base query
-        query = db.query(User)
-        
-        # Apply search filter
-        if search:
-            search_filter = or_(
-                User.username.ilike(f"%{search}%"),
-                User.email.ilike(f"%{search}%"),
-                User.full_name.ilike(f"%{search}%")
-            )
-            query = query.filter(search_filter)
-        
-        # Apply status filter
-        if status_param != "all":
-            if status_param == "active":
-                query = query.filter(User.is_active == True)
-            elif status_param == "inactive":
-                query = query.filter(User.is_active == False)
-            elif status_param == "admin":
-                query = query.filter(User.app_role == 'admin')
-        
-        # Get total count
-        total = query.count()
-        
-        # Apply pagination
-        users = query.offset(offset).limit(limit).all()
-        
-        # Build complete user objects
-        user_responses = []
-        for user in users:
-            try:
-                # Get user roles safely
-                user_roles = []
-                try:
-                    roles_query = db.query(UserChatRole.role_name).filter(
-                        UserChatRole.user_id == user.id,
-                        UserChatRole.is_active == True
-                    ).all()
-                    user_roles = [role[0] for role in roles_query]
-                except Exception as role_error:
-                    logger.warning(f"Could not fetch roles for user {user.id}: {role_error}")
-                    user_roles = []
-                
-                # Add admin role if app_role is admin
-                if user.is_admin() and "Admin" not in user_roles:
-                    user_roles.append("Admin")
-                
-                # Ensure at least "User" role
-                if not user_roles:
-                    user_roles = ["User"]
-                
-                # Get connected accounts count safely
-                connected_accounts = 0
-                try:
-                    connected_accounts = db.query(func.count(BrokerAccount.id)).filter(
-                        BrokerAccount.user_id == user.id
-                    ).scalar() or 0
-                except Exception as broker_error:
-                    logger.warning(f"Could not fetch broker accounts for user {user.id}: {broker_error}")
-                    connected_accounts = 0
-                
-                # Get subscription data safely
-                subscription_data = None
-                try:
-                    user_subscription = db.query(Subscription).filter(Subscription.user_id == user.id).first()
-                    if user_subscription:
-                        subscription_data = {
-                            "tier": user_subscription.tier,
-                            "status": user_subscription.status,
-                            "billing_interval": getattr(user_subscription, 'billing_interval', None)
-                        }
-                except Exception as sub_error:
-                    logger.warning(f"Could not fetch subscription for user {user.id}: {sub_error}")
-                    subscription_data = None
-                
-                user_response = UserCompleteResponse(
-                    id=user.id,
-                    username=user.username or "",
-                    email=user.email or "",
-                    full_name=user.full_name,
-                    phone=user.phone,
-                    is_active=user.is_active,
-                    app_role=user.app_role,
-                    profile_picture=user.profile_picture,
-                    created_at=user.created_at,
-                    last_login=None,
-                    subscription=subscription_data,
-                    roles=user_roles,
-                    connected_accounts=connected_accounts
-                )
-                user_responses.append(user_response)
-                
-            except Exception as user_error:
-                logger.error(f"Error processing user {user.id}: {user_error}")
-                continue
+        # One aggregated query for the page plus one COUNT
+        users, total = get_user_directory_page(
+            db,
+            search=search,
+            status=status_param,
+            limit=limit,
+            offset=offset
+        )
+        user_responses = [UserCompleteResponse(**user) for user in users]
         
         # Get available roles
         available_roles = ["Admin", "Manager", "Support", "Beta Tester", "User"]
@@ -881,6 +730,24 @@ async def get_users_complete(
             detail=f"Failed to get users data: {str(e)}"
         )
 
+@router.get("/users/export")
+async def export_users(
+    search: str = "",
+    status_param: str = Query("all", alias="status"),
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    admin_user: User = Depends(get_admin_user)
+):
+    """Stream the full user directory as CSV or NDJSON"""
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    filename = f"users_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.{export_format}"
+    logger.info(f"Admin {admin_user.id} exporting users as {export_format}")
+    
+    return StreamingResponse(
+        iter_user_export(export_format, search=search, status=status_param),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
 @router.post("/users/{user_id}/role", response_model=ResponseMessage)
 async def assign_user_role(
     user_id: int,
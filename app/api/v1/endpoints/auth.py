@@ -10,14 +10,13 @@ import logging
 from pydantic import BaseModel, EmailStr
 from typing import Optional, Dict, Any
 from datetime import datetime
-import jinja2
 import secrets
 import uuid
 from ....models.pending_registration import PendingRegistration
 
 from ....core.security import (
-    verify_password, 
-    get_password_hash, 
+    verify_password_async,
+    get_password_hash_async,
     create_access_token,
     get_current_user
 )
@@ -76,7 +75,7 @@ async def register_user(
             raise HTTPException(status_code=400, detail="User already exists")
         
         # Create new user
-        hashed_password = get_password_hash(password)
+        hashed_password = await get_password_hash_async(password)
         user = User(
             email=email,
             username=username,
@@ -185,7 +184,7 @@ async def login(
     try:
         # Find user by email
         user = db.query(User).filter(User.email == form_data.username).first()
-        if not user or not verify_password(form_data.password, user.hashed_password):
+        if not user or not await verify_password_async(form_data.password, user.hashed_password):
             raise HTTPException(
                 status_code=401,
                 detail="Incorrect email or password"
@@ -451,7 +450,7 @@ async def register_with_starter_plan(
             user = User(
                 email=email,
                 username=username,
-                hashed_password=get_password_hash(password),
+                hashed_password=await get_password_hash_async(password),
                 is_active=True,
                 created_at=datetime.utcnow(),
                 updated_at=datetime.utcnow()
@@ -613,7 +612,7 @@ async def reset_password(
         raise HTTPException(status_code=404, detail="User not found")
     
     # Update password
-    user.hashed_password = get_password_hash(request.new_password)
+    user.hashed_password = await get_password_hash_async(request.new_password)
     user.updated_at = datetime.utcnow()
     
     # Delete the used token
@@ -657,7 +656,7 @@ async def register_with_promo_code(
             raise HTTPException(status_code=400, detail="User already exists")
         
         # Create new user
-        hashed_password = get_password_hash(password)
+        hashed_password = await get_password_hash_async(password)
         user = User(
             email=email,
             username=username,
@@ -774,7 +773,7 @@ async def prepare_registration(
         session_token = str(uuid.uuid4())
         
         # Hash the password
-        password_hash = get_password_hash(password)
+        password_hash = await get_password_hash_async(password)
         
         # Store in pending registrations
         pending_reg = PendingRegistration(
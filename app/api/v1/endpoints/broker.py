@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
+import asyncio
 import logging
 import json
 import base64
@@ -20,6 +21,7 @@ from ....db.session import get_db
 from ....models.user import User
 from ....models.broker import BrokerAccount, BrokerCredentials
 from ....core.brokers.base import BaseBroker
+from ....core.order_dispatcher import order_dispatcher, DispatchPriority
 from app.models.subscription import Subscription
 from ....core.brokers.config import BrokerEnvironment, BROKER_CONFIGS
 from app.services.broker_token_service import BrokerTokenService
@@ -430,9 +432,20 @@ async def close_all_positions(
         # Get broker instance (assuming all accounts use same broker)
         broker = BaseBroker.get_broker_instance(accounts[0].broker_id, db)
         
-        # Execute close all operation
+        # Execute close all operation - one flatten job per account, ahead of any queued entries
         logger.info(f"Executing close all positions for {len(accounts)} accounts")
-        results = await broker.close_all_positions_for_accounts(accounts)
+        account_results = await asyncio.gather(*[
+            order_dispatcher.submit(
+                account.broker_id,
+                DispatchPriority.FLATTEN,
+                broker.close_all_positions_for_accounts,
+                [account]
+            )
+            for account in accounts
+        ])
+        results = {}
+        for account_result in account_results:
+            results.update(account_result)
 
         return {
             "status": "success",
@@ -1,7 +1,8 @@
 # app/api/v1/endpoints/chat.py
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, func
+from sqlalchemy import and_, or_, desc
 from typing import List, Optional
 from datetime import datetime
 
@@ -53,6 +54,8 @@ from app.services.chat_role_service import (
     sync_existing_beta_testers
 )
 from app.services.chat_service import initialize_default_channels
+from app.services.chat_unread import chat_unread_tracker
+from app.services.chat_page_cache import get_latest_page, set_latest_page, invalidate_channel
 from app.services.feature_flag_service import require_member_chat
 
 router = APIRouter()
@@ -71,38 +74,18 @@ async def get_channels(
         ChatChannel.is_active == True
     ).order_by(ChatChannel.sort_order).all()
     
+    # Unread counts from Redis counters, falling back to one grouped query
+    unread_counts = chat_unread_tracker.get_unread_counts(
+        db, current_user.id, [channel.id for channel in channels]
+    )
+    
     result = []
     for channel in channels:
-        # Get unread count for this user
-        member = db.query(ChatChannelMember).filter(
-            and_(
-                ChatChannelMember.channel_id == channel.id,
-                ChatChannelMember.user_id == current_user.id
-            )
-        ).first()
-        
-        if member:
-            unread_count = db.query(func.count(ChatMessage.id)).filter(
-                and_(
-                    ChatMessage.channel_id == channel.id,
-                    ChatMessage.created_at > member.last_read_at,
-                    ChatMessage.is_deleted == False
-                )
-            ).scalar()
-        else:
-            # User hasn't joined channel yet, count all messages
-            unread_count = db.query(func.count(ChatMessage.id)).filter(
-                and_(
-                    ChatMessage.channel_id == channel.id,
-                    ChatMessage.is_deleted == False
-                )
-            ).scalar()
-        
         # Convert to schema and add unread count
         channel_data = ChatChannelSchema.from_orm(channel)
         channel_with_unread = ChatChannelWithUnreadCount(
             **channel_data.dict(),
-            unread_count=unread_count or 0
+            unread_count=unread_counts.get(channel.id, 0)
         )
         result.append(channel_with_unread)
     
@@ -175,7 +158,7 @@ async def get_channel_messages(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get messages from a channel with pagination"""
+    """Get messages from a channel with keyset pagination (newest page is cached)"""
     # Verify channel exists and is active
     channel = db.query(ChatChannel).filter(
         and_(ChatChannel.id == channel_id, ChatChannel.is_active == True)
@@ -183,7 +166,41 @@ async def get_channel_messages(
     if not channel:
         raise HTTPException(status_code=404, detail="Channel not found")
     
-    # Build query
+    page, generation = get_latest_page(channel_id, limit) if before is None else (None, None)
+    if page is None:
+        page = _build_message_page(db, channel_id, limit, before)
+        if before is None:
+            set_latest_page(channel_id, limit, page, generation)
+    
+    # Update user's last read timestamp for this channel
+    updated = db.query(ChatChannelMember).filter(
+        and_(
+            ChatChannelMember.channel_id == channel_id,
+            ChatChannelMember.user_id == current_user.id
+        )
+    ).update({ChatChannelMember.last_read_at: datetime.utcnow()}, synchronize_session=False)
+    
+    if not updated:
+        # Add user to channel if they're not already a member
+        new_member = ChatChannelMember(
+            channel_id=channel_id,
+            user_id=current_user.id,
+            last_read_at=datetime.utcnow()
+        )
+        db.add(new_member)
+    
+    db.commit()
+    chat_unread_tracker.mark_read(current_user.id, channel_id)
+    
+    return ChatMessageList(
+        messages=[ChatMessageSchema(**message) for message in page["messages"]],
+        total_count=len(page["messages"]),
+        has_more=page["has_more"]
+    )
+
+
+def _build_message_page(db: Session, channel_id: int, limit: int, before: Optional[int]) -> dict:
+    """Load one page of messages with reactions, authors and roles in one query each"""
     query = db.query(ChatMessage).filter(
         and_(
             ChatMessage.channel_id == channel_id,
@@ -192,67 +209,76 @@ async def get_channel_messages(
     )
     
     if before:
-        query = query.filter(ChatMessage.id < before)
+        # Keyset on (created_at, id) of the cursor message
+        before_created_at = db.query(ChatMessage.created_at).filter(
+            ChatMessage.id == before
+        ).scalar_subquery()
+        query = query.filter(
+            or_(
+                ChatMessage.created_at < before_created_at,
+                and_(ChatMessage.created_at == before_created_at, ChatMessage.id < before)
+            )
+        )
     
-    # Get messages with user and role information
-    messages = query.order_by(desc(ChatMessage.created_at)).limit(limit + 1).all()
+    messages = query.order_by(
+        desc(ChatMessage.created_at), desc(ChatMessage.id)
+    ).limit(limit + 1).all()
     
     has_more = len(messages) > limit
     if has_more:
         messages = messages[:-1]  # Remove the extra message used for has_more detection
     
-    # Get user roles for all message authors
-    user_ids = [msg.user_id for msg in messages]
-    user_roles = db.query(UserChatRole).filter(
-        and_(
-            UserChatRole.user_id.in_(user_ids),
-            UserChatRole.is_active == True
-        )
-    ).all()
+    message_ids = [msg.id for msg in messages]
+    author_ids = {msg.user_id for msg in messages}
     
-    # Create mapping of user_id to highest priority role
-    role_map = {}
-    for role in user_roles:
-        if role.user_id not in role_map or role.role_priority > role_map[role.user_id].role_priority:
-            role_map[role.user_id] = role
+    # All reactions for the page
+    reactions = db.query(ChatReaction).filter(
+        ChatReaction.message_id.in_(message_ids)
+    ).order_by(ChatReaction.id).all() if message_ids else []
     
-    # Get user details (username and profile picture)
-    users = db.query(User).filter(User.id.in_(user_ids)).all()
+    # Highest priority active role per author
+    role_map = {}
+    if author_ids:
+        user_roles = db.query(UserChatRole).filter(
+            and_(
+                UserChatRole.user_id.in_(author_ids),
+                UserChatRole.is_active == True
+            )
+        ).all()
+        for role in user_roles:
+            if role.user_id not in role_map or role.role_priority > role_map[role.user_id].role_priority:
+                role_map[role.user_id] = role
+    
+    # Authors and reactors in one lookup
+    user_ids = author_ids | {reaction.user_id for reaction in reactions}
+    users = db.query(User.id, User.username, User.profile_picture).filter(
+        User.id.in_(user_ids)
+    ).all() if user_ids else []
     username_map = {user.id: user.username for user in users}
     profile_pic_map = {user.id: user.profile_picture for user in users}
     
-    # Build response with reactions
+    # Group reactions by message, then by emoji
+    reaction_map = {}
+    for reaction in reactions:
+        summary = reaction_map.setdefault(reaction.message_id, {})
+        if reaction.emoji not in summary:
+            summary[reaction.emoji] = {
+                'emoji': reaction.emoji,
+                'count': 0,
+                'users': []
+            }
+        summary[reaction.emoji]['count'] += 1
+        summary[reaction.emoji]['users'].append(username_map.get(reaction.user_id, 'Unknown'))
+    
     result_messages = []
     for message in reversed(messages):  # Reverse to show oldest first
-        # Get reactions for this message
-        reactions = db.query(ChatReaction).filter(
-            ChatReaction.message_id == message.id
-        ).all()
-        
-        # Group reactions by emoji
-        reaction_summary = {}
-        for reaction in reactions:
-            emoji = reaction.emoji
-            if emoji not in reaction_summary:
-                reaction_summary[emoji] = {
-                    'emoji': emoji,
-                    'count': 0,
-                    'users': []
-                }
-            reaction_summary[emoji]['count'] += 1
-            reaction_summary[emoji]['users'].append(username_map.get(reaction.user_id, 'Unknown'))
-        
-        # Get user role color
         user_role = role_map.get(message.user_id)
-        role_color = user_role.role_color if user_role else '#FFFFFF'
-        
-        # Create message schema
         message_data = ChatMessageSchema(
             id=message.id,
             channel_id=message.channel_id,
             user_id=message.user_id,
             user_name=username_map.get(message.user_id, 'Unknown'),
-            user_role_color=role_color,
+            user_role_color=user_role.role_color if user_role else '#FFFFFF',
             user_profile_picture=profile_pic_map.get(message.user_id),
             content=message.content,
             reply_to_id=message.reply_to_id,
@@ -260,36 +286,11 @@ async def get_channel_messages(
             edited_at=message.edited_at,
             created_at=message.created_at,
             is_deleted=message.is_deleted,
-            reactions=list(reaction_summary.values())
-        )
-        result_messages.append(message_data)
-    
-    # Update user's last read timestamp for this channel
-    member = db.query(ChatChannelMember).filter(
-        and_(
-            ChatChannelMember.channel_id == channel_id,
-            ChatChannelMember.user_id == current_user.id
-        )
-    ).first()
-    
-    if member:
-        member.last_read_at = datetime.utcnow()
-    else:
-        # Add user to channel if they're not already a member
-        new_member = ChatChannelMember(
-            channel_id=channel_id,
-            user_id=current_user.id,
-            last_read_at=datetime.utcnow()
+            reactions=list(reaction_map.get(message.id, {}).values())
         )
-        db.add(new_member)
+        result_messages.append(jsonable_encoder(message_data))
     
-    db.commit()
-    
-    return ChatMessageList(
-        messages=result_messages,
-        total_count=len(result_messages),
-        has_more=has_more
-    )
+    return {"messages": result_messages, "has_more": has_more}
 
 
 @router.post("/channels/{channel_id}/messages", response_model=ChatMessageSchema)
@@ -331,6 +332,8 @@ async def send_message(
     db.add(new_message)
     db.commit()
     db.refresh(new_message)
+    chat_unread_tracker.on_message_posted(channel_id, new_message.id)
+    invalidate_channel(channel_id)
     
     # Get user role for response
     user_role = db.query(UserChatRole).filter(
@@ -412,6 +415,7 @@ async def edit_message(
     
     db.commit()
     db.refresh(message)
+    invalidate_channel(message.channel_id)
     
     # Get user role for response
     user_role = db.query(UserChatRole).filter(
@@ -469,6 +473,8 @@ async def delete_message(
     message.deleted_at = datetime.utcnow()
     
     db.commit()
+    chat_unread_tracker.on_message_deleted(message.channel_id)
+    invalidate_channel(message.channel_id)
     
     # Note: Real-time broadcasting now handled by Application WebSocket
     
@@ -517,6 +523,7 @@ async def add_reaction(
     db.add(new_reaction)
     db.commit()
     db.refresh(new_reaction)
+    invalidate_channel(message.channel_id)
     
     # Note: Real-time broadcasting now handled by Application WebSocket
     
@@ -545,9 +552,11 @@ async def remove_reaction(
     
     # Store message_id before deletion
     message_id = reaction.message_id
+    channel_id = reaction.message.channel_id
     
     db.delete(reaction)
     db.commit()
+    invalidate_channel(channel_id)
     
     # Note: Real-time broadcasting now handled by Application WebSocket
     
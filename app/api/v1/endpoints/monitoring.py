@@ -7,12 +7,28 @@ from ....core.redis_manager import redis_manager
 from ....services.trading_service import order_monitoring_service
 from ....services.distributed_lock import AccountLockManager
 from ....core.security import get_current_user
+from ....core.principal_cache import principal_cache
+from ....core.password_hasher import password_hasher
+from ....core.request_pipeline import pipeline_stats
+from ....core.enhanced_logging import get_logging_stats
+from ....core.startup import startup_orchestrator
+from ....core.lazy_imports import lazy_import_stats
 from ....models.user import User
 from ....db.session import engine
 from ....core.alert_manager import alert_manager
 from ....core.circuit_breaker import circuit_breaker_manager
 from ....core.rollback_manager import rollback_manager
 from ....core.graceful_shutdown import shutdown_manager
+from ....services.strategy_stats import strategy_stats_accumulator
+from ....services.exposure_ledger import exposure_ledger
+from ....core.order_dispatcher import order_dispatcher
+from ....services.order_dedupe import order_dedupe_index
+from ....services.subscription_presence import subscription_presence
+from ....services.entitlements import entitlement_reconciler
+from ....services.resource_counters import resource_counters
+from ....services.feature_flag_service import feature_flag_engine
+from ....db.query_profiler import query_profiler
+from ....db.pool_monitor import pool_monitor
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -125,6 +141,7 @@ async def get_system_metrics(current_user: User = Depends(get_current_user)):
                     "checked_out": engine.pool.checkedout(),
                     "overflow": engine.pool.overflow(),
                     "invalid": engine.pool.invalid(),
+                    "telemetry": pool_monitor.get_stats(),
                     "connection_info": {
                         "url": str(engine.url).replace(engine.url.password, "*****") if engine.url.password else str(engine.url)
                     }
@@ -352,6 +369,17 @@ async def get_active_transactions(current_user: User = Depends(get_current_user)
         logger.error(f"Error getting active transactions: {e}")
         raise HTTPException(status_code=500, detail="Failed to get active transactions")
 
+@router.get("/transactions/journal")
+async def get_rollback_journal_stats(current_user: User = Depends(get_current_user)):
+    """Get rollback journal statistics - requires authentication"""
+    try:
+        if not rollback_manager.journal:
+            return {"enabled": False}
+        return {"enabled": True, **rollback_manager.journal.get_stats(), **rollback_manager.get_recovery_stats()}
+    except Exception as e:
+        logger.error(f"Error getting rollback journal stats: {e}")
+        raise HTTPException(status_code=500, detail="Failed to get rollback journal stats")
+
 @router.post("/transactions/{transaction_id}/rollback")
 async def force_rollback_transaction(transaction_id: str, current_user: User = Depends(get_current_user)):
     """Force rollback of a transaction (admin operation) - requires authentication"""
@@ -368,6 +396,160 @@ async def force_rollback_transaction(transaction_id: str, current_user: User = D
         logger.error(f"Error forcing rollback of transaction {transaction_id}: {e}")
         raise HTTPException(status_code=500, detail="Failed to force rollback")
 
+@router.get("/strategy-stats")
+async def get_strategy_stats_accumulator(current_user: User = Depends(get_current_user)):
+    """Get write-behind strategy stats, including unflushed counts - requires authentication"""
+    try:
+        return strategy_stats_accumulator.get_stats()
+    except Exception as e:
+        logger.error(f"Error getting strategy stats accumulator status: {e}")
+        raise HTTPException(status_code=500, detail="Failed to get strategy stats accumulator status")
+
+@router.get("/exposure")
+async def get_exposure_ledger(current_user: User = Depends(get_current_user)):
+    """Get exposure ledger state and reconciliation drift - requires authentication"""
+    try:
+        return exposure_ledger.get_stats()
+    except Exception as e:
+        logger.error(f"Error getting exposure ledger status: {e}")
+        raise HTTPException(status_code=500, detail="Failed to get exposure ledger status")
+
+@router.get("/dispatcher")
+async def get_order_dispatcher_status(current_user: User = Depends(get_current_user)):
+    """Get per-broker dispatch budgets and queue statistics - requires authentication"""
+    try:
+        return order_dispatcher.get_stats()
+    except Exception as e:
+        logger.error(f"Error getting order dispatcher status: {e}")
+        raise HTTPException(status_code=500, detail="Failed to get order dispatcher status")
+
+@router.get("/orders/dedupe")
+async def get_order_dedupe_status(current_user: User = Depends(get_current_user)):
+    """Get client order id dedupe index statistics - requires authentication"""
+    try:
+        return order_dedupe_index.get_stats()
+    except Exception as e:
+        logger.error(f"Error getting order dedupe status: {e}")
+        raise HTTPException(status_code=500, detail="Failed to get order dedupe status")
+
+@router.get("/subscription-presence")
+async def get_subscription_presence_status(current_user: User = Depends(get_current_user)):
+    """Get subscription presence cache hit rates - requires authentication"""
+    try:
+        return subscription_presence.get_stats()
+    except Exception as e:
+        logger.error(f"Error getting subscription presence status: {e}")
+        raise HTTPException(status_code=500, detail="Failed to get subscription presence status")
+
+@router.get("/principal-cache")
+async def get_principal_cache_status(current_user: User = Depends(get_current_user)):
+    """Get authenticated principal cache hit rates - requires authentication"""
+    try:
+        return principal_cache.get_stats()
+    except Exception as e:
+        logger.error(f"Error getting principal cache status: {e}")
+        raise HTTPException(status_code=500, detail="Failed to get principal cache status")
+
+@router.get("/entitlements")
+async def get_entitlement_reconciler_status(current_user: User = Depends(get_current_user)):
+    """Get subscription reconciliation status - requires authentication"""
+    try:
+        return entitlement_reconciler.get_stats()
+    except Exception as e:
+        logger.error(f"Error getting subscription reconciliation status: {e}")
+        raise HTTPException(status_code=500, detail="Failed to get subscription reconciliation status")
+
+@router.get("/password-hasher")
+async def get_password_hasher_status(current_user: User = Depends(get_current_user)):
+    """Get password hashing pool queue depth and timings - requires authentication"""
+    try:
+        return password_hasher.get_stats()
+    except Exception as e:
+        logger.error(f"Error getting password hasher status: {e}")
+        raise HTTPException(status_code=500, detail="Failed to get password hasher status")
+
+@router.get("/resource-counters")
+async def get_resource_counter_status(current_user: User = Depends(get_current_user)):
+    """Get resource counter hit/seed rates and the last reconciliation - requires authentication"""
+    try:
+        return resource_counters.get_stats()
+    except Exception as e:
+        logger.error(f"Error getting resource counter status: {e}")
+        raise HTTPException(status_code=500, detail="Failed to get resource counter status")
+
+@router.get("/feature-flags")
+async def get_feature_flag_engine_status(current_user: User = Depends(get_current_user)):
+    """Get feature flag evaluation cache statistics - requires authentication"""
+    try:
+        return feature_flag_engine.get_stats()
+    except Exception as e:
+        logger.error(f"Error getting feature flag engine status: {e}")
+        raise HTTPException(status_code=500, detail="Failed to get feature flag engine status")
+
+@router.get("/request-pipeline")
+async def get_request_pipeline_status(current_user: User = Depends(get_current_user)):
+    """Get per-stage request middleware timings - requires authentication"""
+    try:
+        return pipeline_stats.get_stats()
+    except Exception as e:
+        logger.error(f"Error getting request pipeline status: {e}")
+        raise HTTPException(status_code=500, detail="Failed to get request pipeline status")
+
+@router.get("/logging")
+async def get_logging_status(current_user: User = Depends(get_current_user)):
+    """Get background log queue depth and dropped record counts - requires authentication"""
+    try:
+        return get_logging_stats()
+    except Exception as e:
+        logger.error(f"Error getting logging status: {e}")
+        raise HTTPException(status_code=500, detail="Failed to get logging status")
+
+@router.get("/startup")
+async def get_startup_profile(current_user: User = Depends(get_current_user)):
+    """Get this worker's startup step timings and import profile - requires authentication"""
+    try:
+        return startup_orchestrator.get_stats()
+    except Exception as e:
+        logger.error(f"Error getting startup profile: {e}")
+        raise HTTPException(status_code=500, detail="Failed to get startup profile")
+
+@router.get("/lazy-imports")
+async def get_lazy_import_stats(current_user: User = Depends(get_current_user)):
+    """Get which deferred modules and routers this worker has loaded - requires authentication"""
+    try:
+        return lazy_import_stats.get_stats()
+    except Exception as e:
+        logger.error(f"Error getting lazy import stats: {e}")
+        raise HTTPException(status_code=500, detail="Failed to get lazy import stats")
+
+@router.get("/queries")
+async def get_query_profile_report(limit: int = 50, current_user: User = Depends(get_current_user)):
+    """Get per-route SQL query counts and N+1 detections - requires authentication"""
+    try:
+        return query_profiler.get_report(limit=limit)
+    except Exception as e:
+        logger.error(f"Error getting query profile report: {e}")
+        raise HTTPException(status_code=500, detail="Failed to get query profile report")
+
+@router.post("/queries/reset")
+async def reset_query_profile_report(current_user: User = Depends(get_current_user)):
+    """Clear aggregated SQL query statistics - requires authentication"""
+    try:
+        query_profiler.reset()
+        return {"message": "Query profile statistics reset"}
+    except Exception as e:
+        logger.error(f"Error resetting query profile report: {e}")
+        raise HTTPException(status_code=500, detail="Failed to reset query profile report")
+
+@router.get("/db-pool")
+async def get_db_pool_status(current_user: User = Depends(get_current_user)):
+    """Get this worker's connection pool sizing, usage and checkout wait times - requires authentication"""
+    try:
+        return pool_monitor.get_stats()
+    except Exception as e:
+        logger.error(f"Error getting DB pool status: {e}")
+        raise HTTPException(status_code=500, detail="Failed to get DB pool status")
+
 @router.get("/worker")
 async def get_worker_status(current_user: User = Depends(get_current_user)):
     """Get worker and shutdown manager status - requires authentication"""
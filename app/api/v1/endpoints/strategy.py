@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Header, Response
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, selectinload, lazyload
 from sqlalchemy.exc import SQLAlchemyError
 from typing import List, Union, Optional, Dict, Any
 import logging
@@ -37,6 +37,97 @@ from app.core.permissions import (
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+def _follower_accounts_by_strategy(db: Session, strategy_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+    """Load follower accounts and quantities for many strategies in one query"""
+    followers: Dict[int, List[Dict[str, Any]]] = {strategy_id: [] for strategy_id in strategy_ids}
+    if not strategy_ids:
+        return followers
+
+    rows = db.query(
+        strategy_follower_quantities.c.strategy_id,
+        strategy_follower_quantities.c.account_id,
+        strategy_follower_quantities.c.quantity
+    ).filter(
+        strategy_follower_quantities.c.strategy_id.in_(strategy_ids)
+    ).order_by(
+        strategy_follower_quantities.c.strategy_id,
+        strategy_follower_quantities.c.account_id
+    ).all()
+
+    for strategy_id, account_id, quantity in rows:
+        followers[strategy_id].append({
+            "account_id": str(account_id),
+            "quantity": quantity
+        })
+    return followers
+
+def _strategy_response_data(strategy: ActivatedStrategy, follower_accounts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build the StrategyResponse payload from a strategy with its accounts and webhook loaded"""
+    strategy_data = {
+        "id": strategy.id,
+        "strategy_type": strategy.strategy_type,
+        "webhook_id": strategy.webhook_id,
+        "ticker": strategy.ticker,
+        "is_active": strategy.is_active,
+        "created_at": strategy.created_at,
+        "last_triggered": strategy.last_triggered,
+        "webhook": {
+            "name": strategy.webhook.name if strategy.webhook else None,
+            "source_type": strategy.webhook.source_type if strategy.webhook else "custom"
+        }
+    }
+
+    if strategy.strategy_type == "single":
+        # Add single strategy specific fields
+        strategy_data.update({
+            "account_id": strategy.account_id,
+            "quantity": strategy.quantity,
+            "broker_account": {
+                "account_id": strategy.broker_account.account_id,
+                "name": strategy.broker_account.name,
+                "broker_id": strategy.broker_account.broker_id
+            } if strategy.broker_account else None,
+            "leader_account_id": None,
+            "leader_quantity": None,
+            "leader_broker_account": None,
+            "follower_accounts": [],
+            "group_name": None
+        })
+    else:
+        strategy_data.update({
+            "group_name": strategy.group_name,
+            "leader_account_id": strategy.leader_account_id,
+            "leader_quantity": strategy.leader_quantity,
+            "leader_broker_account": {
+                "account_id": strategy.leader_broker_account.account_id,
+                "name": strategy.leader_broker_account.name,
+                "broker_id": strategy.leader_broker_account.broker_id
+            } if strategy.leader_broker_account else None,
+            "follower_accounts": follower_accounts,
+            "account_id": None,
+            "quantity": None
+        })
+
+    # Add stats
+    strategy_data["stats"] = {
+        "total_trades": strategy.total_trades,
+        "successful_trades": strategy.successful_trades,
+        "failed_trades": strategy.failed_trades,
+        "total_pnl": float(strategy.total_pnl) if strategy.total_pnl else 0,
+        "win_rate": float(strategy.win_rate) if strategy.win_rate else None,
+        "average_trade_pnl": None  # Add calculation if needed
+    }
+    return strategy_data
+
+def _load_strategies_query(db: Session):
+    """Strategies with accounts and webhook batch-loaded (followers via _follower_accounts_by_strategy)"""
+    return db.query(ActivatedStrategy).options(
+        selectinload(ActivatedStrategy.broker_account),
+        selectinload(ActivatedStrategy.leader_broker_account),
+        selectinload(ActivatedStrategy.webhook),
+        lazyload(ActivatedStrategy.follower_accounts_with_quantities)
+    )
+
 @router.post("/{strategy_id}/execute")
 @check_subscription
 async def execute_strategy_manually(
@@ -239,6 +330,16 @@ async def activate_strategy(
                         detail="Number of follower accounts must match number of quantities"
                     )
 
+                # Load every follower account in one query
+                candidate_accounts = {
+                    account.account_id: account
+                    for account in db.query(BrokerAccount).filter(
+                        BrokerAccount.account_id.in_(strategy.follower_account_ids),
+                        BrokerAccount.user_id == current_user.id,
+                        BrokerAccount.is_active == True
+                    ).all()
+                } if strategy.follower_account_ids else {}
+
                 follower_accounts = []
                 existing_account_ids = {leader_account.account_id}
 
@@ -250,11 +351,7 @@ async def activate_strategy(
                         )
                     existing_account_ids.add(follower_id)
 
-                    follower = db.query(BrokerAccount).filter(
-                        BrokerAccount.account_id == follower_id,
-                        BrokerAccount.user_id == current_user.id,
-                        BrokerAccount.is_active == True
-                    ).first()
+                    follower = candidate_accounts.get(follower_id)
 
                     if not follower:
                         raise HTTPException(
@@ -280,13 +377,17 @@ async def activate_strategy(
                 db.flush()
 
                 # Add follower relationships
-                for idx, follower in enumerate(follower_accounts):
+                if follower_accounts:
                     db.execute(
-                        strategy_follower_quantities.insert().values(
-                            strategy_id=db_strategy.id,
-                            account_id=follower.account_id,
-                            quantity=strategy.follower_quantities[idx]
-                        )
+                        strategy_follower_quantities.insert(),
+                        [
+                            {
+                                "strategy_id": db_strategy.id,
+                                "account_id": follower.account_id,
+                                "quantity": strategy.follower_quantities[idx]
+                            }
+                            for idx, follower in enumerate(follower_accounts)
+                        ]
                     )
 
                 stats = StrategyStats.create_empty()
@@ -374,15 +475,13 @@ async def list_strategies(
         logger.info(f"Fetching strategies for user {current_user.id}")
         
         strategies = (
-            db.query(ActivatedStrategy)
+            _load_strategies_query(db)
             .filter(ActivatedStrategy.user_id == current_user.id)
-            .options(
-                joinedload(ActivatedStrategy.broker_account),
-                joinedload(ActivatedStrategy.leader_broker_account),
-                joinedload(ActivatedStrategy.webhook)
-            )
             .all()
         )
+        followers_by_strategy = _follower_accounts_by_strategy(
+            db, [strategy.id for strategy in strategies if strategy.strategy_type != "single"]
+        )
 
         # Add upgrade suggestion if approaching strategy limits
         if not settings.SKIP_SUBSCRIPTION_CHECK:
@@ -407,61 +506,9 @@ async def list_strategies(
         response_strategies = []
         for strategy in strategies:
             try:
-                strategy_data = {
-                    "id": strategy.id,
-                    "strategy_type": strategy.strategy_type,
-                    "webhook_id": strategy.webhook_id,
-                    "ticker": strategy.ticker,
-                    "is_active": strategy.is_active,
-                    "created_at": strategy.created_at,
-                    "last_triggered": strategy.last_triggered,
-                    "webhook": {
-                        "name": strategy.webhook.name if strategy.webhook else None,
-                        "source_type": strategy.webhook.source_type if strategy.webhook else "custom"
-                    }
-                }
-
-                if strategy.strategy_type == "single":
-                    # Add single strategy specific fields
-                    strategy_data.update({
-                        "account_id": strategy.account_id,
-                        "quantity": strategy.quantity,
-                        "broker_account": {
-                            "account_id": strategy.broker_account.account_id,
-                            "name": strategy.broker_account.name,
-                            "broker_id": strategy.broker_account.broker_id
-                        } if strategy.broker_account else None,
-                        "leader_account_id": None,
-                        "leader_quantity": None,
-                        "leader_broker_account": None,
-                        "follower_accounts": [],
-                        "group_name": None
-                    })
-                else:
-                    # Multiple strategy fields remain the same
-                    strategy_data.update({
-                        "group_name": strategy.group_name,
-                        "leader_account_id": strategy.leader_account_id,
-                        "leader_quantity": strategy.leader_quantity,
-                        "leader_broker_account": {
-                            "account_id": strategy.leader_broker_account.account_id,
-                            "name": strategy.leader_broker_account.name,
-                            "broker_id": strategy.leader_broker_account.broker_id
-                        } if strategy.leader_broker_account else None,
-                        "follower_accounts": strategy.get_follower_accounts(),
-                        "account_id": None,
-                        "quantity": None
-                    })
-
-                # Add stats
-                strategy_data["stats"] = {
-                    "total_trades": strategy.total_trades,
-                    "successful_trades": strategy.successful_trades,
-                    "failed_trades": strategy.failed_trades,
-                    "total_pnl": float(strategy.total_pnl) if strategy.total_pnl else 0,
-                    "win_rate": float(strategy.win_rate) if strategy.win_rate else None,
-                    "average_trade_pnl": None  # Add calculation if needed
-                }
+                strategy_data = _strategy_response_data(
+                    strategy, followers_by_strategy.get(strategy.id, [])
+                )
 
                 response_strategies.append(strategy_data)
 
@@ -549,14 +596,9 @@ async def update_strategy(
     try:
         logger.info(f"Updating strategy {strategy_id} for user {current_user.id}")
         
-        # Get the strategy with joins for response
+        # Get the strategy with its accounts and webhook for the response
         strategy = (
-            db.query(ActivatedStrategy)
-            .options(
-                joinedload(ActivatedStrategy.broker_account),
-                joinedload(ActivatedStrategy.leader_broker_account),
-                joinedload(ActivatedStrategy.webhook)
-            )
+            _load_strategies_query(db)
             .filter(
                 ActivatedStrategy.id == strategy_id,
                 ActivatedStrategy.user_id == current_user.id
@@ -623,7 +665,7 @@ async def update_strategy(
             
             if strategy_update.follower_quantities is not None:
                 # Get current follower accounts
-                current_followers = strategy.get_follower_accounts()
+                current_followers = _follower_accounts_by_strategy(db, [strategy.id])[strategy.id]
                 
                 if len(strategy_update.follower_quantities) != len(current_followers):
                     raise HTTPException(
@@ -639,13 +681,17 @@ async def update_strategy(
                 )
                 
                 # Insert new quantities
-                for idx, follower in enumerate(current_followers):
+                if current_followers:
                     db.execute(
-                        strategy_follower_quantities.insert().values(
-                            strategy_id=strategy_id,
-                            account_id=follower["account_id"],
-                            quantity=strategy_update.follower_quantities[idx]
-                        )
+                        strategy_follower_quantities.insert(),
+                        [
+                            {
+                                "strategy_id": strategy_id,
+                                "account_id": follower["account_id"],
+                                "quantity": strategy_update.follower_quantities[idx]
+                            }
+                            for idx, follower in enumerate(current_followers)
+                        ]
                     )
                 changes_made = True
                 logger.info(f"Updated follower quantities: {strategy_update.follower_quantities}")
@@ -666,64 +712,15 @@ async def update_strategy(
         
         # Commit changes
         db.commit()
-        db.refresh(strategy)
         
         logger.info(f"Successfully updated strategy {strategy_id}")
         
-        # Prepare response data similar to list_strategies
-        strategy_data = {
-            "id": strategy.id,
-            "strategy_type": strategy.strategy_type,
-            "webhook_id": strategy.webhook_id,
-            "ticker": strategy.ticker,
-            "is_active": strategy.is_active,
-            "created_at": strategy.created_at,
-            "last_triggered": strategy.last_triggered,
-            "webhook": {
-                "name": strategy.webhook.name if strategy.webhook else None,
-                "source_type": strategy.webhook.source_type if strategy.webhook else "custom"
-            }
-        }
-
-        if strategy.strategy_type == "single":
-            strategy_data.update({
-                "account_id": strategy.account_id,
-                "quantity": strategy.quantity,
-                "broker_account": {
-                    "account_id": strategy.broker_account.account_id,
-                    "name": strategy.broker_account.name,
-                    "broker_id": strategy.broker_account.broker_id
-                } if strategy.broker_account else None,
-                "leader_account_id": None,
-                "leader_quantity": None,
-                "leader_broker_account": None,
-                "follower_accounts": [],
-                "group_name": None
-            })
-        else:
-            strategy_data.update({
-                "group_name": strategy.group_name,
-                "leader_account_id": strategy.leader_account_id,
-                "leader_quantity": strategy.leader_quantity,
-                "leader_broker_account": {
-                    "account_id": strategy.leader_broker_account.account_id,
-                    "name": strategy.leader_broker_account.name,
-                    "broker_id": strategy.leader_broker_account.broker_id
-                } if strategy.leader_broker_account else None,
-                "follower_accounts": strategy.get_follower_accounts(),
-                "account_id": None,
-                "quantity": None
-            })
-
-        # Add stats
-        strategy_data["stats"] = {
-            "total_trades": strategy.total_trades,
-            "successful_trades": strategy.successful_trades,
-            "failed_trades": strategy.failed_trades,
-            "total_pnl": float(strategy.total_pnl) if strategy.total_pnl else 0,
-            "win_rate": float(strategy.win_rate) if strategy.win_rate else None,
-            "average_trade_pnl": None
-        }
+        # Prepare response data the same way as list_strategies
+        followers = (
+            _follower_accounts_by_strategy(db, [strategy.id])[strategy.id]
+            if strategy.strategy_type != "single" else []
+        )
+        strategy_data = _strategy_response_data(strategy, followers)
 
         return StrategyResponse(**strategy_data)
         
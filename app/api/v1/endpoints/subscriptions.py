@@ -2,24 +2,20 @@ from fastapi import APIRouter, Depends, HTTPException, Request, BackgroundTasks,
 from sqlalchemy.orm import Session
 import logging
 from typing import Dict, Optional, Any, List
-import stripe
 from datetime import datetime, timedelta
 from sqlalchemy.exc import IntegrityError
-from app.models.broker import BrokerAccount
-from app.models.webhook import Webhook
-from app.models.strategy import ActivatedStrategy
 
 from app.models.subscription import Subscription
 from app.models.user import User
 from app.core.config import settings
 from app.db.session import get_db
 from app.core.security import get_current_user
-from app.services.stripe_service import StripeService
+from app.services.stripe_service import StripeService, stripe
 from app.schemas.subscription import SubscriptionVerification, PortalSession, SubscriptionConfig
+from app.services.resource_counters import resource_counters, count_resources
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
-stripe.api_key = settings.STRIPE_SECRET_KEY
 stripe_service = StripeService()
 
 
@@ -726,16 +722,14 @@ async def get_subscription_status(
         if not subscription:
             raise HTTPException(status_code=404, detail="No subscription found")
         
-        # Get resource counts
-        webhook_count = db.query(Webhook).filter(Webhook.user_id == current_user.id).count()
-        account_count = db.query(BrokerAccount).filter(BrokerAccount.user_id == current_user.id).count() 
-        strategy_count = db.query(ActivatedStrategy).filter(ActivatedStrategy.user_id == current_user.id).count()
-        
-        # Update counts in subscription
-        subscription.active_webhooks_count = webhook_count
-        subscription.connected_accounts_count = account_count
-        subscription.active_strategies_count = strategy_count
-        db.commit()
+        # Get resource counts: every resource the user has, active or not, in
+        # one statement. The active counts used for limit enforcement are kept
+        # by resource_counters, whose hourly reconciliation writes them back
+        # to the subscription row.
+        counts = count_resources(db, current_user.id, active_only=False)
+        webhook_count = counts["active_webhooks"]
+        account_count = counts["connected_accounts"]
+        strategy_count = counts["active_strategies"]
         
         # Get tier limits
         from app.core.subscription_tiers import get_tier_limits
@@ -1230,47 +1224,13 @@ async def sync_resource_counts(
         raise HTTPException(status_code=403, detail="Invalid admin key")
     
     try:
-        # Get all subscriptions
-        subscriptions = db.query(Subscription).all()
-        updated_count = 0
-        
-        for subscription in subscriptions:
-            # Skip if no user associated
-            if not subscription.user_id:
-                continue
-                
-            # Count connected accounts
-            connected_accounts = db.query(BrokerAccount).filter(
-                BrokerAccount.user_id == subscription.user_id,
-                BrokerAccount.is_active == True,
-                BrokerAccount.is_deleted == False
-            ).count()
-            
-            # Count active webhooks
-            active_webhooks = db.query(Webhook).filter(
-                Webhook.user_id == subscription.user_id,
-                Webhook.is_active == True
-            ).count()
-            
-            # Count active strategies
-            active_strategies = db.query(ActivatedStrategy).filter(
-                ActivatedStrategy.user_id == subscription.user_id,
-                ActivatedStrategy.is_active == True
-            ).count()
-            
-            # Update subscription with actual counts
-            subscription.connected_accounts_count = connected_accounts
-            subscription.active_webhooks_count = active_webhooks
-            subscription.active_strategies_count = active_strategies
-            
-            updated_count += 1
-        
-        # Commit all changes
-        db.commit()
+        # One grouped count for everyone; only disagreeing rows are rewritten
+        result = resource_counters.reconcile(db)
         
         return {
             "status": "success",
-            "message": f"Synchronized resource counts for {updated_count} subscriptions"
+            "message": f"Synchronized resource counts for {result['checked']} subscriptions",
+            **result
         }
         
     except Exception as e:
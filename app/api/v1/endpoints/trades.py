@@ -85,6 +85,18 @@ class TradeListResponse(BaseModel):
     per_page: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None
+
+def _encode_trade_cursor(trade: Trade) -> str:
+    """Keyset cursor for the position after this trade"""
+    return f"{trade.close_time.isoformat()}|{trade.id}"
+
+def _decode_trade_cursor(cursor: str):
+    try:
+        close_time, trade_id = cursor.rsplit("|", 1)
+        return datetime.fromisoformat(close_time), int(trade_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
 # Request Models
 class CloseTradeRequest(BaseModel):
@@ -118,61 +130,52 @@ async def get_historical_trades(
     profitable_only: Optional[bool] = Query(None, description="Show only profitable trades"),
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(50, ge=1, le=200, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous page's next_cursor"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Get historical (closed) trades with filtering and pagination.
     Supports filtering by symbol, strategy, profitability, and date range.
+    Pass ``next_cursor`` back as ``cursor`` for keyset paging; ``page`` still works.
     """
     try:
         trade_service = TradeService(db)
         offset = (page - 1) * per_page
+        before = _decode_trade_cursor(cursor) if cursor else None
         
-        # Get filtered trades
-        trades = await trade_service.get_historical_trades(
+        filters = dict(
             user_id=current_user.id,
             symbol=symbol,
             strategy_id=strategy_id,
             days_back=days_back,
-            limit=per_page,
-            offset=offset
+            profitable_only=profitable_only
         )
         
-        # Apply profitability filter if requested
-        if profitable_only is not None:
-            if profitable_only:
-                trades = [t for t in trades if t.realized_pnl and t.realized_pnl > 0]
-            else:
-                trades = [t for t in trades if t.realized_pnl and t.realized_pnl <= 0]
-        
-        # Get total count for pagination (simplified - would need optimization for production)
-        all_trades = await trade_service.get_historical_trades(
-            user_id=current_user.id,
-            symbol=symbol,
-            strategy_id=strategy_id,
-            days_back=days_back,
-            limit=1000,  # Large limit to get total count
-            offset=0
+        # Fetch one extra row to know whether another page follows
+        trades = await trade_service.get_historical_trades(
+            **filters,
+            limit=per_page + 1,
+            offset=offset,
+            before=before
         )
+        has_next = len(trades) > per_page
+        trades = trades[:per_page]
         
-        if profitable_only is not None:
-            if profitable_only:
-                all_trades = [t for t in all_trades if t.realized_pnl and t.realized_pnl > 0]
-            else:
-                all_trades = [t for t in all_trades if t.realized_pnl and t.realized_pnl <= 0]
-        
-        total = len(all_trades)
+        total = await trade_service.count_historical_trades(**filters)
         
         return TradeListResponse(
             trades=[TradeResponse.from_orm(trade) for trade in trades],
             total=total,
             page=page,
             per_page=per_page,
-            has_next=offset + per_page < total,
-            has_prev=page > 1
+            has_next=has_next,
+            has_prev=page > 1 or before is not None,
+            next_cursor=_encode_trade_cursor(trades[-1]) if has_next and trades else None
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting historical trades for user {current_user.id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to retrieve historical trades")
@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, Request, BackgroundTasks, Body, Response
+from fastapi import APIRouter, Depends, HTTPException, Request, BackgroundTasks, Body, Response, Query
 from sqlalchemy.orm import Session
+from sqlalchemy import update, func, case, cast, Float
 from sqlalchemy.exc import SQLAlchemyError
 from typing import List, Optional
 from pydantic import BaseModel
@@ -23,9 +24,12 @@ from ....schemas.webhook import (
     WebhookSecureOut,
     WebhookCreateResponse,
     WebhookLogOut,
-    WebhookPayload
+    WebhookPayload,
+    MarketplaceStrategyOut
 )
 from ....services.webhook_service import WebhookProcessor, RailwayOptimizedWebhookProcessor
+from ....services.order_dedupe import webhook_event_id
+from ....services.strategy_marketplace import marketplace_index
 from ....core.config import settings
 from ....core.upgrade_prompts import build_upgrade_response, UpgradeReason, add_upgrade_headers
 from ....core.permissions import check_subscription, check_resource_limit, check_feature_access, require_tier
@@ -233,7 +237,8 @@ async def webhook_endpoint(
                 logger.info("Switched to standard webhook processor for fallback")
         
         # Standard processing with background tasks
-        idempotency_key = webhook_processor._generate_idempotency_key(webhook.id, processed_payload)
+        event_id = webhook_event_id(webhook.id, processed_payload, datetime.utcnow())
+        idempotency_key = webhook_processor._generate_idempotency_key(webhook.id, event_id)
         
         response_data = {
             "status": "accepted", 
@@ -399,6 +404,8 @@ async def delete_webhook(
             Subscription.user_id == current_user.id
         ).first()
         
+        was_shared = webhook.is_shared
+        
         # Delete webhook
         db.delete(webhook)
         
@@ -407,6 +414,9 @@ async def delete_webhook(
             subscription.active_webhooks_count -= 1
             
         db.commit()
+        
+        if was_shared:
+            marketplace_index.invalidate()
 
         return {
             "status": "success",
@@ -553,6 +563,7 @@ async def toggle_share_webhook(
 
             db.commit()
             db.refresh(webhook)
+            marketplace_index.invalidate()
 
             # Create a properly formatted response using the secure model
             return WebhookSecureOut(
@@ -595,41 +606,21 @@ async def toggle_share_webhook(
             detail=f"Failed to update webhook sharing status: {str(e)}"
         )
 
-@router.get("/shared", response_model=List[WebhookOut])
+@router.get("/shared", response_model=List[MarketplaceStrategyOut])
 @check_subscription
 async def list_shared_strategies(
+    response: Response,
+    sort: str = Query("rating", pattern="^(rating|subscribers|recent)$"),
+    limit: int = Query(50, ge=1, le=100),
+    offset: int = Query(0, ge=0),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """List all shared strategies"""
+    """List shared strategies, sorted by rating, subscribers or recency (total in X-Total-Count)"""
     try:
-        webhooks = (
-            db.query(Webhook)
-            .join(User)
-            .filter(Webhook.is_shared == True)
-            .all()
-        )
-
-        # Generate response with webhook URLs
-        response = []
-        for webhook in webhooks:
-            webhook_data = webhook.__dict__.copy()
-            
-            # Generate webhook URL
-            base_url = settings.SERVER_HOST.rstrip('/')
-            webhook_data["webhook_url"] = f"{base_url}/api/v1/webhooks/{webhook.token}"
-            
-            # Add username from relationship
-            webhook_data["username"] = webhook.user.username
-            
-            # Remove SQLAlchemy state
-            webhook_data.pop('_sa_instance_state', None)
-            # Remove user object as we already have username
-            webhook_data.pop('user', None)
-            
-            response.append(webhook_data)
-
-        return response
+        strategies, total = marketplace_index.get_page(db, sort=sort, limit=limit, offset=offset)
+        response.headers["X-Total-Count"] = str(total)
+        return strategies
 
     except Exception as e:
         logger.error(f"Error fetching shared strategies: {str(e)}")
@@ -790,12 +781,11 @@ async def rate_strategy(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    
-    print(f"Received rating request - Token: {token}, Rating: {rating}")
-
     """Rate a strategy"""
+    if rating < 1 or rating > 5:
+        raise HTTPException(status_code=400, detail="Rating must be between 1 and 5")
+
     try:
-        rating = rating_data.rating
         # Get the webhook
         webhook = db.query(Webhook).filter(
             Webhook.token == token,
@@ -817,18 +807,20 @@ async def rate_strategy(
                 detail="You must be subscribed to rate this strategy"
             )
 
-        # Get existing rating if any
+        # Get existing rating if any (locked so a concurrent re-rate can't apply a stale delta)
         existing_rating = db.query(WebhookRating).filter(
             WebhookRating.webhook_id == webhook.id,
             WebhookRating.user_id == current_user.id
-        ).first()
+        ).with_for_update().first()
 
         if existing_rating:
             # Update existing rating
+            sum_delta, count_delta = rating - (existing_rating.rating or 0), 0
             existing_rating.rating = rating
             existing_rating.rated_at = datetime.utcnow()
         else:
             # Create new rating
+            sum_delta, count_delta = rating, 1
             new_rating = WebhookRating(
                 webhook_id=webhook.id,
                 user_id=current_user.id,
@@ -836,24 +828,28 @@ async def rate_strategy(
             )
             db.add(new_rating)
 
-        # Update webhook's average rating
-        all_ratings = db.query(WebhookRating).filter(
-            WebhookRating.webhook_id == webhook.id
-        ).all()
-        
-        total_ratings = len(all_ratings) + (1 if not existing_rating else 0)
-        rating_sum = sum(r.rating for r in all_ratings) + (rating if not existing_rating else 0)
-        
-        webhook.rating = rating_sum / total_ratings
-        webhook.total_ratings = total_ratings
+        # Apply the change to the running sum and count atomically in SQL
+        new_sum = func.coalesce(Webhook.rating_sum, 0) + sum_delta
+        new_count = func.coalesce(Webhook.total_ratings, 0) + count_delta
+        new_average, new_total = db.execute(
+            update(Webhook)
+            .where(Webhook.id == webhook.id)
+            .values(
+                rating_sum=new_sum,
+                total_ratings=new_count,
+                rating=case((new_count > 0, cast(new_sum, Float) / new_count), else_=0.0)
+            )
+            .returning(Webhook.rating, Webhook.total_ratings)
+            .execution_options(synchronize_session=False)
+        ).one()
 
         db.commit()
 
         return {
             "status": "success",
             "message": "Rating updated successfully",
-            "new_rating": webhook.rating,
-            "total_ratings": webhook.total_ratings
+            "new_rating": new_average,
+            "total_ratings": new_total
         }
 
     except HTTPException:
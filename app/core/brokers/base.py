@@ -31,6 +31,14 @@ class OrderError(BrokerException):
     """Order-related errors"""
     pass
 
+class DuplicateOrderError(OrderError):
+    """The broker rejected an order because its client order id was already used"""
+
+    def __init__(self, message: str, order: Optional[Dict[str, Any]] = None):
+        super().__init__(message)
+        # The order accepted earlier under the same client order id, if known
+        self.order = order
+
 class BaseBroker(ABC):
     """
     Base class for all broker implementations.
@@ -100,7 +108,7 @@ class BaseBroker(ABC):
 
     @abstractmethod
     async def get_orders(self, account: BrokerAccount) -> List[Dict[str, Any]]:
-        """Get orders for an account"""
+        """Get orders for an account, each with order_id, client_order_id and status"""
         pass
 
     # Order Management Methods
@@ -192,6 +200,24 @@ class BaseBroker(ABC):
             BrokerAccount.environment == environment
         ).first()
 
+    async def find_order_by_client_id(
+        self,
+        account: BrokerAccount,
+        client_order_id: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Find the order listed under a client order id, if the broker accepted one"""
+        if not client_order_id:
+            return None
+        try:
+            orders = await self.get_orders(account)
+        except Exception as e:
+            logger.warning(f"Could not look up order {client_order_id}: {str(e)}")
+            return None
+        return next(
+            (order for order in orders or () if order.get("client_order_id") == client_order_id),
+            None
+        )
+
     # Response Normalization Methods
     def normalize_order_response(self, raw_response: Dict[str, Any]) -> Dict[str, Any]:
         """Normalize broker-specific order response to standard format"""
@@ -5,21 +5,27 @@ import hmac
 import logging
 import json
 import time
-import aiohttp
 import asyncio
 from urllib.parse import urlencode
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
-from ..base import BaseBroker, AuthenticationError, ConnectionError, OrderError
+from ..base import BaseBroker, AuthenticationError, ConnectionError, OrderError, DuplicateOrderError
 from ..config import BrokerEnvironment
 from ....models.broker import BrokerAccount, BrokerCredentials
 from ....models.user import User
 from ....core.config import settings
+from ....core.lazy_imports import lazy_module
+
+# aiohttp is only needed once a Binance account is actually used
+aiohttp = lazy_module("aiohttp")
 
 logger = logging.getLogger(__name__)
 
+# Error code and message Binance returns for a reused newClientOrderId
+DUPLICATE_ORDER_ERROR = (-2010, "Duplicate order sent.")
+
 
 class BinanceOrderType:
     MARKET = "MARKET"
@@ -366,6 +372,9 @@ class BinanceBroker(BaseBroker):
                 params['timeInForce'] = order_data['timeInForce']
             if 'stopPrice' in order_data:
                 params['stopPrice'] = order_data['stopPrice']
+            if order_data.get('client_order_id'):
+                # Binance rejects a second order with the same client id
+                params['newClientOrderId'] = order_data['client_order_id']
             
             headers = self._prepare_headers(credentials.access_token)
             query_string = self._prepare_signed_params(params, credentials.refresh_token)
@@ -378,12 +387,48 @@ class BinanceBroker(BaseBroker):
                         return self._transform_order_result(order_result)
                     else:
                         error_data = await response.json()
-                        raise OrderError(f"Failed to place order: {error_data.get('msg', 'Unknown error')}")
+                        error_msg = f"Failed to place order: {error_data.get('msg', 'Unknown error')}"
+                        if (error_data.get('code'), error_data.get('msg')) == DUPLICATE_ORDER_ERROR:
+                            existing = await self._get_order_by_client_id(
+                                credentials, order_data['symbol'], order_data.get('client_order_id')
+                            )
+                            raise DuplicateOrderError(error_msg, order=existing)
+                        raise OrderError(error_msg)
                         
+        except DuplicateOrderError:
+            raise
         except Exception as e:
             logger.error(f"Error placing Binance order: {e}")
             raise OrderError(f"Failed to place order: {e}")
     
+    async def _get_order_by_client_id(
+        self,
+        credentials: BrokerCredentials,
+        symbol: str,
+        client_order_id: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Look up an order by client order id, including orders that are no longer open"""
+        if not client_order_id:
+            return None
+        try:
+            params = {
+                'symbol': symbol,
+                'origClientOrderId': client_order_id,
+                'timestamp': int(time.time() * 1000)
+            }
+            headers = self._prepare_headers(credentials.access_token)
+            query_string = self._prepare_signed_params(params, credentials.refresh_token)
+            
+            async with aiohttp.ClientSession() as session:
+                url = f"{self.api_urls['live']}/api/v3/order?{query_string}"
+                async with session.get(url, headers=headers) as response:
+                    if response.status != 200:
+                        return None
+                    return self._transform_orders([await response.json()])[0]
+        except Exception as e:
+            logger.warning(f"Could not look up Binance order {client_order_id}: {e}")
+            return None
+    
     async def cancel_order(
         self,
         account: BrokerAccount,
@@ -518,6 +563,7 @@ class BinanceBroker(BaseBroker):
         for order in orders:
             transformed.append({
                 'order_id': order['orderId'],
+                'client_order_id': order.get('clientOrderId'),
                 'symbol': order['symbol'],
                 'side': order['side'],
                 'type': order['type'],
@@ -8,7 +8,7 @@ from sqlalchemy.orm import Session
 
 from ....models.broker import BrokerAccount, BrokerCredentials
 from ....models.user import User
-from ..base import BaseBroker, AuthenticationError, ConnectionError, OrderError
+from ..base import BaseBroker, AuthenticationError, ConnectionError, OrderError, DuplicateOrderError
 from ..config import BrokerEnvironment
 from ....services.digital_ocean_server_manager import digital_ocean_server_manager  # Updated import
 
@@ -381,6 +381,7 @@ class InteractiveBrokersBroker(BaseBroker):
                 for order in orders.get("orders", []):
                     normalized.append({
                         "order_id": order.get("orderId"),
+                        "client_order_id": order.get("order_ref"),
                         "status": order.get("status", "").lower(),
                         "symbol": order.get("ticker", ""),
                         "side": order.get("side", "").lower(),
@@ -449,6 +450,9 @@ class InteractiveBrokersBroker(BaseBroker):
                 "quantity": int(order_data["quantity"]),  # Integer (required by IB)
                 "tif": order_data.get("time_in_force", "GTC").upper()  # String
             }
+            if order_data.get("client_order_id"):
+                # IB rejects a second order with the same cOID
+                ib_order["cOID"] = order_data["client_order_id"]
             
             logger.info(f"Placing IB order: {ib_order}")
             
@@ -464,6 +468,11 @@ class InteractiveBrokersBroker(BaseBroker):
             
             if response.status_code != 200:
                 error_data = response.json()
+                # IB reports a reused cOID without a dedicated error code; an
+                # order already listed under it means this placement was the duplicate
+                existing = await self.find_order_by_client_id(account, order_data.get("client_order_id"))
+                if existing is not None:
+                    raise DuplicateOrderError(f"Order failed: {error_data}", order=existing)
                 raise OrderError(f"Order failed: {error_data}")
             
             result = response.json()
@@ -508,6 +517,8 @@ class InteractiveBrokersBroker(BaseBroker):
                     "message": "Order submitted to IB successfully"
                 }
             
+        except DuplicateOrderError:
+            raise
         except Exception as e:
             logger.error(f"Error placing IB order: {str(e)}")
             raise OrderError(str(e))
@@ -11,13 +11,14 @@ import traceback
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
-from ..base import BaseBroker, AuthenticationError, ConnectionError, OrderError
+from ..base import BaseBroker, AuthenticationError, ConnectionError, OrderError, DuplicateOrderError
 from ..config import BrokerEnvironment
 from ....models.broker import BrokerAccount, BrokerCredentials
 from ....models.user import User
 from ....models.webhook import Webhook
 from ....models.strategy import ActivatedStrategy
 from ....core.config import settings
+from ....core.enhanced_logging import lazy_json
 
 logger = logging.getLogger(__name__)
 
@@ -806,18 +807,36 @@ class TradovateBroker(BaseBroker):
             api_url = self.api_urls[account.environment]
             headers = self._get_auth_headers(account.credentials)
             
-            response = requests.get(
-                f"{api_url}/order/list",
-                headers=headers
-            )
+            orders = await self._make_request('GET', f"{api_url}/order/list", headers=headers)
             
-            if response.status_code != 200:
-                raise ConnectionError(f"Failed to get orders: {response.text}")
-                
-            return response.json()
+            # Order entities carry no clOrdId; it is on the command that placed the order
+            commands = await self._make_request('GET', f"{api_url}/command/list", headers=headers)
+            client_order_ids = {
+                command.get("orderId"): command.get("clOrdId")
+                for command in commands or []
+                if command.get("clOrdId")
+            }
+            
+            return [
+                self._normalize_order(order, client_order_ids.get(order.get("id")))
+                for order in orders or []
+            ]
         except Exception as e:
             logger.error(f"Error getting orders: {str(e)}")
             raise
+    
+    def _normalize_order(self, order: Dict[str, Any], client_order_id: Optional[str]) -> Dict[str, Any]:
+        """Normalize a Tradovate order entity"""
+        return {
+            "order_id": str(order.get("id")),
+            "client_order_id": client_order_id,
+            "status": (order.get("ordStatus") or "").lower(),
+            "side": (order.get("action") or "").lower(),
+            "account_id": order.get("accountId"),
+            "contract_id": order.get("contractId"),
+            "created_at": order.get("timestamp"),
+            "raw_response": order
+        }
 
     async def place_order(self, account: BrokerAccount, order_data: Dict[str, Any]) -> Dict[str, Any]:
         try:
@@ -825,7 +844,7 @@ class TradovateBroker(BaseBroker):
             headers = self._get_auth_headers(account.credentials)
 
             # Log incoming order data
-            logger.info(f"Incoming order data to place_order: {json.dumps(order_data, indent=2)}")
+            logger.info("Incoming order data to place_order: %s", lazy_json(order_data))
 
             tradovate_order = {
                 "accountSpec": account.name,
@@ -837,9 +856,12 @@ class TradovateBroker(BaseBroker):
                 "timeInForce": "GTC",
                 "isAutomated": False
             }
+            if order_data.get("client_order_id"):
+                # Tradovate rejects a second order with the same clOrdId
+                tradovate_order["clOrdId"] = order_data["client_order_id"]
 
             # Log the exact payload being sent to Tradovate
-            logger.info(f"Sending to Tradovate API: {json.dumps(tradovate_order, indent=2)}")
+            logger.info("Sending to Tradovate API: %s", lazy_json(tradovate_order))
 
             # Store raw response before any transformation
             raw_response = await self._make_request(
@@ -850,7 +872,7 @@ class TradovateBroker(BaseBroker):
             )
 
             # Log raw response immediately
-            logger.info(f"Raw Tradovate API Response: {json.dumps(raw_response, indent=2)}")
+            logger.info("Raw Tradovate API Response: %s", lazy_json(raw_response))
 
             # Check for failure response first
             if raw_response.get('failureReason') or raw_response.get('failureText'):
@@ -859,6 +881,12 @@ class TradovateBroker(BaseBroker):
                 error_msg = f"Order failed - {failure_reason}: {failure_text}".strip(': ')
                 
                 logger.error(f"Tradovate order placement failed: {error_msg}")
+                
+                # Tradovate has no failure reason for a reused clOrdId; an order
+                # already listed under it means this placement was the duplicate
+                existing = await self.find_order_by_client_id(account, order_data.get("client_order_id"))
+                if existing is not None:
+                    raise DuplicateOrderError(error_msg, order=existing)
                 raise OrderError(error_msg)
 
             # Check if orderId is present (indicates successful order placement)
@@ -873,11 +901,12 @@ class TradovateBroker(BaseBroker):
                 "filled_quantity": raw_response.get('filledQty', 0),
                 "remaining_quantity": raw_response.get('remainingQty', order_data["quantity"]),
                 "average_price": raw_response.get('avgFillPrice'),
+                "client_order_id": order_data.get("client_order_id"),
                 "timestamp": datetime.utcnow().isoformat(),
                 "raw_response": raw_response  # Include full raw response
             }
 
-            logger.info(f"Normalized response: {json.dumps(normalized_response, indent=2)}")
+            logger.info("Normalized response: %s", lazy_json(normalized_response))
 
             if raw_response.get('orderId'):
                 order_id = str(raw_response.get('orderId'))
@@ -891,14 +920,14 @@ class TradovateBroker(BaseBroker):
 
             return normalized_response
 
+        except DuplicateOrderError:
+            raise
         except Exception as e:
-            logger.error(f"""
-            Order placement failed:
-            Error: {str(e)}
-            Account: {account.name} ({account.account_id})
-            Order Data: {json.dumps(order_data, indent=2)}
-            Traceback: {traceback.format_exc()}
-            """)
+            logger.error(
+                "Order placement failed: %s | Account: %s (%s) | Order Data: %s",
+                str(e), account.name, account.account_id, lazy_json(order_data),
+                exc_info=True
+            )
             raise OrderError(f"Failed to place order: {str(e)}")
 
     async def cancel_order(self, account: BrokerAccount, order_id: str) -> bool:
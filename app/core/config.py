@@ -37,12 +37,19 @@ class Settings(BaseSettings):
     PROD_DATABASE_URL: str = ""
     SQL_ECHO: bool = False 
     
-    # Database pool settings (optimized for memory efficiency)
+    # Database pool settings (per worker process, see get_db_params)
     DB_POOL_SIZE: int = 8
     DB_MAX_OVERFLOW: int = 15
     DB_POOL_TIMEOUT: int = 20
     DB_POOL_RECYCLE: int = 3600  # 1 hour
     DB_POOL_PRE_PING: bool = True
+    DB_MAX_CONNECTIONS: int = 80  # Connection budget shared by all workers (0 = no cap)
+    DB_POOL_SLOW_CHECKOUT_MS: int = 250  # Pool waits longer than this are logged and counted
+    STARTUP_SCHEMA_CHECK: bool = False  # Model/column comparison at worker startup (else: python -m app.db.check_schema)
+
+    # SQL query profiling (per-request query counts and N+1 detection)
+    SQL_PROFILING_ENABLED: bool = False
+    SQL_N_PLUS_ONE_THRESHOLD: int = 5
     
 
     #Email Settings
@@ -58,6 +65,17 @@ class Settings(BaseSettings):
     # Worker settings
     WORKERS: int = 4
 
+    # Order dispatch: default concurrent broker calls per broker (see OrderDispatcher.BROKER_BUDGETS)
+    ORDER_DISPATCH_DEFAULT_BUDGET: int = 8
+
+    # Rollback journaling (append-only step journal instead of in-memory step lists)
+    ROLLBACK_JOURNALING_ENABLED: bool = True
+    # How often a leased worker looks for journals of dead workers (seconds)
+    ROLLBACK_RECOVERY_INTERVAL: int = 30
+
+    # Admin dashboard metrics snapshot refresh interval (seconds)
+    ADMIN_METRICS_REFRESH_INTERVAL: int = 60
+
     HUBSPOT_API_KEY: Optional[str] = None
 
     @property
@@ -100,39 +118,41 @@ class Settings(BaseSettings):
             return None
     
     def get_db_params(self) -> Dict[str, Any]:
-        """Return database connection parameters based on environment"""
-        
-        # Check if we're running ON Railway (production environment)
-        is_on_railway = os.getenv("RAILWAY_ENVIRONMENT") is not None
-        
-        if is_on_railway:
-            # Running ON Railway - use Railway-optimized settings
-            return {
-                "pool_size": 30,           # Higher pool for Railway's low latency
-                "max_overflow": 50,        # More overflow connections
-                "pool_timeout": self.DB_POOL_TIMEOUT,
-                "pool_recycle": 7200,      # Longer recycle (2 hours) - Railway is stable
-                "pool_pre_ping": self.DB_POOL_PRE_PING,
-                "echo": self.SQL_ECHO
-                # Removed connect_args to avoid compatibility issues
-            }
-        else:
-            # Local development connecting to Railway database
-            return {
-                "pool_size": 8,            # Moderate pool for external connection
-                "max_overflow": 15,        # Standard overflow
-                "pool_timeout": 20,
-                "pool_recycle": 1800,      # 30 minutes (shorter for external)
-                "pool_pre_ping": self.DB_POOL_PRE_PING,
-                "echo": self.SQL_ECHO
-                # Removed connect_args to avoid compatibility issues
-            }
+        """
+        Return engine pool parameters for one worker process
+
+        DB_POOL_SIZE and DB_MAX_OVERFLOW are per process, but every gunicorn
+        worker opens its own pool, so both are capped to this worker's share
+        of DB_MAX_CONNECTIONS (pool_size + max_overflow <= budget / WORKERS).
+        """
+        pool_size = max(1, self.DB_POOL_SIZE)
+        max_overflow = max(0, self.DB_MAX_OVERFLOW)
+
+        if self.DB_MAX_CONNECTIONS > 0:
+            per_worker = max(2, self.DB_MAX_CONNECTIONS // max(1, self.WORKERS))
+            pool_size = min(pool_size, per_worker)
+            max_overflow = min(max_overflow, per_worker - pool_size)
+
+        return {
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": self.DB_POOL_TIMEOUT,
+            "pool_recycle": self.DB_POOL_RECYCLE,
+            "pool_pre_ping": self.DB_POOL_PRE_PING,
+            "echo": self.SQL_ECHO
+        }
     
     # Security and Authentication Settings
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 90
     PASSWORD_RESET_TOKEN_EXPIRE_MINUTES: int = 30
+    PRINCIPAL_CACHE_TTL: int = 300  # Seconds an authenticated user snapshot is reused (capped by token expiry)
+    PRINCIPAL_CACHE_LOCAL_TTL: int = 5  # Seconds a worker reuses a snapshot without checking Redis
+    PASSWORD_HASH_WORKERS: int = 2  # Threads per worker for bcrypt hashing/verification
+    PASSWORD_HASH_MAX_PENDING: int = 32  # Hashing calls allowed in flight before auth requests get 503
+    FEATURE_FLAG_CACHE_TTL: int = 60  # Seconds a user's evaluated feature flags are reused
+    FEATURE_FLAG_SYNC_INTERVAL: int = 5  # Seconds between checks for flag config changes made by other workers
     
     # Webhook Settings
     WEBHOOK_SECRET_KEY: str = secrets.token_urlsafe(32)
@@ -194,6 +214,7 @@ class Settings(BaseSettings):
     STRIPE_SECRET_KEY: str
     STRIPE_WEBHOOK_SECRET: str  
     STRIPE_PUBLIC_KEY: str
+    ENTITLEMENT_RECONCILE_INTERVAL: int = 3600  # Seconds between subscription status syncs from Stripe
 
     DEV_STRIPE_SUCCESS_URL: str = "http://localhost:3000/payment/success"
     DEV_STRIPE_CANCEL_URL: str = "http://localhost:3000/pricing"
@@ -247,6 +268,8 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: Optional[str] = None
     
     LOG_LEVEL: str = "DEBUG"
+    LOG_QUEUE_SIZE: int = 10000  # Records buffered for the background log writer before new ones are dropped
+    LOG_SAMPLE_RATES: Dict[str, float] = {}  # Logger name prefix -> fraction of DEBUG/INFO records kept, e.g. {"app.core.brokers": 0.1}
 
     @validator("STRIPE_SECRET_KEY")
     def validate_stripe_secret_key(cls, v):
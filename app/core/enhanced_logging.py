@@ -3,10 +3,20 @@ Enhanced Logging System with Context and Error Details
 
 Provides structured logging with correlation IDs, context data, and detailed
 error information for better debugging and monitoring of trading operations.
+
+Structured payloads are serialized lazily (never for disabled levels or
+sampled-out records), and configure_logging() routes records through a
+queue so formatting and stream I/O happen on a background thread instead
+of the event loop.
 """
 
+import atexit
+import copy
+import itertools
 import logging
+import logging.handlers
 import json
+import queue
 import traceback
 import sys
 import time
@@ -18,6 +28,207 @@ from functools import wraps
 
 from ..core.correlation import CorrelationManager, CorrelationLogger
 
+try:
+    import orjson
+
+    def _dumps(value: Any) -> str:
+        return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+except ImportError:
+    def _dumps(value: Any) -> str:
+        return json.dumps(value, default=str)
+
+class LazyJson:
+    """
+    JSON-encodes a value only when the log record is actually formatted
+
+    Usage:
+        logger.info("Order payload: %s", lazy_json(order_data))
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def snapshot(self) -> "LazyJson":
+        """Shallow copy of the value, so later mutation cannot change the log line"""
+        return LazyJson(_snapshot(self.value))
+
+    def __str__(self) -> str:
+        try:
+            return _dumps(self.value)
+        except Exception:
+            return repr(self.value)
+
+def _snapshot(value: Any) -> Any:
+    if isinstance(value, LazyJson):
+        return value.snapshot()
+    if isinstance(value, (dict, list, set)):
+        return copy.copy(value)
+    return value
+
+def lazy_json(value: Any) -> LazyJson:
+    """Wrap a value for deferred JSON encoding as a %s logging argument"""
+    return LazyJson(value)
+
+class StructuredMessage:
+    """An EnhancedLogger message whose JSON payload is encoded on first use"""
+
+    __slots__ = ("message", "data", "_text")
+
+    def __init__(self, message: str, data: Dict[str, Any]):
+        self.message = message
+        self.data = data
+        self._text = None
+
+    def __str__(self) -> str:
+        if self._text is None:
+            correlation_id = self.data.get("correlation_id")
+            prefix = f"[{correlation_id[:8]}] " if correlation_id else ""
+            self._text = f"{prefix}{self.message} | {_dumps(self.data)}"
+        return self._text
+
+class LogSampler(logging.Filter):
+    """
+    Keeps 1 in N DEBUG/INFO records per configured logger-name prefix
+
+    Warnings and above are never sampled. The longest matching prefix wins;
+    the rate for each logger name is resolved once and cached.
+    """
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None):
+        super().__init__()
+        self.dropped = 0
+        self.configure(rates)
+
+    def configure(self, rates: Optional[Dict[str, float]] = None):
+        """Replace the sampling rates (fraction of records kept per prefix)"""
+        self._intervals = {
+            prefix: max(1, round(1 / rate)) if rate > 0 else 0
+            for prefix, rate in (rates or {}).items()
+        }
+        self._by_logger: Dict[str, Optional[str]] = {}
+        self._counters: Dict[str, Any] = {prefix: itertools.count() for prefix in self._intervals}
+
+    def _prefix_for(self, name: str) -> Optional[str]:
+        if name not in self._by_logger:
+            matches = [
+                prefix for prefix in self._intervals
+                if name == prefix or name.startswith(prefix + ".")
+            ]
+            self._by_logger[name] = max(matches, key=len) if matches else None
+        return self._by_logger[name]
+
+    def sample(self, name: str, levelno: int) -> bool:
+        """Whether a record at this level from this logger should be kept"""
+        if levelno > logging.INFO or not self._intervals:
+            return True
+        prefix = self._prefix_for(name)
+        if prefix is None:
+            return True
+        interval = self._intervals[prefix]
+        if interval and next(self._counters[prefix]) % interval == 0:
+            return True
+        self.dropped += 1
+        return False
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # EnhancedLogger samples before building its payload
+        if getattr(record, "presampled", False):
+            return True
+        return self.sample(record.name, record.levelno)
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueues records without formatting them and never blocks
+
+    %-style arguments are merged into the message at enqueue time so later
+    mutation of the arguments cannot change the log line, except for records
+    with lazy_json arguments: those arguments are shallow-copied and encoded
+    by the listener thread. StructuredMessage payloads are already snapshots
+    and also stay unencoded until the listener formats them. When the queue
+    is full the record is dropped and counted.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.args and not isinstance(record.msg, StructuredMessage):
+            if isinstance(record.args, tuple) and any(isinstance(arg, LazyJson) for arg in record.args):
+                # JSON encoding stays off the calling thread (the event loop)
+                record.args = tuple(_snapshot(arg) for arg in record.args)
+            else:
+                record.msg = record.getMessage()
+                record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[DeferredQueueHandler] = None
+
+# Global log sampler instance
+log_sampler = LogSampler()
+
+def configure_logging(
+    level: int = logging.INFO,
+    fmt: str = '%(asctime)s - %(process)d - %(name)s - %(levelname)s - %(message)s',
+    queue_size: int = 10000,
+    sample_rates: Optional[Dict[str, float]] = None
+):
+    """
+    Install the queued logging pipeline on the root logger
+
+    Records are filtered (level, sampling) on the calling thread and
+    written to stdout by a QueueListener thread. Safe to call again; the
+    previous listener is flushed and replaced.
+    """
+    global _listener, _queue_handler
+
+    shutdown_logging()
+
+    stream_handler = logging.StreamHandler()  # Railway captures stdout/stderr
+    stream_handler.setFormatter(logging.Formatter(fmt))
+
+    log_sampler.configure(sample_rates)
+    _queue_handler = DeferredQueueHandler(queue.Queue(maxsize=queue_size))
+    _queue_handler.addFilter(log_sampler)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(
+        _queue_handler.queue, stream_handler, respect_handler_level=True
+    )
+    _listener.start()
+
+def shutdown_logging():
+    """Write out queued records and stop the listener thread"""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+
+def get_logging_stats() -> Dict[str, Any]:
+    """Get queue depth and dropped record counts"""
+    return {
+        "async": _listener is not None,
+        "queued": _queue_handler.queue.qsize() if _queue_handler else 0,
+        "dropped_queue_full": _queue_handler.dropped if _queue_handler else 0,
+        "dropped_sampled": log_sampler.dropped
+    }
+
+atexit.register(shutdown_logging)
+
 class LogContext:
     """Thread-local context for logging additional information"""
     
@@ -68,6 +279,7 @@ class EnhancedLogger:
     def __init__(self, name: str):
         self.logger = CorrelationLogger(name)
         self.name = name
+        self._logger = logging.getLogger(name)
     
     def _build_log_data(
         self, 
@@ -118,30 +330,39 @@ class EnhancedLogger:
             component=self.name
         )
     
+    def _log(self, level: int, level_name: str, message: str, kwargs: Dict[str, Any]):
+        """Build and emit a structured record, skipping all work when it would be dropped"""
+        if not self._logger.isEnabledFor(level) or not log_sampler.sample(self.name, level):
+            return
+        extra_context = kwargs.get("extra_context")
+        log_data = self._build_log_data(
+            message,
+            level_name,
+            dict(extra_context) if extra_context else None,
+            kwargs.get("error"),
+            kwargs.get("operation")
+        )
+        self._logger.log(level, StructuredMessage(message, log_data), extra={"presampled": True})
+    
     def debug(self, message: str, **kwargs):
         """Log debug message with context"""
-        log_data = self._build_log_data(message, "DEBUG", kwargs.get("extra_context"), kwargs.get("error"), kwargs.get("operation"))
-        self.logger.debug(f"{message} | {json.dumps(log_data, default=str)}")
+        self._log(logging.DEBUG, "DEBUG", message, kwargs)
     
     def info(self, message: str, **kwargs):
         """Log info message with context"""
-        log_data = self._build_log_data(message, "INFO", kwargs.get("extra_context"), kwargs.get("error"), kwargs.get("operation"))
-        self.logger.info(f"{message} | {json.dumps(log_data, default=str)}")
+        self._log(logging.INFO, "INFO", message, kwargs)
     
     def warning(self, message: str, **kwargs):
         """Log warning message with context"""
-        log_data = self._build_log_data(message, "WARNING", kwargs.get("extra_context"), kwargs.get("error"), kwargs.get("operation"))
-        self.logger.warning(f"{message} | {json.dumps(log_data, default=str)}")
+        self._log(logging.WARNING, "WARNING", message, kwargs)
     
     def error(self, message: str, **kwargs):
         """Log error message with context"""
-        log_data = self._build_log_data(message, "ERROR", kwargs.get("extra_context"), kwargs.get("error"), kwargs.get("operation"))
-        self.logger.error(f"{message} | {json.dumps(log_data, default=str)}")
+        self._log(logging.ERROR, "ERROR", message, kwargs)
     
     def critical(self, message: str, **kwargs):
         """Log critical message with context"""
-        log_data = self._build_log_data(message, "CRITICAL", kwargs.get("extra_context"), kwargs.get("error"), kwargs.get("operation"))
-        self.logger.critical(f"{message} | {json.dumps(log_data, default=str)}")
+        self._log(logging.CRITICAL, "CRITICAL", message, kwargs)
     
     def exception(self, message: str, **kwargs):
         """Log exception with full context and stack trace"""
@@ -150,8 +371,7 @@ class EnhancedLogger:
         if exc_value:
             kwargs["error"] = exc_value
         
-        log_data = self._build_log_data(message, "ERROR", kwargs.get("extra_context"), kwargs.get("error"), kwargs.get("operation"))
-        self.logger.error(f"{message} | {json.dumps(log_data, default=str)}")
+        self._log(logging.ERROR, "ERROR", message, kwargs)
     
     def log_operation_start(self, operation: str, **context_data):
         """Log the start of an operation"""
@@ -0,0 +1,155 @@
+"""
+Lazy Imports
+
+Importing the API router used to pull every endpoint module and its
+dependencies into each worker at boot, including subsystems most workers
+never serve. lazy_module() defers a heavy third-party import to the first
+attribute access, and LazyRouter defers an endpoint module to the first
+request under its mount path. Each deferred load is timed so the cost
+shows up in monitoring instead of in worker boot time.
+"""
+
+import asyncio
+import importlib
+import logging
+import threading
+import time
+from types import ModuleType
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import APIRouter
+
+logger = logging.getLogger(__name__)
+
+class LazyImportStats:
+    """Records which deferred imports have been loaded and how long they took"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._registered: Dict[str, str] = {}
+        self._loaded: Dict[str, float] = {}
+        self._failures: Dict[str, str] = {}
+
+    def register(self, name: str, kind: str):
+        with self._lock:
+            self._registered[name] = kind
+
+    def record_load(self, name: str, seconds: float):
+        with self._lock:
+            self._loaded[name] = seconds
+            self._failures.pop(name, None)
+
+    def record_failure(self, name: str, error: str):
+        with self._lock:
+            self._failures[name] = error
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                name: {
+                    "kind": kind,
+                    "loaded": name in self._loaded,
+                    **({"load_ms": round(self._loaded[name] * 1000, 2)} if name in self._loaded else {}),
+                    **({"error": self._failures[name]} if name in self._failures else {})
+                }
+                for name, kind in self._registered.items()
+            }
+
+class LazyModule(ModuleType):
+    """
+    Stand-in for a module that is imported on first attribute access
+
+    Usage:
+        stripe = lazy_module("stripe", on_load=configure_stripe)
+        stripe.Customer.create(...)  # imports stripe, then runs configure_stripe
+    """
+
+    def __init__(self, name: str, on_load: Optional[Callable[[ModuleType], None]] = None):
+        super().__init__(name)
+        self._lazy_on_load = on_load
+        self._lazy_module: Optional[ModuleType] = None
+        self._lazy_lock = threading.RLock()
+
+    def _load(self) -> ModuleType:
+        module = self._lazy_module
+        if module is not None:
+            return module
+
+        with self._lazy_lock:
+            if self._lazy_module is None:
+                started_at = time.perf_counter()
+                module = importlib.import_module(self.__name__)
+                if self._lazy_on_load is not None:
+                    self._lazy_on_load(module)
+                self._lazy_module = module
+                lazy_import_stats.record_load(self.__name__, time.perf_counter() - started_at)
+            return self._lazy_module
+
+    def __getattr__(self, name: str):
+        return getattr(self._load(), name)
+
+    def __setattr__(self, name: str, value):
+        # Settings such as stripe.api_key must land on the real module
+        if name.startswith("_lazy_"):
+            super().__setattr__(name, value)
+        else:
+            setattr(self._load(), name, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+_lazy_modules: Dict[str, LazyModule] = {}
+
+def lazy_module(name: str, on_load: Optional[Callable[[ModuleType], None]] = None) -> LazyModule:
+    """Get the shared lazy stand-in for a module; on_load runs once after import"""
+    module = _lazy_modules.get(name)
+    if module is None:
+        module = _lazy_modules.setdefault(name, LazyModule(name, on_load=on_load))
+        lazy_import_stats.register(name, "module")
+    return module
+
+class LazyRouter:
+    """
+    ASGI app that imports an endpoint module on the first request it receives
+
+    Usage:
+        app.mount("/api/v1/admin", LazyRouter("app.api.v1.endpoints.admin"))
+
+    Routes of a lazy router are not listed in the OpenAPI schema. If the
+    module fails to import, the request fails and the next one retries.
+    """
+
+    def __init__(self, module: str, attr: str = "router"):
+        self.module = module
+        self.attr = attr
+        self._router: Optional[APIRouter] = None
+        self._lock = asyncio.Lock()
+        lazy_import_stats.register(module, "router")
+
+    async def __call__(self, scope, receive, send):
+        router = self._router
+        if router is None:
+            router = await self._load(scope.get("app"))
+        await router(scope, receive, send)
+
+    async def _load(self, app) -> APIRouter:
+        async with self._lock:
+            if self._router is None:
+                started_at = time.perf_counter()
+                try:
+                    # Importing takes long enough that it must not block the event loop
+                    module = await asyncio.to_thread(importlib.import_module, self.module)
+                    router = APIRouter(dependency_overrides_provider=app)
+                    router.include_router(getattr(module, self.attr))
+                except Exception as e:
+                    lazy_import_stats.record_failure(self.module, str(e))
+                    logger.error(f"Failed to load router {self.module}: {str(e)}")
+                    raise
+                self._router = router
+                seconds = time.perf_counter() - started_at
+                lazy_import_stats.record_load(self.module, seconds)
+                logger.info(f"Loaded router {self.module} in {seconds * 1000:.0f}ms")
+            return self._router
+
+# Global lazy import stats instance
+lazy_import_stats = LazyImportStats()
@@ -0,0 +1,197 @@
+"""
+Priority-Aware Order Dispatch Scheduler
+
+Gates broker calls behind per-broker concurrency budgets and grants free
+slots by priority class, so risk-reducing orders (flatten/close) never queue
+behind new entries, leader entries go before follower fan-out, and status
+polling only uses capacity the trading path leaves idle.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Dict, Any, List, Optional, Callable, Awaitable
+
+from ..core.config import settings
+from ..core.correlation import CorrelationLogger
+
+logger = CorrelationLogger(__name__)
+
+class DispatchPriority(IntEnum):
+    """Priority classes for broker work (lower value is served first)"""
+    FLATTEN = 0      # Closing orders and emergency flatten
+    LEADER = 1       # Leader and single-account entries
+    FOLLOWER = 2     # Follower fan-out entries
+    BACKGROUND = 3   # Status polls and other background broker calls
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    future: asyncio.Future = field(compare=False)
+    enqueued_at: float = field(compare=False, default_factory=time.monotonic)
+    cancelled: bool = field(compare=False, default=False)
+
+@dataclass
+class _PriorityStats:
+    dispatched: int = 0
+    queued: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+class _BrokerLane:
+    """Concurrency budget and wait queue for a single broker"""
+
+    def __init__(self, broker_id: str, budget: int, flatten_reserve: int):
+        self.broker_id = broker_id
+        self.budget = budget
+        self.flatten_reserve = flatten_reserve
+        self.in_flight = 0
+        self.waiters: List[_Waiter] = []
+        self.stats: Dict[DispatchPriority, _PriorityStats] = {
+            priority: _PriorityStats() for priority in DispatchPriority
+        }
+
+    def limit_for(self, priority: int) -> int:
+        """Slots a priority class may occupy"""
+        if priority == DispatchPriority.FLATTEN:
+            # Risk-reducing orders get headroom beyond the normal budget
+            return self.budget + self.flatten_reserve
+        if priority == DispatchPriority.BACKGROUND:
+            # Background polling never takes more than half of the budget
+            return max(1, self.budget // 2)
+        return self.budget
+
+    def can_start(self, priority: int) -> bool:
+        return self.in_flight < self.limit_for(priority)
+
+class OrderDispatcher:
+    """
+    Priority scheduler for broker calls
+
+    Usage:
+        result = await order_dispatcher.submit(
+            account.broker_id,
+            DispatchPriority.LEADER,
+            broker.place_order, account, order_data
+        )
+    """
+
+    # Per-broker concurrency budgets; brokers not listed use the default
+    BROKER_BUDGETS: Dict[str, int] = {
+        "tradovate": 8,
+        "binance": 10,
+        "binanceus": 10,
+    }
+
+    def __init__(self, default_budget: int = 8, flatten_reserve: int = 4):
+        self.default_budget = default_budget
+        self.flatten_reserve = flatten_reserve
+        self._lanes: Dict[str, _BrokerLane] = {}
+        self._seq = itertools.count()
+
+    def _lane(self, broker_id: str) -> _BrokerLane:
+        lane = self._lanes.get(broker_id)
+        if lane is None:
+            budget = self.BROKER_BUDGETS.get(broker_id, self.default_budget)
+            lane = self._lanes[broker_id] = _BrokerLane(broker_id, budget, self.flatten_reserve)
+        return lane
+
+    async def _acquire(self, lane: _BrokerLane, priority: DispatchPriority) -> float:
+        """Wait for a slot; returns the time spent queued"""
+        stats = lane.stats[priority]
+
+        # Fast path: free slot and nobody of equal or higher priority waiting
+        if lane.can_start(priority) and (not lane.waiters or lane.waiters[0].priority > priority):
+            lane.in_flight += 1
+            stats.dispatched += 1
+            return 0.0
+
+        waiter = _Waiter(
+            priority=int(priority),
+            seq=next(self._seq),
+            future=asyncio.get_running_loop().create_future()
+        )
+        heapq.heappush(lane.waiters, waiter)
+        stats.queued += 1
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Slot was granted just as we were cancelled - hand it on
+                self._release(lane)
+            else:
+                waiter.cancelled = True
+            raise
+
+        waited = time.monotonic() - waiter.enqueued_at
+        stats.dispatched += 1
+        stats.total_wait += waited
+        stats.max_wait = max(stats.max_wait, waited)
+        return waited
+
+    def _release(self, lane: _BrokerLane):
+        """Free a slot and grant it to the highest-priority waiter that fits"""
+        lane.in_flight -= 1
+
+        while lane.waiters:
+            waiter = lane.waiters[0]
+            if waiter.cancelled or waiter.future.done():
+                heapq.heappop(lane.waiters)
+                continue
+            if not lane.can_start(waiter.priority):
+                # Lower classes have tighter limits, so nobody else can start either
+                break
+            heapq.heappop(lane.waiters)
+            lane.in_flight += 1
+            waiter.future.set_result(None)
+
+    async def submit(
+        self,
+        broker_id: str,
+        priority: DispatchPriority,
+        func: Callable[..., Awaitable[Any]],
+        *args,
+        **kwargs
+    ) -> Any:
+        """Run a broker call once the broker has a free slot for this priority"""
+        lane = self._lane(broker_id or "unknown")
+        waited = await self._acquire(lane, priority)
+
+        if waited > 1.0:
+            logger.warning(
+                f"{priority.name} broker call for {lane.broker_id} waited {waited:.2f}s for a dispatch slot"
+            )
+
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            self._release(lane)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-broker budget usage and queue statistics"""
+        return {
+            broker_id: {
+                "budget": lane.budget,
+                "flatten_reserve": lane.flatten_reserve,
+                "in_flight": lane.in_flight,
+                "queued": len([w for w in lane.waiters if not w.cancelled and not w.future.done()]),
+                "priorities": {
+                    priority.name.lower(): {
+                        "dispatched": stats.dispatched,
+                        "queued_total": stats.queued,
+                        "avg_wait": stats.total_wait / stats.queued if stats.queued else 0.0,
+                        "max_wait": stats.max_wait
+                    }
+                    for priority, stats in lane.stats.items()
+                }
+            }
+            for broker_id, lane in self._lanes.items()
+        }
+
+# Global order dispatcher instance
+order_dispatcher = OrderDispatcher(default_budget=settings.ORDER_DISPATCH_DEFAULT_BUDGET)
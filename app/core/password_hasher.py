@@ -0,0 +1,129 @@
+"""
+Off-Loop Password Hashing
+
+bcrypt hashing and verification deliberately cost 100-300ms of CPU. Run
+inline in an async endpoint, each call stalls every other request on the
+worker's event loop. PasswordHasher runs them on a small dedicated thread
+pool (bcrypt releases the GIL while hashing), caps how many may wait, and
+records queue and run times.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import HTTPException, status
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+class PasswordHasher:
+    """
+    Bounded executor for password hashing work
+
+    Usage:
+        hashed = await password_hasher.run(pwd_context.hash, password)
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 32):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        # Stats
+        self._pending = 0
+        self._active = 0
+        self._peak_pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._total_run = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="password-hash"
+                    )
+        return self._executor
+
+    def _call(self, submitted_at: float, func: Callable, args: tuple) -> Any:
+        started_at = time.perf_counter()
+        wait = started_at - submitted_at
+        with self._lock:
+            self._active += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+                self._total_run += time.perf_counter() - started_at
+
+    async def run(self, func: Callable, *args) -> Any:
+        """Run a hashing function on the pool; 503 if too many calls are already waiting"""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                rejected = True
+            else:
+                rejected = False
+                self._pending += 1
+                self._peak_pending = max(self._peak_pending, self._pending)
+
+        if rejected:
+            logger.warning(f"Password hashing queue full ({self.max_pending} pending), rejecting request")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many authentication requests, please try again shortly",
+                headers={"Retry-After": "1"}
+            )
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._get_executor(), self._call, time.perf_counter(), func, args
+            )
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def shutdown(self):
+        """Stop the worker threads (pending calls finish first)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue and timing statistics"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "active": self._active,
+                "queued": max(0, self._pending - self._active),
+                "peak_pending": self._peak_pending,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(self._total_wait / self._completed * 1000, 2) if self._completed else 0.0,
+                "max_wait_ms": round(self._max_wait * 1000, 2),
+                "avg_run_ms": round(self._total_run / self._completed * 1000, 2) if self._completed else 0.0
+            }
+
+# Global password hasher instance
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
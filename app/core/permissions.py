@@ -3,16 +3,26 @@ from fastapi import HTTPException, Depends, Response
 import logging
 from typing import Callable, Optional, List
 from .config import settings
-from app.services.stripe_service import StripeService
+from app.services.entitlements import Entitlement
 from app.services.subscription_service import SubscriptionService
 from app.db.session import get_db
 from app.core.subscription_tiers import SubscriptionTier
 from app.core.security import get_current_user
+from app.core.principal_cache import principal_cache
 from app.core.upgrade_prompts import upgrade_exception, UpgradeReason, add_upgrade_headers
 from app.services.chat_role_service import is_user_beta_tester as is_user_chat_beta_tester, is_user_admin as is_user_chat_admin, is_user_moderator as is_user_chat_moderator
 
 logger = logging.getLogger(__name__)
 
+def get_entitlement(user) -> Optional[Entitlement]:
+    """The user's entitlement from the principal cache, else from their subscription row"""
+    principal = principal_cache.get(user.email)
+    if principal is not None and principal.user_id == user.id:
+        return principal.entitlement
+    if not user.subscription:
+        return None
+    return Entitlement.from_subscription(user.subscription)
+
 def check_subscription(func: Callable):
     """Verify user has an active subscription"""
     @wraps(func)
@@ -22,49 +32,24 @@ def check_subscription(func: Callable):
             return await func(*args, current_user=current_user, **kwargs)
         
         try:
-            if not current_user or not current_user.subscription:
+            entitlement = get_entitlement(current_user) if current_user else None
+            if entitlement is None:
                 raise HTTPException(
                     status_code=403,
                     detail="Active subscription required"
                 )
 
-            # Handle lifetime users without Stripe (previous app users)
-            if not current_user.subscription.stripe_customer_id:
-                if current_user.subscription.status == "active" and current_user.subscription.is_lifetime:
-                    logger.info(f"Access granted to non-Stripe lifetime user: {current_user.email}")
-                    return await func(*args, current_user=current_user, **kwargs)
-                else:
-                    raise HTTPException(
-                        status_code=403,
-                        detail="Your subscription is not active"
-                    )
-
-            # Handle Stripe users - check for grace period first
-            subscription = current_user.subscription
-            
-            # Allow access during grace period
-            if subscription.is_in_grace_period:
-                logger.info(f"Access granted during grace period: {current_user.email}, days left: {subscription.days_left_in_grace_period}")
-                return await func(*args, current_user=current_user, **kwargs)
-            
-            # Check if subscription is suspended
-            if subscription.is_suspended:
+            # Evaluated from the local subscription row (kept current by Stripe
+            # webhooks and periodic reconciliation) instead of calling Stripe
+            denial_reason = entitlement.denial_reason()
+            if denial_reason:
                 raise HTTPException(
                     status_code=403,
-                    detail="Your subscription is suspended due to payment failure. Please update your payment method to restore access."
+                    detail=denial_reason
                 )
-            
-            # Standard Stripe verification for non-grace period cases
-            stripe_service = StripeService()
-            has_active_subscription = await stripe_service.verify_subscription_status(
-                subscription.stripe_customer_id
-            )
 
-            if not has_active_subscription:
-                raise HTTPException(
-                    status_code=403,
-                    detail="Your subscription is not active"
-                )
+            if entitlement.stripe_managed and entitlement.is_in_grace_period:
+                logger.info(f"Access granted during grace period: {current_user.email}")
 
             return await func(*args, current_user=current_user, **kwargs)
 
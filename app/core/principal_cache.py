@@ -0,0 +1,305 @@
+"""
+Authenticated Principal Cache
+
+Authentication dependencies used to look the user up by email on every
+request. The first lookup now stores a compact snapshot of the user's
+columns and subscription entitlement, keyed by token subject, in Redis (shared by
+all workers) and briefly in-process. Later requests rebuild the User from
+the snapshot and attach it to the request session without a query, so
+routes still receive a normal ORM instance (relationships lazy-load and
+changes can be committed as before).
+
+Snapshots live for PRINCIPAL_CACHE_TTL seconds, never beyond the expiry of
+the token that filled them, and are dropped after any commit that changes
+the user, their subscription or their chat roles.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional, Set, Tuple
+
+from redis.exceptions import RedisError
+from sqlalchemy import DateTime, event, inspect
+from sqlalchemy.orm import Session, contains_eager, make_transient_to_detached
+
+from .config import settings
+from .redis_manager import get_redis_connection
+from ..models.chat import UserChatRole
+from ..models.subscription import Subscription
+from ..models.user import User
+from ..services.entitlements import Entitlement
+
+logger = logging.getLogger(__name__)
+
+PRINCIPAL_KEY = "auth:principal:{subject}"
+PRINCIPAL_SUBJECT_KEY = "auth:principal_subject:{user_id}"
+PENDING_INVALIDATIONS = "principal_cache_invalidations"
+
+# The password hash is left out of snapshots; it lazy-loads if a route needs it
+_USER_COLUMNS = [column.key for column in User.__table__.columns if column.key != "hashed_password"]
+_DATETIME_COLUMNS = {
+    column.key for column in User.__table__.columns if isinstance(column.type, DateTime)
+}
+
+@dataclass(frozen=True)
+class Principal:
+    """Immutable snapshot of an authenticated user"""
+    user_id: int
+    subject: str
+    columns: Tuple[Tuple[str, Any], ...]
+    entitlement: Optional[Entitlement]
+    expires_at: float
+
+    @property
+    def subscription_tier(self) -> Optional[str]:
+        return self.entitlement.tier if self.entitlement else None
+
+    def to_json(self) -> str:
+        columns = {
+            key: value.isoformat() if isinstance(value, datetime) else value
+            for key, value in self.columns
+        }
+        return json.dumps({
+            "user_id": self.user_id,
+            "subject": self.subject,
+            "columns": columns,
+            "entitlement": self.entitlement.to_dict() if self.entitlement else None,
+            "expires_at": self.expires_at
+        })
+
+    @classmethod
+    def from_json(cls, data: str) -> "Principal":
+        raw = json.loads(data)
+        columns = tuple(
+            (key, datetime.fromisoformat(value) if key in _DATETIME_COLUMNS and value else value)
+            for key, value in raw["columns"].items()
+        )
+        return cls(
+            user_id=raw["user_id"],
+            subject=raw["subject"],
+            columns=columns,
+            entitlement=Entitlement.from_dict(raw["entitlement"]) if raw["entitlement"] else None,
+            expires_at=raw["expires_at"]
+        )
+
+class PrincipalCache:
+    """
+    Cache of authenticated user snapshots
+
+    Usage:
+        user = principal_cache.load_user(db, email, token_exp=payload.get("exp"))
+        principal = principal_cache.get(email)  # snapshot only, no session needed
+    """
+
+    def __init__(self, ttl: int = 300, local_ttl: int = 5, max_local_entries: int = 10000):
+        self.ttl = ttl
+        self.local_ttl = local_ttl
+        self.max_local_entries = max_local_entries
+        self._local: "OrderedDict[str, Tuple[Principal, float]]" = OrderedDict()
+        self._subjects: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+        # Stats
+        self._local_hits = 0
+        self._redis_hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    # Snapshot storage
+
+    def _get_local(self, subject: str) -> Optional[Principal]:
+        now = time.time()
+        with self._lock:
+            entry = self._local.get(subject)
+            if entry is None:
+                return None
+            principal, local_expires_at = entry
+            if local_expires_at < now or principal.expires_at < now:
+                del self._local[subject]
+                return None
+            self._local.move_to_end(subject)
+            return principal
+
+    def _set_local(self, principal: Principal):
+        local_expires_at = min(time.time() + self.local_ttl, principal.expires_at)
+        with self._lock:
+            self._local[principal.subject] = (principal, local_expires_at)
+            self._local.move_to_end(principal.subject)
+            self._subjects[principal.user_id] = principal.subject
+            while len(self._local) > self.max_local_entries:
+                _, (evicted, _) = self._local.popitem(last=False)
+                self._subjects.pop(evicted.user_id, None)
+
+    def _get_published(self, subject: str) -> Optional[Principal]:
+        with get_redis_connection() as redis_client:
+            if not redis_client:
+                return None
+            try:
+                data = redis_client.get(PRINCIPAL_KEY.format(subject=subject))
+            except RedisError as e:
+                logger.warning(f"Failed to read cached principal: {e}")
+                return None
+        if not data:
+            return None
+        try:
+            principal = Principal.from_json(data)
+        except (ValueError, KeyError, TypeError):
+            return None
+        return principal if principal.expires_at > time.time() else None
+
+    def _publish(self, principal: Principal):
+        ttl = int(principal.expires_at - time.time())
+        if ttl <= 0:
+            return
+        with get_redis_connection() as redis_client:
+            if not redis_client:
+                return
+            try:
+                pipe = redis_client.pipeline()
+                pipe.set(PRINCIPAL_KEY.format(subject=principal.subject), principal.to_json(), ex=ttl)
+                pipe.set(PRINCIPAL_SUBJECT_KEY.format(user_id=principal.user_id), principal.subject, ex=ttl)
+                pipe.execute()
+            except RedisError as e:
+                logger.warning(f"Failed to publish cached principal: {e}")
+
+    def get(self, subject: str) -> Optional[Principal]:
+        """Get a cached snapshot for a token subject, or None"""
+        principal = self._get_local(subject)
+        if principal is not None:
+            self._local_hits += 1
+            return principal
+
+        principal = self._get_published(subject)
+        if principal is not None:
+            self._redis_hits += 1
+            self._set_local(principal)
+        return principal
+
+    # Authentication
+
+    def _snapshot(self, user: User, token_exp) -> Principal:
+        expires_at = time.time() + self.ttl
+        if token_exp:
+            expires_at = min(expires_at, float(token_exp))
+        return Principal(
+            user_id=user.id,
+            subject=user.email,
+            columns=tuple((key, getattr(user, key)) for key in _USER_COLUMNS),
+            entitlement=Entitlement.from_subscription(user.subscription) if user.subscription else None,
+            expires_at=expires_at
+        )
+
+    @staticmethod
+    def _attach(db: Session, principal: Principal) -> User:
+        """Rebuild the User and add it to the session as if it had been loaded"""
+        user = User()
+        for key, value in principal.columns:
+            setattr(user, key, value)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
+    def load_user(self, db: Session, subject: str, token_exp: Optional[float] = None) -> Optional[User]:
+        """
+        Get the User for a token subject, attached to db
+
+        Served from the cache when possible; otherwise loads the user and
+        subscription in one query and caches the snapshot. Returns None
+        if no such user exists.
+        """
+        principal = self.get(subject)
+        if principal is not None:
+            return self._attach(db, principal)
+
+        self._misses += 1
+        user = db.query(User).outerjoin(User.subscription).options(
+            contains_eager(User.subscription)
+        ).filter(User.email == subject).first()
+        if user is None:
+            return None
+
+        principal = self._snapshot(user, token_exp)
+        if principal.expires_at > time.time():
+            self._set_local(principal)
+            self._publish(principal)
+        return user
+
+    # Invalidation
+
+    def invalidate(self, user_id: Optional[int] = None, subjects: Set[str] = frozenset()):
+        """Drop snapshots for a user id and/or token subjects, in this worker and Redis"""
+        subjects = set(subjects)
+        with self._lock:
+            if user_id is not None and user_id in self._subjects:
+                subjects.add(self._subjects.pop(user_id))
+            for subject in subjects:
+                self._local.pop(subject, None)
+        self._invalidations += 1
+
+        with get_redis_connection() as redis_client:
+            if not redis_client:
+                return
+            try:
+                if user_id is not None:
+                    subject_key = PRINCIPAL_SUBJECT_KEY.format(user_id=user_id)
+                    published_subject = redis_client.get(subject_key)
+                    if published_subject:
+                        subjects.add(published_subject)
+                    redis_client.delete(subject_key)
+                if subjects:
+                    redis_client.delete(*[PRINCIPAL_KEY.format(subject=subject) for subject in subjects])
+            except RedisError as e:
+                logger.warning(f"Failed to invalidate cached principal: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        return {
+            "ttl": self.ttl,
+            "local_ttl": self.local_ttl,
+            "local_entries": len(self._local),
+            "local_hits": self._local_hits,
+            "redis_hits": self._redis_hits,
+            "misses": self._misses,
+            "invalidations": self._invalidations
+        }
+
+# Global principal cache instance
+principal_cache = PrincipalCache(
+    ttl=settings.PRINCIPAL_CACHE_TTL,
+    local_ttl=settings.PRINCIPAL_CACHE_LOCAL_TTL
+)
+
+# Invalidate after commits that touch users, subscriptions or chat roles
+
+@event.listens_for(Session, "after_flush")
+def _collect_principal_changes(session, flush_context):
+    pending = None
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User):
+            subjects = {obj.email} | set(inspect(obj).attrs.email.history.deleted or ())
+            user_id = obj.id
+        elif isinstance(obj, (Subscription, UserChatRole)):
+            subjects, user_id = set(), obj.user_id
+        else:
+            continue
+        if user_id is None and not subjects:
+            continue
+        if pending is None:
+            pending = session.info.setdefault(PENDING_INVALIDATIONS, {})
+        pending.setdefault(user_id, set()).update(s for s in subjects if s)
+
+@event.listens_for(Session, "after_commit")
+def _apply_principal_changes(session):
+    pending = session.info.pop(PENDING_INVALIDATIONS, None)
+    if not pending:
+        return
+    for user_id, subjects in pending.items():
+        principal_cache.invalidate(user_id=user_id, subjects=subjects)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_principal_changes(session):
+    session.info.pop(PENDING_INVALIDATIONS, None)
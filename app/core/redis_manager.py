@@ -1,5 +1,6 @@
 import redis
 import logging
+import threading
 from typing import Optional
 from redis.exceptions import RedisError, ConnectionError as RedisConnectionError
 from contextlib import contextmanager
@@ -15,9 +16,17 @@ class RedisManager:
         self._pool: Optional[redis.ConnectionPool] = None
         self._client: Optional[redis.Redis] = None
         self._initialized = False
+        self._init_lock = threading.Lock()
     
     def initialize(self) -> bool:
-        """Initialize Redis connection pool"""
+        """Initialize Redis connection pool on first use (never at import)"""
+        if self._initialized:
+            return True
+        # Startup steps and request threads may get here at the same time
+        with self._init_lock:
+            return self._initialize()
+    
+    def _initialize(self) -> bool:
         if self._initialized:
             return True
             
@@ -140,7 +149,4 @@ def get_redis_client() -> Optional[redis.Redis]:
 
 def get_redis_connection():
     """Global context manager for Redis connections"""
-    return redis_manager.get_connection()
-
-# Initialize on import
-redis_manager.initialize()
\ No newline at end of file
+    return redis_manager.get_connection()
\ No newline at end of file
@@ -0,0 +1,191 @@
+"""
+Request Pipeline Middleware
+
+Request logging, the subscription presence check, SQL query profiling and
+the Content-Security-Policy header used to be separate @app.middleware("http")
+layers, each wrapping the request in its own call_next task and response
+stream. RequestPipelineMiddleware does all of them in one raw ASGI pass:
+the CSP header is encoded once at import, the path-prefix decisions are
+made once per request, and the time spent in each stage is recorded.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict
+
+from .security import get_user_from_token
+from ..db.query_profiler import query_profiler
+from ..services.subscription_presence import subscription_presence
+
+logger = logging.getLogger(__name__)
+
+# Permissive policy; the frontend loads scripts, sockets and images from many origins
+CSP_HEADER = (
+    b"content-security-policy",
+    "; ".join([
+        "default-src * 'unsafe-inline' 'unsafe-eval' data: blob:",
+        "connect-src * ws: wss:",
+        "script-src * 'unsafe-inline' 'unsafe-eval'",
+        "style-src * 'unsafe-inline'",
+        "img-src * data: blob:",
+        "frame-src *",
+        "font-src * data:",
+        "worker-src * blob:"
+    ]).encode("latin-1")
+)
+
+INTERNAL_ERROR_BODY = json.dumps({"detail": "Internal server error"}, separators=(",", ":")).encode()
+
+class PipelineStats:
+    """Per-stage request timings for the pipeline middleware"""
+
+    STAGES = ("subscription_check", "app", "total")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages = {stage: {"count": 0, "total": 0.0, "max": 0.0} for stage in self.STAGES}
+        self._requests = 0
+        self._errors = 0
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            stats = self._stages[stage]
+            stats["count"] += 1
+            stats["total"] += seconds
+            if seconds > stats["max"]:
+                stats["max"] = seconds
+
+    def record_request(self, total: float, app_time: float, failed: bool):
+        with self._lock:
+            self._requests += 1
+            if failed:
+                self._errors += 1
+        self.record("app", app_time)
+        self.record("total", total)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-stage timings; 'overhead' is time spent outside the app"""
+        with self._lock:
+            stages = {
+                stage: {
+                    "count": stats["count"],
+                    "avg_ms": round(stats["total"] / stats["count"] * 1000, 3) if stats["count"] else 0.0,
+                    "max_ms": round(stats["max"] * 1000, 3)
+                }
+                for stage, stats in self._stages.items()
+            }
+            total, app_time = self._stages["total"], self._stages["app"]
+            return {
+                "requests": self._requests,
+                "errors": self._errors,
+                "stages": stages,
+                "avg_overhead_ms": round(
+                    (total["total"] - app_time["total"]) / total["count"] * 1000, 3
+                ) if total["count"] else 0.0
+            }
+
+class RequestPipelineMiddleware:
+    """
+    Single ASGI middleware for cross-cutting request handling
+
+    Usage:
+        app.add_middleware(RequestPipelineMiddleware, add_profile_headers=True)
+    """
+
+    def __init__(self, app, add_profile_headers: bool = False):
+        self.app = app
+        self.add_profile_headers = add_profile_headers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.perf_counter()
+        path = scope["path"]
+        logger.info(f"Request path: {path}")
+
+        if path.startswith("/api/"):
+            await self._ensure_subscription(scope)
+
+        profile = None
+        response_started = False
+
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                headers = [
+                    header for header in message.get("headers", ())
+                    if header[0] != b"content-security-policy"
+                ]
+                headers.append(CSP_HEADER)
+                if profile is not None and self.add_profile_headers:
+                    headers.extend(
+                        (name.lower().encode("latin-1"), value.encode("latin-1"))
+                        for name, value in query_profiler.response_headers(profile).items()
+                    )
+                message["headers"] = headers
+                if message["status"] == 404:
+                    logger.warning(f"404 Not Found: {path}")
+            await send(message)
+
+        app_started_at = time.perf_counter()
+        failed = False
+        try:
+            if query_profiler.enabled:
+                with query_profiler.profile_request(scope["method"], path) as profile:
+                    try:
+                        await self.app(scope, receive, send_wrapper)
+                    finally:
+                        # Aggregate by route template rather than concrete path
+                        route = scope.get("route")
+                        if route is not None and getattr(route, "path", None):
+                            profile.route = route.path
+            else:
+                await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            failed = True
+            logger.error(f"Request error: {str(e)}")
+            if response_started:
+                raise
+            await send_wrapper({
+                "type": "http.response.start",
+                "status": 500,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(INTERNAL_ERROR_BODY)).encode())
+                ]
+            })
+            await send({"type": "http.response.body", "body": INTERNAL_ERROR_BODY})
+        finally:
+            finished_at = time.perf_counter()
+            pipeline_stats.record_request(finished_at - started_at, finished_at - app_started_at, failed)
+
+    async def _ensure_subscription(self, scope):
+        """Make sure an authenticated API caller has a subscription record"""
+        authorization = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                authorization = value.decode("latin-1")
+                break
+        if not authorization or not authorization.startswith("Bearer "):
+            return
+
+        started_at = time.perf_counter()
+        try:
+            user_email = get_user_from_token(authorization[len("Bearer "):])
+            # Users already known to have a subscription need no queries
+            if user_email and not subscription_presence.is_known(user_email):
+                await asyncio.to_thread(subscription_presence.ensure, user_email)
+        except Exception as e:
+            # Continue with the request even if the check fails
+            logger.error(f"Error in subscription middleware: {str(e)}")
+        finally:
+            pipeline_stats.record("subscription_check", time.perf_counter() - started_at)
+
+# Global pipeline stats instance
+pipeline_stats = PipelineStats()
@@ -7,6 +7,8 @@ data consistency when trading operations fail partway through execution.
 
 import asyncio
 import logging
+import os
+import socket
 import time
 import json
 from typing import Dict, Any, List, Optional, Callable, Awaitable, Union
@@ -17,10 +19,11 @@ from contextlib import asynccontextmanager
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
+from ..core.config import settings
 from ..core.correlation import CorrelationLogger, CorrelationManager
 from ..core.redis_manager import get_redis_connection
 from ..db.session import get_db_context
-from redis.exceptions import RedisError
+from redis.exceptions import RedisError, ResponseError
 
 logger = CorrelationLogger(__name__)
 
@@ -55,15 +58,325 @@ class RollbackContext:
     completed: bool = False
     success: bool = False
     error_message: Optional[str] = None
+    # Journaling mode: (action, rollback_order, payload) tuples resolved on failure
+    journaled_steps: List[tuple] = field(default_factory=list)
+    transaction_context: Optional["TransactionContext"] = None
+
+# Journal record kinds
+JOURNAL_BEGIN = "begin"
+JOURNAL_STEP = "step"
+JOURNAL_END = "end"
+# Written once the ring buffer overflowed; records are missing from the stream
+JOURNAL_OVERFLOW = "overflow"
+
+# Only one worker scans for orphaned journals per recovery interval
+RECOVERY_LEASE_KEY = "rollback_journal_recovery_lease"
+
+# Broker order statuses after which a recovered order has nothing left to cancel
+TERMINAL_ORDER_STATUSES = ("filled", "completed", "cancelled", "canceled", "rejected", "expired")
+
+class RollbackJournal:
+    """
+    Append-only journal of rollback steps for crash recovery.
+
+    Records are written into a pre-allocated ring buffer on the hot path and
+    flushed to a per-worker Redis stream in batches by a background loop. A
+    transaction whose "begin" record has no matching "end" record in the
+    stream of a dead worker is considered interrupted and is compensated by
+    ``recover_orphaned_transactions``.
+
+    A full ring buffer never overwrites records: new records are refused and
+    the stream is marked as overflowed, because a lost "end" record would make
+    a committed transaction look interrupted. Overflowed streams are left for
+    manual review instead of being compensated.
+    """
+
+    STREAM_PREFIX = "rollback_journal"
+    CLAIMED_PREFIX = "rollback_journal_claimed"
+
+    def __init__(
+        self,
+        capacity: int = 4096,
+        flush_interval: float = 1.0,
+        batch_size: int = 256,
+        stream_ttl: int = 86400
+    ):
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.stream_ttl = stream_ttl
+        self.worker_id = f"{socket.gethostname()}_{os.getpid()}_{int(time.time())}"
+
+        self._records: List[Optional[tuple]] = [None] * capacity
+        self._write_seq = 0
+        self._flushed_seq = 0
+        self._dropped = 0
+        self._overflowed = False
+        self._overflow_marked = False
+        self._flush_task: Optional[asyncio.Task] = None
+        self._running = False
+
+    @property
+    def stream_key(self) -> str:
+        return f"{self.STREAM_PREFIX}:{self.worker_id}"
+
+    @property
+    def alive_key(self) -> str:
+        return f"{self.STREAM_PREFIX}_alive:{self.worker_id}"
+
+    def append(self, kind: str, transaction_id: str, *fields: Any):
+        """Append a record to the ring buffer (O(1), no I/O)"""
+        if self._write_seq - self._flushed_seq >= self.capacity:
+            # Unflushed records are never overwritten; the journal is marked
+            # unsafe to recover instead
+            if not self._overflowed:
+                logger.error("Rollback journal buffer overflowed; this worker's journal will not be auto-recovered")
+            self._overflowed = True
+            self._dropped += 1
+            return
+
+        self._records[self._write_seq % self.capacity] = (kind, transaction_id, time.time(), fields)
+        self._write_seq += 1
+
+    def append_durable(self, kind: str, transaction_id: str, *fields: Any) -> bool:
+        """Append a record and write it to the stream before returning"""
+        self.append(kind, transaction_id, *fields)
+        target = self._write_seq
+        self.flush()
+        return self._flushed_seq >= target
+
+    def _pending(self) -> tuple:
+        """Up to batch_size unflushed records and the sequence after them"""
+        end = min(self._write_seq, self._flushed_seq + self.batch_size)
+        return [self._records[seq % self.capacity] for seq in range(self._flushed_seq, end)], end
+
+    def flush(self) -> int:
+        """Flush pending records to the Redis stream, returns records written"""
+        written = 0
+        try:
+            with get_redis_connection() as redis_client:
+                if not redis_client:
+                    return 0
+
+                # The heartbeat is refreshed on every tick, idle or not, so a
+                # live worker's journal is never taken for orphaned
+                redis_client.setex(self.alive_key, int(self.flush_interval * 10) + 30, 1)
+
+                while self._flushed_seq < self._write_seq or (self._overflowed and not self._overflow_marked):
+                    batch, end = self._pending()
+                    pipe = redis_client.pipeline(transaction=False)
+                    for kind, transaction_id, ts, fields in batch:
+                        pipe.xadd(self.stream_key, {
+                            "kind": kind,
+                            "tid": transaction_id,
+                            "ts": ts,
+                            "data": json.dumps(fields, default=str)
+                        })
+                    if self._overflowed and not self._overflow_marked:
+                        pipe.xadd(self.stream_key, {"kind": JOURNAL_OVERFLOW, "tid": "", "ts": time.time(), "data": "[]"})
+                    pipe.expire(self.stream_key, self.stream_ttl)
+                    pipe.execute()
+
+                    # Only records Redis accepted count as flushed; a failed
+                    # batch is retried on the next tick
+                    self._flushed_seq = end
+                    if self._overflowed:
+                        self._overflow_marked = True
+                    written += len(batch)
+
+        except RedisError as e:
+            logger.warning(f"Failed to flush rollback journal: {e}")
+        except Exception as e:
+            logger.error(f"Unexpected error flushing rollback journal: {e}")
+
+        return written
+
+    async def start(self):
+        """Start the background flush loop"""
+        if self._running:
+            return
+
+        self._running = True
+        self._flush_task = asyncio.create_task(self._flush_loop())
+        logger.info(f"Rollback journal started for worker {self.worker_id}")
+
+    async def stop(self):
+        """Stop the flush loop and write out remaining records"""
+        self._running = False
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+
+        self.flush()
+
+        # A clean shutdown leaves nothing to recover
+        try:
+            with get_redis_connection() as redis_client:
+                if redis_client:
+                    redis_client.delete(self.alive_key)
+        except Exception as e:
+            logger.error(f"Error clearing rollback journal heartbeat: {e}")
+
+        logger.info("Rollback journal stopped")
+
+    async def _flush_loop(self):
+        """Periodically flush the ring buffer"""
+        try:
+            while self._running:
+                self.flush()
+                await asyncio.sleep(self.flush_interval)
+        except asyncio.CancelledError:
+            pass
+
+    def read_orphaned_transactions(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Fold the journals of dead workers into interrupted transactions.
+
+        Each dead worker's stream is first claimed by renaming it, so when
+        several workers boot at once only one of them recovers it.
+
+        Returns a mapping of claimed stream key to its interrupted
+        transactions, each with the journaled steps needed to compensate it.
+        """
+        orphaned: Dict[str, Dict[str, Any]] = {}
+
+        with get_redis_connection() as redis_client:
+            if not redis_client:
+                return orphaned
+
+            for stream_key in redis_client.scan_iter(f"{self.STREAM_PREFIX}:*"):
+                worker_id = stream_key.split(":", 1)[1]
+                if worker_id == self.worker_id:
+                    continue
+                if redis_client.exists(f"{self.STREAM_PREFIX}_alive:{worker_id}"):
+                    continue
+
+                claimed_key = f"{self.CLAIMED_PREFIX}:{worker_id}"
+                try:
+                    # RENAME is atomic: a worker that lost the race gets "no such key"
+                    redis_client.rename(stream_key, claimed_key)
+                except ResponseError:
+                    continue
+
+                transactions: Dict[str, Dict[str, Any]] = {}
+                overflowed = False
+                for _, entry in redis_client.xrange(claimed_key):
+                    transaction_id = entry.get("tid")
+                    kind = entry.get("kind")
+                    data = json.loads(entry.get("data") or "[]")
+
+                    if kind == JOURNAL_OVERFLOW:
+                        overflowed = True
+                        break
+                    if kind == JOURNAL_BEGIN:
+                        transactions[transaction_id] = {
+                            "transaction_id": transaction_id,
+                            "operation_type": data[0] if data else None,
+                            "started_at": float(entry.get("ts", 0)),
+                            "steps": []
+                        }
+                    elif kind == JOURNAL_STEP and transaction_id in transactions:
+                        transactions[transaction_id]["steps"].append(data)
+                    elif kind == JOURNAL_END:
+                        transactions.pop(transaction_id, None)
+
+                if overflowed:
+                    # End records may be missing, so compensating could cancel
+                    # orders of committed transactions
+                    logger.error(
+                        f"Rollback journal of worker {worker_id} overflowed and was not recovered; "
+                        f"review {claimed_key} manually"
+                    )
+                    continue
+
+                orphaned[claimed_key] = transactions
+
+        return orphaned
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get journal statistics"""
+        return {
+            "worker_id": self.worker_id,
+            "running": self._running,
+            "capacity": self.capacity,
+            "records_written": self._write_seq,
+            "records_pending": self._write_seq - self._flushed_seq,
+            "records_dropped": self._dropped,
+            "overflowed": self._overflowed
+        }
 
 class RollbackManager:
     """
     Manages rollback operations for failed trading transactions
+
+    In journaling mode, rollback steps are recorded as compact tuples in an
+    append-only journal instead of ``RollbackStep`` objects, and the
+    compensation callbacks are only resolved if the transaction fails.
+    Journals of dead workers are recovered by a periodic loop: a crashed
+    worker's heartbeat outlives it by up to its TTL and gunicorn respawns it
+    sooner, so a check at boot alone would skip it.
     """
     
-    def __init__(self):
+    def __init__(self, journaling: bool = False, recovery_interval: int = 30):
         self._active_contexts: Dict[str, RollbackContext] = {}
         self._lock = asyncio.Lock()
+        self.journaling = journaling
+        self.journal: Optional[RollbackJournal] = RollbackJournal() if journaling else None
+        self.recovery_interval = recovery_interval
+        self._recovery_task: Optional[asyncio.Task] = None
+        self._recovered = 0
+    
+    async def start(self):
+        """Start the journal and the periodic recovery of orphaned journals"""
+        if not self.journal or self._recovery_task:
+            return
+        
+        await self.journal.start()
+        self._recovery_task = asyncio.create_task(self._recovery_loop())
+        logger.info(f"Rollback journal recovery started (every {self.recovery_interval}s)")
+    
+    async def stop(self):
+        """Stop the recovery loop and flush the journal"""
+        if self._recovery_task and not self._recovery_task.done():
+            self._recovery_task.cancel()
+            try:
+                await self._recovery_task
+            except asyncio.CancelledError:
+                pass
+        self._recovery_task = None
+        
+        if self.journal:
+            await self.journal.stop()
+    
+    def _acquire_recovery_lease(self) -> bool:
+        """Only one worker recovers per interval; without Redis there is nothing to recover"""
+        with get_redis_connection() as redis_client:
+            if not redis_client:
+                return False
+            try:
+                return bool(redis_client.set(
+                    RECOVERY_LEASE_KEY, self.journal.worker_id, nx=True, ex=max(1, self.recovery_interval - 1)
+                ))
+            except RedisError:
+                return False
+    
+    async def _recovery_loop(self):
+        try:
+            while True:
+                try:
+                    if await asyncio.to_thread(self._acquire_recovery_lease):
+                        await self.recover_orphaned_transactions()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Rollback journal recovery failed: {str(e)}")
+                await asyncio.sleep(self.recovery_interval)
+        except asyncio.CancelledError:
+            pass
     
     @asynccontextmanager
     async def transaction_context(
@@ -87,6 +400,11 @@ class RollbackManager:
         if transaction_id is None:
             transaction_id = f"{operation_type}_{int(time.time() * 1000)}"
         
+        if self.journaling:
+            async with self._journaled_transaction_context(operation_type, transaction_id) as ctx:
+                yield ctx
+            return
+        
         correlation_id = CorrelationManager.get_correlation_id()
         
         context = RollbackContext(
@@ -126,6 +444,50 @@ class RollbackManager:
                 if transaction_id in self._active_contexts:
                     del self._active_contexts[transaction_id]
     
+    @asynccontextmanager
+    async def _journaled_transaction_context(self, operation_type: str, transaction_id: str):
+        """Low-overhead transaction context backed by the rollback journal"""
+        context = RollbackContext(
+            transaction_id=transaction_id,
+            operation_type=operation_type,
+            correlation_id=CorrelationManager.get_correlation_id(),
+            started_at=time.time()
+        )
+        
+        # Single-threaded event loop: plain dict operations need no lock here
+        self._active_contexts[transaction_id] = context
+        self.journal.append(JOURNAL_BEGIN, transaction_id, operation_type)
+        
+        tx_context = TransactionContext(context, self)
+        try:
+            yield tx_context
+            
+            context.completed = True
+            context.success = True
+            if any(step[0] == RollbackAction.BROKER_ORDER_CANCEL for step in context.journaled_steps):
+                # A lost end record would make recovery cancel the orders of a
+                # committed transaction, so it is written before returning
+                if not self.journal.append_durable(JOURNAL_END, transaction_id, "committed"):
+                    logger.error(f"Could not persist commit of transaction {transaction_id}; it will be flushed later")
+            else:
+                self.journal.append(JOURNAL_END, transaction_id, "committed")
+            
+        except Exception as e:
+            context.completed = True
+            context.success = False
+            context.error_message = str(e)
+            
+            logger.error(f"Transaction failed: {operation_type} [{transaction_id}] - {str(e)}")
+            
+            # Resolve journaled steps into callbacks only now that they are needed
+            tx_context.resolve_journal()
+            await self._execute_rollback(context)
+            self.journal.append(JOURNAL_END, transaction_id, "rolled_back")
+            raise
+            
+        finally:
+            self._active_contexts.pop(transaction_id, None)
+    
     async def _execute_rollback(self, context: RollbackContext):
         """Execute all rollback steps for a failed transaction"""
         if not context.steps:
@@ -204,9 +566,79 @@ class RollbackManager:
         context.success = False
         context.error_message = "Force rollback requested"
         
+        if context.transaction_context is not None:
+            context.transaction_context.resolve_journal()
+        
         await self._execute_rollback(context)
         return True
     
+    async def recover_orphaned_transactions(self) -> int:
+        """
+        Compensate transactions left open by crashed workers.
+        
+        Database transactions of a dead worker were already rolled back by the
+        database when its connections dropped, so only broker order
+        cancellations and notifications are replayed from the journal. Each
+        order is checked against the orders table and the broker first and
+        only cancelled if it is still working.
+        
+        Returns:
+            int: Number of interrupted transactions that were compensated
+        """
+        if not self.journal:
+            return 0
+        
+        try:
+            orphaned = self.journal.read_orphaned_transactions()
+        except Exception as e:
+            logger.warning(f"Failed to read rollback journals: {e}")
+            return 0
+        
+        recovered = 0
+        for stream_key, transactions in orphaned.items():
+            for transaction in transactions.values():
+                logger.warning(
+                    f"Recovering interrupted transaction {transaction['transaction_id']} "
+                    f"({transaction['operation_type']}) with {len(transaction['steps'])} journaled steps"
+                )
+                
+                context = RollbackContext(
+                    transaction_id=transaction["transaction_id"],
+                    operation_type=transaction["operation_type"] or "unknown",
+                    correlation_id=None,
+                    started_at=transaction["started_at"],
+                    completed=True,
+                    error_message="Worker crashed during transaction"
+                )
+                recovery = TransactionContext(context, self)
+                for action, rollback_order, payload in transaction["steps"]:
+                    if action == RollbackAction.DATABASE_ROLLBACK.value:
+                        continue
+                    recovery.resolve_recovered_step(RollbackAction(action), rollback_order, payload)
+                
+                await self._execute_rollback(context)
+                recovered += 1
+                self._recovered += 1
+            
+            try:
+                with get_redis_connection() as redis_client:
+                    if redis_client:
+                        redis_client.delete(stream_key)
+            except Exception as e:
+                logger.error(f"Failed to remove recovered rollback journal {stream_key}: {e}")
+        
+        if recovered:
+            logger.warning(f"Recovered {recovered} interrupted transactions from rollback journals")
+        return recovered
+    
+    def get_recovery_stats(self) -> Dict[str, Any]:
+        """Get orphaned journal recovery statistics"""
+        return {
+            "recovery_running": self._recovery_task is not None and not self._recovery_task.done(),
+            "recovery_interval": self.recovery_interval,
+            "transactions_recovered": self._recovered
+        }
+    
     def get_active_transactions(self) -> Dict[str, Dict[str, Any]]:
         """Get information about active transactions"""
         return {
@@ -216,7 +648,7 @@ class RollbackManager:
                 "correlation_id": ctx.correlation_id,
                 "started_at": ctx.started_at,
                 "duration": time.time() - ctx.started_at,
-                "rollback_steps": len(ctx.steps),
+                "rollback_steps": len(ctx.steps) + len(ctx.journaled_steps),
                 "completed": ctx.completed,
                 "success": ctx.success
             }
@@ -232,6 +664,76 @@ class TransactionContext:
         self.context = context
         self.manager = manager
         self._db_session: Optional[Session] = None
+        context.transaction_context = self
+    
+    def _journal_step(
+        self,
+        action: RollbackAction,
+        rollback_order: int,
+        payload: Dict[str, Any],
+        durable: Dict[str, Any]
+    ):
+        """
+        Record a built-in rollback step without building a RollbackStep.
+        
+        ``payload`` may hold live objects (broker instance, account) used if
+        this worker rolls back; ``durable`` is the serializable subset written
+        to the journal stream for crash recovery.
+        """
+        self.context.journaled_steps.append((action, rollback_order, payload))
+        self.manager.journal.append(
+            JOURNAL_STEP, self.context.transaction_id, action.value, rollback_order, durable
+        )
+    
+    def resolve_journal(self):
+        """Turn journaled steps into executable rollback steps"""
+        resolvers = {
+            RollbackAction.DATABASE_ROLLBACK: self._rollback_database_transaction,
+            RollbackAction.BROKER_ORDER_CANCEL: self._cancel_broker_order,
+            RollbackAction.NOTIFICATION_SEND: self._send_notification,
+        }
+        
+        for action, rollback_order, payload in self.context.journaled_steps:
+            if action == RollbackAction.DATABASE_ROLLBACK:
+                description = "Rollback database transaction"
+            elif action == RollbackAction.BROKER_ORDER_CANCEL:
+                description = f"Cancel broker order: {payload['order_id']}"
+            else:
+                description = f"Send {payload['notification_type']} notification"
+            
+            self.context.steps.append(RollbackStep(
+                action=action,
+                description=description,
+                callback=resolvers[action],
+                kwargs=payload,
+                rollback_order=rollback_order
+            ))
+        
+        self.context.journaled_steps.clear()
+    
+    def resolve_recovered_step(
+        self,
+        action: RollbackAction,
+        rollback_order: int,
+        payload: Dict[str, Any]
+    ):
+        """Turn a step read back from a crashed worker's journal into a rollback step"""
+        if action == RollbackAction.BROKER_ORDER_CANCEL:
+            self.context.steps.append(RollbackStep(
+                action=action,
+                description=f"Cancel broker order: {payload['order_id']}",
+                callback=self._cancel_recovered_broker_order,
+                kwargs=payload,
+                rollback_order=rollback_order
+            ))
+        elif action == RollbackAction.NOTIFICATION_SEND:
+            self.context.steps.append(RollbackStep(
+                action=action,
+                description=f"Send {payload['notification_type']} notification",
+                callback=self._send_notification,
+                kwargs=payload,
+                rollback_order=rollback_order
+            ))
     
     async def add_rollback_step(
         self,
@@ -266,12 +768,15 @@ class TransactionContext:
             self._db_session = db
             
             # Register database rollback step
-            await self.add_rollback_step(
-                action=RollbackAction.DATABASE_ROLLBACK,
-                description="Rollback database transaction",
-                callback=self._rollback_database_transaction,
-                rollback_order=0  # Database rollbacks should happen first
-            )
+            if self.manager.journaling:
+                self._journal_step(RollbackAction.DATABASE_ROLLBACK, 0, {}, {})
+            else:
+                await self.add_rollback_step(
+                    action=RollbackAction.DATABASE_ROLLBACK,
+                    description="Rollback database transaction",
+                    callback=self._rollback_database_transaction,
+                    rollback_order=0  # Database rollbacks should happen first
+                )
             
             try:
                 # Start transaction
@@ -310,6 +815,19 @@ class TransactionContext:
         rollback_order: int = 1
     ):
         """Add broker order cancellation to rollback steps"""
+        if self.manager.journaling:
+            self._journal_step(
+                RollbackAction.BROKER_ORDER_CANCEL,
+                rollback_order,
+                {"broker_instance": broker_instance, "account": account, "order_id": order_id},
+                {
+                    "broker_id": getattr(account, "broker_id", None),
+                    "account_id": getattr(account, "account_id", None),
+                    "order_id": order_id
+                }
+            )
+            return
+        
         await self.add_rollback_step(
             action=RollbackAction.BROKER_ORDER_CANCEL,
             description=f"Cancel broker order: {order_id}",
@@ -334,6 +852,50 @@ class TransactionContext:
             logger.error(f"Error cancelling broker order {order_id}: {str(e)}")
             return False
     
+    async def _cancel_recovered_broker_order(self, broker_id: str, account_id: str, order_id: str) -> bool:
+        """
+        Cancel a broker order journaled by a crashed worker
+        
+        The crash may have hit after the transaction committed and before its
+        end record was written, so the order is only cancelled if neither the
+        orders table nor the broker shows it as done.
+        """
+        from ..core.brokers.base import BaseBroker
+        from ..models.broker import BrokerAccount
+        from ..models.order import Order
+        
+        async with get_db_context() as db:
+            account = db.query(BrokerAccount).filter(
+                BrokerAccount.broker_id == broker_id,
+                BrokerAccount.account_id == account_id
+            ).first()
+            if not account:
+                logger.error(f"Cannot cancel recovered order {order_id} - account {account_id} not found")
+                return False
+            
+            recorded = db.query(Order.status).filter(Order.broker_order_id == str(order_id)).first()
+            if recorded and recorded.status and recorded.status.value in TERMINAL_ORDER_STATUSES:
+                logger.warning(f"Not cancelling recovered order {order_id} - recorded as {recorded.status.value}")
+                return True
+            
+            broker_instance = BaseBroker.get_broker_instance(broker_id, db)
+            try:
+                orders = await broker_instance.get_orders(account)
+            except Exception as e:
+                # Cancelling blind could undo a committed trade
+                logger.error(f"Cannot verify recovered order {order_id}, leaving it for manual review: {str(e)}")
+                return False
+            
+            order = next(
+                (o for o in orders or () if isinstance(o, dict) and str(o.get("order_id")) == str(order_id)),
+                None
+            )
+            if order is None or str(order.get("status") or "").lower() in TERMINAL_ORDER_STATUSES:
+                logger.warning(f"Not cancelling recovered order {order_id} - no longer working at the broker")
+                return True
+            
+            return await self._cancel_broker_order(broker_instance, account, order_id)
+    
     async def add_notification(
         self,
         message: str,
@@ -341,6 +903,11 @@ class TransactionContext:
         rollback_order: int = 99  # Notifications should happen last
     ):
         """Add notification to rollback steps"""
+        if self.manager.journaling:
+            payload = {"message": message, "notification_type": notification_type}
+            self._journal_step(RollbackAction.NOTIFICATION_SEND, rollback_order, payload, payload)
+            return
+        
         await self.add_rollback_step(
             action=RollbackAction.NOTIFICATION_SEND,
             description=f"Send {notification_type} notification",
@@ -360,4 +927,7 @@ class TransactionContext:
         return True
 
 # Global rollback manager instance
-rollback_manager = RollbackManager()
\ No newline at end of file
+rollback_manager = RollbackManager(
+    journaling=settings.ROLLBACK_JOURNALING_ENABLED,
+    recovery_interval=settings.ROLLBACK_RECOVERY_INTERVAL
+)
\ No newline at end of file
@@ -13,6 +13,8 @@ import logging
 from ..db.base import get_db
 from ..models.user import User
 from .config import settings
+from .principal_cache import principal_cache
+from .password_hasher import password_hasher
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -143,7 +145,7 @@ async def get_current_user(
             raise credentials_exception
             
         # Get user from database
-        user = db.query(User).filter(User.email == email).first()
+        user = principal_cache.load_user(db, email, token_exp=payload.get("exp"))
         if user is None:
             logger.warning(f"User not found: {email}")
             raise credentials_exception
@@ -219,7 +221,7 @@ async def get_current_user_from_query(
             raise credentials_exception
             
         # Get user from database
-        user = db.query(User).filter(User.email == email).first()
+        user = principal_cache.load_user(db, email, token_exp=payload.get("exp"))
         if user is None:
             logger.warning(f"User not found: {email}")
             raise credentials_exception
@@ -445,7 +447,7 @@ async def get_current_user_flexible(
             raise credentials_exception
             
         # Get user from database
-        user = db.query(User).filter(User.email == email).first()
+        user = principal_cache.load_user(db, email, token_exp=payload.get("exp"))
         if user is None:
             logger.warning(f"User not found: {email}")
             raise credentials_exception
@@ -537,6 +539,14 @@ def get_password_hash(password: str) -> str:
     """Generate password hash"""
     return pwd_context.hash(password)
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify password against hash on the password hashing pool"""
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Generate password hash on the password hashing pool"""
+    return await password_hasher.run(get_password_hash, password)
+
 def generate_security_token(length: int = 32) -> str:
     """Generate secure random token"""
     return secrets.token_urlsafe(length)
@@ -564,7 +574,7 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    user = db.query(User).filter(User.email == email).first()
+    user = principal_cache.load_user(db, email, token_exp=payload.get("exp"))
     if user is None:
         raise credentials_exception
     return user
@@ -598,7 +608,7 @@ async def get_current_user_optional(
         if email is None:
             return None
         
-        user = db.query(User).filter(User.email == email).first()
+        user = principal_cache.load_user(db, email, token_exp=payload.get("exp"))
         return user
     except JWTError:
         return None
@@ -0,0 +1,170 @@
+"""
+Startup Orchestrator
+
+Worker startup used to run every init step one after another inside the
+lifespan handler. Steps are now registered with the dependencies they
+really have; each starts as soon as those are done, blocking steps run in
+threads, and each step's duration and outcome is recorded alongside the
+time the worker spent importing.
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class StartupStep:
+    """A named init step and the steps that must finish before it"""
+    name: str
+    func: Callable[[], Any]
+    after: Tuple[str, ...] = ()
+    required: bool = False
+
+@dataclass
+class StepResult:
+    name: str
+    status: str = "pending"  # pending, ok, failed, skipped
+    duration: float = 0.0
+    error: Optional[str] = None
+
+class StartupOrchestrator:
+    """
+    Runs registered startup steps concurrently, respecting dependencies
+
+    Usage:
+        @startup_orchestrator.step("redis")
+        def init_redis(): ...
+
+        @startup_orchestrator.step("order_monitoring", after=("redis",))
+        async def start_order_monitoring(): ...
+
+        await startup_orchestrator.run()
+
+    A failed step skips the steps that depend on it. If a step marked
+    required fails (or is skipped), run() raises once all steps are done.
+    """
+
+    def __init__(self):
+        self._steps: Dict[str, StartupStep] = {}
+        self._results: Dict[str, StepResult] = {}
+        self._import_phases: List[Tuple[str, float]] = []
+        self._started_at: Optional[float] = None
+        self._duration: Optional[float] = None
+
+    def step(self, name: str, after: Tuple[str, ...] = (), required: bool = False):
+        """Register a sync or async function as a startup step"""
+        def decorator(func: Callable[[], Any]):
+            self.add_step(name, func, after=after, required=required)
+            return func
+        return decorator
+
+    def add_step(self, name: str, func: Callable[[], Any], after: Tuple[str, ...] = (), required: bool = False):
+        if name in self._steps:
+            raise ValueError(f"Startup step already registered: {name}")
+        self._steps[name] = StartupStep(name=name, func=func, after=tuple(after), required=required)
+
+    def record_import(self, phase: str, seconds: float):
+        """Record how long an import phase of the worker took"""
+        self._import_phases.append((phase, seconds))
+
+    async def _run_step(self, step: StartupStep) -> StepResult:
+        result = self._results[step.name]
+        started_at = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(step.func):
+                await step.func()
+            else:
+                # Blocking init (database, Redis) must not hold up the other steps
+                await asyncio.to_thread(step.func)
+            result.status = "ok"
+        except Exception as e:
+            result.status = "failed"
+            result.error = str(e)
+            log = logger.error if step.required else logger.warning
+            log(f"Startup step '{step.name}' failed: {str(e)}")
+        finally:
+            result.duration = time.perf_counter() - started_at
+        return result
+
+    def _ordered_steps(self) -> List[StartupStep]:
+        """Steps with every dependency before its dependents"""
+        unknown = {dep for step in self._steps.values() for dep in step.after if dep not in self._steps}
+        if unknown:
+            raise ValueError(f"Startup steps depend on unregistered steps: {sorted(unknown)}")
+
+        ordered, placed = [], set()
+        while len(ordered) < len(self._steps):
+            ready = [
+                step for name, step in self._steps.items()
+                if name not in placed and all(dep in placed for dep in step.after)
+            ]
+            if not ready:
+                raise ValueError(f"Startup steps have a dependency cycle: {sorted(set(self._steps) - placed)}")
+            ordered.extend(ready)
+            placed.update(step.name for step in ready)
+        return ordered
+
+    async def run(self):
+        """Run all steps; raises RuntimeError if a required step fails"""
+        ordered = self._ordered_steps()
+        self._started_at = time.perf_counter()
+        self._results = {name: StepResult(name=name) for name in self._steps}
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_when_ready(step: StartupStep):
+            # Each step starts as soon as its own dependencies are done
+            if step.after:
+                await asyncio.gather(*(tasks[dep] for dep in step.after))
+            if any(self._results[dep].status != "ok" for dep in step.after):
+                self._results[step.name].status = "skipped"
+                logger.warning(f"Startup step '{step.name}' skipped: a dependency did not start")
+                return
+            await self._run_step(step)
+
+        for step in ordered:
+            tasks[step.name] = asyncio.create_task(run_when_ready(step))
+        await asyncio.gather(*tasks.values())
+        self._duration = time.perf_counter() - self._started_at
+
+        failed_required = [
+            name for name, result in self._results.items()
+            if result.status != "ok" and self._steps[name].required
+        ]
+        if failed_required:
+            raise RuntimeError(f"Required startup steps failed: {failed_required}")
+
+        slowest = sorted(self._results.values(), key=lambda result: -result.duration)[:3]
+        logger.info(
+            f"Startup completed in {self._duration * 1000:.0f}ms "
+            f"(slowest: {', '.join(f'{r.name} {r.duration * 1000:.0f}ms' for r in slowest)})"
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-step timings and the import-time profile"""
+        return {
+            "duration_ms": round(self._duration * 1000, 2) if self._duration is not None else None,
+            "steps": {
+                name: {
+                    "status": result.status,
+                    "duration_ms": round(result.duration * 1000, 2),
+                    "after": list(self._steps[name].after),
+                    **({"error": result.error} if result.error else {})
+                }
+                for name, result in self._results.items()
+            },
+            "imports": {
+                "total_ms": round(sum(seconds for _, seconds in self._import_phases) * 1000, 2),
+                "phases": [
+                    {"phase": phase, "duration_ms": round(seconds * 1000, 2)}
+                    for phase, seconds in self._import_phases
+                ]
+            }
+        }
+
+# Global startup orchestrator instance
+startup_orchestrator = StartupOrchestrator()
@@ -5,6 +5,7 @@ from datetime import datetime
 from sqlalchemy.orm import Session
 from app.db.session import SessionLocal
 from app.models.pending_registration import PendingRegistration
+from app.services.resource_counters import resource_counters
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +41,28 @@ async def cleanup_expired_registrations():
         # Wait 1 hour before next cleanup
         await asyncio.sleep(3600)
 
+async def sync_resource_counts_task():
+    """
+    Reconcile per-user resource counters with the database
+    Only users whose counters disagree are rewritten; one worker runs it per hour
+    """
+    if not await asyncio.to_thread(resource_counters.acquire_reconcile_lease, 3500):
+        return
+
+    def reconcile():
+        db: Session = SessionLocal()
+        try:
+            return resource_counters.reconcile(db)
+        finally:
+            db.close()
+
+    result = await asyncio.to_thread(reconcile)
+    logger.info(
+        f"Resource count reconciliation: checked {result['checked']}, "
+        f"fixed {result['counters_fixed']} counters and {result['subscriptions_fixed']} subscriptions "
+        f"in {result['duration']}s"
+    )
+
 # You can also add this function for manual cleanup if needed
 def manual_cleanup_expired_registrations(db: Session) -> int:
     """
@@ -0,0 +1,39 @@
+# app/db/backfill_trade_rollups.py
+"""
+Script to rebuild daily trade rollups from existing trade history
+Run this once after the trade_daily_rollups migration, or to repair rollups
+
+    python -m app.db.backfill_trade_rollups [--user-id ID]
+"""
+import argparse
+from typing import Optional
+
+from sqlalchemy.orm import Session
+from app.db.session import SessionLocal
+from app.services.trade_rollups import backfill_rollups
+
+
+def backfill_trade_rollups(user_id: Optional[int] = None):
+    """Rebuild rollups for one user, or for everyone"""
+    db: Session = SessionLocal()
+    
+    try:
+        scope = f"user {user_id}" if user_id is not None else "all users"
+        print(f"Rebuilding daily trade rollups for {scope}...")
+        rows = backfill_rollups(db, user_id=user_id)
+        db.commit()
+        print(f"✅ Wrote {rows} rollup rows")
+        
+    except Exception as e:
+        print(f"❌ Error rebuilding trade rollups: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild daily trade rollups")
+    parser.add_argument("--user-id", type=int, default=None, help="Only rebuild rollups for this user")
+    args = parser.parse_args()
+    backfill_trade_rollups(args.user_id)
@@ -1,31 +1,12 @@
-from sqlalchemy import create_engine, text
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import QueuePool
-from ..core.config import settings
+from sqlalchemy import text
 import logging
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Create SQLAlchemy engine
-logger.info(f"[BASE.PY] Using DATABASE_URL: {settings.DATABASE_URL[:50]}...")
-engine = create_engine(
-    settings.DATABASE_URL,
-    poolclass=QueuePool,
-    pool_size=5,
-    max_overflow=10,
-    pool_timeout=30,
-    pool_recycle=1800,  # Recycle connections every 30 minutes
-    echo=settings.SQL_ECHO,  # Log SQL queries
-)
-
-# Create session factory
-SessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    bind=engine
-)
+# Share the engine and pool configured in session.py; a second engine here
+# would give every worker two independent pools
+from .session import engine, SessionLocal  # noqa
 
 # Import all models here so SQLAlchemy knows about them
 from app.db.base_class import Base  # noqa
@@ -35,7 +16,7 @@ from app.models.strategy import ActivatedStrategy  # noqa
 from app.models.broker import BrokerAccount, BrokerCredentials  # noqa
 from app.models.subscription import Subscription
 from app.models.order import Order
-from app.models.trade import Trade, TradeExecution  # noqa
+from app.models.trade import Trade, TradeExecution, TradeDailyRollup  # noqa
 
 # Create a dependency for FastAPI endpoints
 def get_db():
@@ -0,0 +1,55 @@
+# app/db/check_schema.py
+"""
+Script to compare the live database schema with the ORM models
+Run this after deploys or migrations instead of reflecting the schema on
+every worker start (set STARTUP_SCHEMA_CHECK=true to also do it at startup)
+
+    python -m app.db.check_schema [--create]
+"""
+import argparse
+import sys
+from typing import Dict, List
+
+from sqlalchemy import inspect
+
+from app.db.base import Base, engine, init_db
+import app.models  # noqa: registers every model with Base.metadata
+
+
+def find_schema_drift(bind=engine) -> Dict[str, List[str]]:
+    """Tables and columns the models expect but the database lacks"""
+    inspector = inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+    drift = {}
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            drift[table.name] = ["(table missing)"]
+            continue
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        missing = [column.name for column in table.columns if column.name not in columns]
+        if missing:
+            drift[table.name] = missing
+    return drift
+
+
+def check_schema(create: bool = False) -> bool:
+    """Print any schema drift; True if the database matches the models"""
+    if create:
+        print("Creating missing tables...")
+        init_db()
+
+    drift = find_schema_drift()
+    if not drift:
+        print(f"✅ Database schema matches the models ({len(Base.metadata.tables)} tables)")
+        return True
+
+    for table, missing in drift.items():
+        print(f"❌ {table}: missing {', '.join(missing)}")
+    return False
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the database schema with the ORM models")
+    parser.add_argument("--create", action="store_true", help="Create missing tables first (Base.metadata.create_all)")
+    args = parser.parse_args()
+    sys.exit(0 if check_schema(args.create) else 1)
@@ -0,0 +1,75 @@
+# app/db/legacy_subscription_migrations.py
+"""
+One-off subscription migrations that used to live (commented out) in main.py
+
+    python -m app.db.legacy_subscription_migrations mark-legacy-free
+    python -m app.db.legacy_subscription_migrations starter-to-elite
+"""
+import argparse
+from datetime import datetime
+
+from app.db.session import SessionLocal
+from app.models.subscription import Subscription
+
+
+def mark_legacy_free_users():
+    db = SessionLocal()
+    try:
+        # Get all subscriptions with tier "starter" and mark as legacy free
+        legacy_free_users = db.query(Subscription).filter(
+            Subscription.tier == "starter",
+            Subscription.status == "active"
+        ).all()
+        
+        count = 0
+        for subscription in legacy_free_users:
+            subscription.is_legacy_free = True
+            count += 1
+        
+        db.commit()
+        print(f"Marked {count} users as legacy free")
+    except Exception as e:
+        db.rollback()
+        print(f"Error marking legacy free users: {str(e)}")
+    finally:
+        db.close()
+
+
+def migrate_starter_to_elite():
+    """
+    Migrate users from the starter legacy plan to the Elite plan.
+    This function finds all active subscriptions with tier "starter"
+    and upgrades them to "elite" tier.
+    """
+    db = SessionLocal()
+    try:
+        # Get all subscriptions with tier "starter" that are active
+        starter_users = db.query(Subscription).filter(
+            Subscription.tier == "starter",
+            Subscription.status == "active"
+        ).all()
+        
+        count = 0
+        for subscription in starter_users:
+            # Upgrade tier to elite
+            subscription.tier = "elite"
+            subscription.updated_at = datetime.utcnow()
+            count += 1
+        
+        db.commit()
+        print(f"Migration complete: {count} users upgraded from starter to elite")
+    except Exception as e:
+        db.rollback()
+        print(f"Error migrating users to elite: {str(e)}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a one-off subscription migration")
+    parser.add_argument("migration", choices=["mark-legacy-free", "starter-to-elite"])
+    args = parser.parse_args()
+    if args.migration == "mark-legacy-free":
+        mark_legacy_free_users()
+    else:
+        migrate_starter_to_elite()
@@ -0,0 +1,176 @@
+"""
+Connection Pool Telemetry
+
+InstrumentedQueuePool times every pool checkout (including waits for a free
+connection and new connection setup), counts slow checkouts and timeouts, and
+pool events track how long connections are held and the peak checked-out and
+overflow counts. Exhaustion shows up here as rising wait times well before
+requests start failing with pool timeouts.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class PoolMonitor:
+    """
+    Aggregated checkout statistics for this process's connection pool
+
+    Usage:
+        engine = create_engine(url, poolclass=InstrumentedQueuePool, ...)
+        pool_monitor.install(engine)
+        pool_monitor.get_stats()
+    """
+
+    def __init__(self, slow_checkout_ms: int = 250, sample_size: int = 1000):
+        self.slow_checkout_threshold = slow_checkout_ms / 1000
+        self._engine: Optional[Engine] = None
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=sample_size)
+
+        self._checkouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._slow_checkouts = 0
+        self._timeouts = 0
+        self._last_slow_checkout_at: Optional[float] = None
+        self._last_timeout_at: Optional[float] = None
+
+        self._checkins = 0
+        self._total_held = 0.0
+        self._max_held = 0.0
+        self._peak_checked_out = 0
+        self._peak_overflow = 0
+
+    def install(self, engine: Engine):
+        """Track hold times and peak usage through pool events"""
+        if self._engine is engine:
+            return
+        self._engine = engine
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+
+    def record_wait(self, seconds: float):
+        with self._lock:
+            self._checkouts += 1
+            self._total_wait += seconds
+            self._max_wait = max(self._max_wait, seconds)
+            self._waits.append(seconds)
+            slow = seconds >= self.slow_checkout_threshold
+            if slow:
+                self._slow_checkouts += 1
+                self._last_slow_checkout_at = time.time()
+
+        if slow:
+            logger.warning(f"Slow DB pool checkout: waited {seconds * 1000:.0f}ms ({self._pool_status()})")
+
+    def record_timeout(self, seconds: float):
+        with self._lock:
+            self._timeouts += 1
+            self._last_timeout_at = time.time()
+        logger.error(f"DB pool checkout timed out after {seconds:.1f}s ({self._pool_status()})")
+
+    def _pool_status(self) -> str:
+        pool = self._engine.pool if self._engine is not None else None
+        return pool.status() if pool is not None else "pool not installed"
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["pool_checkout_at"] = time.perf_counter()
+        pool = self._engine.pool
+        checked_out, overflow = pool.checkedout(), max(0, pool.overflow())
+        with self._lock:
+            self._peak_checked_out = max(self._peak_checked_out, checked_out)
+            self._peak_overflow = max(self._peak_overflow, overflow)
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        checked_out_at = connection_record.info.pop("pool_checkout_at", None)
+        if checked_out_at is None:
+            return
+        held = time.perf_counter() - checked_out_at
+        with self._lock:
+            self._checkins += 1
+            self._total_held += held
+            self._max_held = max(self._max_held, held)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool configuration, live usage and checkout timing"""
+        with self._lock:
+            waits = sorted(self._waits)
+            stats = {
+                "checkouts": self._checkouts,
+                "avg_wait_ms": round(self._total_wait / self._checkouts * 1000, 2) if self._checkouts else 0.0,
+                "p95_wait_ms": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 2) if waits else 0.0,
+                "max_wait_ms": round(self._max_wait * 1000, 2),
+                "slow_checkouts": self._slow_checkouts,
+                "slow_checkout_threshold_ms": round(self.slow_checkout_threshold * 1000),
+                "timeouts": self._timeouts,
+                "last_slow_checkout_at": self._last_slow_checkout_at,
+                "last_timeout_at": self._last_timeout_at,
+                "avg_held_ms": round(self._total_held / self._checkins * 1000, 2) if self._checkins else 0.0,
+                "max_held_ms": round(self._max_held * 1000, 2),
+                "peak_checked_out": self._peak_checked_out,
+                "peak_overflow": self._peak_overflow
+            }
+
+        pool = self._engine.pool if self._engine is not None else None
+        if pool is not None and isinstance(pool, QueuePool):
+            capacity = pool.size() + max(0, pool._max_overflow)
+            checked_out = pool.checkedout()
+            stats.update({
+                "pid": os.getpid(),
+                "workers": settings.WORKERS,
+                "pool_size": pool.size(),
+                "max_overflow": pool._max_overflow,
+                "pool_timeout": pool.timeout(),
+                "checked_out": checked_out,
+                "checked_in": pool.checkedin(),
+                "overflow": max(0, pool.overflow()),
+                "utilization": round(checked_out / capacity, 3) if capacity else None
+            })
+        return stats
+
+    def reset(self):
+        """Clear counters (live pool usage is unaffected)"""
+        with self._lock:
+            self._waits.clear()
+            self._checkouts = self._slow_checkouts = self._timeouts = self._checkins = 0
+            self._total_wait = self._max_wait = self._total_held = self._max_held = 0.0
+            self._peak_checked_out = self._peak_overflow = 0
+            self._last_slow_checkout_at = self._last_timeout_at = None
+
+# Global pool monitor instance
+pool_monitor = PoolMonitor(slow_checkout_ms=settings.DB_POOL_SLOW_CHECKOUT_MS)
+
+_checkout_depth = threading.local()
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that reports checkout wait times and timeouts to pool_monitor"""
+
+    def _do_get(self):
+        # QueuePool._do_get retries by calling itself; only time the outermost call
+        if getattr(_checkout_depth, "active", False):
+            return super()._do_get()
+
+        _checkout_depth.active = True
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_monitor.record_timeout(time.perf_counter() - start)
+            raise
+        finally:
+            _checkout_depth.active = False
+
+        pool_monitor.record_wait(time.perf_counter() - start)
+        return connection
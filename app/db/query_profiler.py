@@ -0,0 +1,236 @@
+"""
+SQL Query Profiler with N+1 Detection
+
+Opt-in instrumentation on the SQLAlchemy engine. While a request is being
+profiled every statement is fingerprinted (literals and IN-lists collapsed)
+and counted, so a request that runs the same statement shape over and over
+- the classic N+1 loop - is flagged. Per-request results are attached to the
+response and rolled up per route for the monitoring report.
+"""
+
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_IN_LIST = re.compile(r"\bIN\s*\([^()]*\)", re.IGNORECASE)
+_PLACEHOLDERS = re.compile(r"%\(\w+\)s|\$\d+|:\w+|\?|__\[POSTCOMPILE_\w+\]")
+_STRING_LITERALS = re.compile(r"'(?:[^']|'')*'")
+_NUMERIC_LITERALS = re.compile(r"\b\d+(?:\.\d+)?\b")
+
+def fingerprint_statement(statement: str) -> str:
+    """Normalize a SQL statement so calls that differ only in values compare equal"""
+    normalized = _STRING_LITERALS.sub("?", statement)
+    normalized = _PLACEHOLDERS.sub("?", normalized)
+    normalized = _NUMERIC_LITERALS.sub("?", normalized)
+    normalized = _IN_LIST.sub("IN (?)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+@dataclass
+class StatementStats:
+    """Executions of one statement fingerprint"""
+    sql: str
+    count: int = 0
+    total_time: float = 0.0
+
+@dataclass
+class RequestQueryProfile:
+    """Queries issued while handling a single request"""
+    method: str
+    route: str
+    query_count: int = 0
+    total_db_time: float = 0.0
+    statements: Dict[str, StatementStats] = field(default_factory=dict)
+
+    def record(self, statement: str, duration: float):
+        sql = fingerprint_statement(statement)
+        key = hashlib.sha1(sql.encode()).hexdigest()[:12]
+        stats = self.statements.get(key)
+        if stats is None:
+            stats = self.statements[key] = StatementStats(sql=sql)
+        stats.count += 1
+        stats.total_time += duration
+        self.query_count += 1
+        self.total_db_time += duration
+
+    def n_plus_one(self, threshold: int) -> List[Dict[str, Any]]:
+        """Statement shapes repeated at least ``threshold`` times"""
+        return [
+            {
+                "fingerprint": key,
+                "count": stats.count,
+                "total_time_ms": round(stats.total_time * 1000, 2),
+                "sql": stats.sql[:300]
+            }
+            for key, stats in sorted(self.statements.items(), key=lambda item: -item[1].count)
+            if stats.count >= threshold
+        ]
+
+@dataclass
+class RouteQueryStats:
+    """Aggregated query statistics for one route"""
+    requests: int = 0
+    total_queries: int = 0
+    max_queries: int = 0
+    total_db_time: float = 0.0
+    max_db_time: float = 0.0
+    n_plus_one_requests: int = 0
+    repeated_statements: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+_current_profile: ContextVar[Optional[RequestQueryProfile]] = ContextVar(
+    "sql_query_profile", default=None
+)
+
+class QueryProfiler:
+    """
+    Per-request SQL profiler
+
+    Usage:
+        query_profiler.install(engine)
+
+        with query_profiler.profile_request("GET", "/api/v1/chat/channels") as profile:
+            ...
+        profile.query_count
+    """
+
+    def __init__(self, n_plus_one_threshold: int = 5, max_routes: int = 500):
+        self.enabled = False
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.max_routes = max_routes
+        self._routes: Dict[str, RouteQueryStats] = defaultdict(RouteQueryStats)
+        self._lock = threading.Lock()
+        self._installed_engines = set()
+
+    def install(self, engine: Engine):
+        """Attach cursor execution listeners to an engine"""
+        if id(engine) in self._installed_engines:
+            return
+
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        self._installed_engines.add(id(engine))
+        self.enabled = True
+        logger.info(f"SQL query profiler installed (N+1 threshold: {self.n_plus_one_threshold})")
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if _current_profile.get() is not None:
+            conn.info.setdefault("query_profiler_start", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        profile = _current_profile.get()
+        if profile is None:
+            return
+        starts = conn.info.get("query_profiler_start")
+        if not starts:
+            return
+        profile.record(statement, time.perf_counter() - starts.pop())
+
+    @contextmanager
+    def profile_request(self, method: str, route: str):
+        """Profile all queries issued in this context (including worker threads it spawns)"""
+        profile = RequestQueryProfile(method=method, route=route)
+        token = _current_profile.set(profile)
+        try:
+            yield profile
+        finally:
+            _current_profile.reset(token)
+            self._aggregate(profile)
+
+    def _aggregate(self, profile: RequestQueryProfile):
+        if profile.query_count == 0:
+            return
+
+        route_key = f"{profile.method} {profile.route}"
+        repeated = profile.n_plus_one(self.n_plus_one_threshold)
+
+        if repeated:
+            logger.warning(
+                f"Possible N+1 in {route_key}: {profile.query_count} queries, "
+                f"{repeated[0]['count']}x {repeated[0]['sql'][:120]}"
+            )
+
+        with self._lock:
+            if route_key not in self._routes and len(self._routes) >= self.max_routes:
+                return
+
+            stats = self._routes[route_key]
+            stats.requests += 1
+            stats.total_queries += profile.query_count
+            stats.max_queries = max(stats.max_queries, profile.query_count)
+            stats.total_db_time += profile.total_db_time
+            stats.max_db_time = max(stats.max_db_time, profile.total_db_time)
+            if repeated:
+                stats.n_plus_one_requests += 1
+                for statement in repeated:
+                    entry = stats.repeated_statements.setdefault(
+                        statement["fingerprint"],
+                        {"sql": statement["sql"], "occurrences": 0, "max_count": 0}
+                    )
+                    entry["occurrences"] += 1
+                    entry["max_count"] = max(entry["max_count"], statement["count"])
+
+    def response_headers(self, profile: RequestQueryProfile) -> Dict[str, str]:
+        """Debug headers describing a profiled request"""
+        headers = {
+            "X-DB-Query-Count": str(profile.query_count),
+            "X-DB-Time-Ms": f"{profile.total_db_time * 1000:.2f}"
+        }
+        repeated = profile.n_plus_one(self.n_plus_one_threshold)
+        if repeated:
+            headers["X-DB-N-Plus-One"] = ", ".join(
+                f"{statement['fingerprint']}x{statement['count']}" for statement in repeated[:5]
+            )
+        return headers
+
+    def get_report(self, limit: int = 50) -> Dict[str, Any]:
+        """Aggregated per-route report, worst N+1 offenders first"""
+        with self._lock:
+            routes = [
+                {
+                    "route": route_key,
+                    "requests": stats.requests,
+                    "avg_queries": round(stats.total_queries / stats.requests, 2),
+                    "max_queries": stats.max_queries,
+                    "avg_db_time_ms": round(stats.total_db_time / stats.requests * 1000, 2),
+                    "max_db_time_ms": round(stats.max_db_time * 1000, 2),
+                    "n_plus_one_requests": stats.n_plus_one_requests,
+                    "repeated_statements": sorted(
+                        (
+                            {"fingerprint": key, **entry}
+                            for key, entry in stats.repeated_statements.items()
+                        ),
+                        key=lambda entry: -entry["max_count"]
+                    )[:10]
+                }
+                for route_key, stats in self._routes.items()
+            ]
+
+        routes.sort(key=lambda route: (-route["n_plus_one_requests"], -route["avg_queries"]))
+        return {
+            "enabled": self.enabled,
+            "n_plus_one_threshold": self.n_plus_one_threshold,
+            "routes_tracked": len(routes),
+            "routes": routes[:limit]
+        }
+
+    def reset(self):
+        """Clear aggregated statistics"""
+        with self._lock:
+            self._routes.clear()
+
+# Global query profiler instance
+query_profiler = QueryProfiler(n_plus_one_threshold=settings.SQL_N_PLUS_ONE_THRESHOLD)
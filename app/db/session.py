@@ -1,7 +1,8 @@
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import QueuePool
 from app.core.config import settings
+from app.db.pool_monitor import InstrumentedQueuePool, pool_monitor
+from app.db.query_profiler import query_profiler
 import logging
 from contextlib import asynccontextmanager
 
@@ -11,18 +12,21 @@ logger = logging.getLogger(__name__)
 try:
     # Debug: Log the actual database URL being used
     logger.info(f"Connecting to database: {settings.DATABASE_URL[:50]}...")
+    pool_params = settings.get_db_params()
     engine = create_engine(
         settings.DATABASE_URL,
         connect_args={"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {},
-        poolclass=QueuePool,
-        pool_size=5,
-        max_overflow=10,
-        pool_timeout=30,
-        pool_recycle=1800,  # Recycle connections every 30 minutes
-        pool_pre_ping=True,  # Enable connection health checks
-        echo=settings.SQL_ECHO,
+        poolclass=InstrumentedQueuePool,  # QueuePool with checkout wait telemetry
+        **pool_params
     )
-    logger.info("Database engine created successfully")
+    pool_monitor.install(engine)
+    logger.info(
+        f"Database engine created successfully (pool_size={pool_params['pool_size']}, "
+        f"max_overflow={pool_params['max_overflow']}, workers={settings.WORKERS})"
+    )
+
+    if settings.SQL_PROFILING_ENABLED:
+        query_profiler.install(engine)
 except Exception as e:
     logger.error(f"Failed to create database engine: {str(e)}")
     engine = None  # Set to None if creation fails
@@ -5,7 +5,7 @@ from .strategy import ActivatedStrategy
 from .broker import BrokerAccount, BrokerCredentials
 from .subscription import Subscription
 from .order import Order
-from .trade import Trade, TradeExecution
+from .trade import Trade, TradeExecution, TradeDailyRollup
 from .maintenance import MaintenanceSettings
 from .affiliate import Affiliate, AffiliateReferral, AffiliateClick, AffiliatePayout
 
@@ -21,6 +21,7 @@ __all__ = [
     "Order",
     "Trade",
     "TradeExecution",
+    "TradeDailyRollup",
     "MaintenanceSettings",
     "Affiliate",
     "AffiliateReferral",
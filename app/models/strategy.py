@@ -50,7 +50,7 @@ class ActivatedStrategy(Base):
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    last_triggered = Column(DateTime, nullable=True)
+    last_triggered = Column(DateTime, nullable=True, index=True)
 
     # Strategy Performance Stats
     total_trades = Column(Integer, default=0)
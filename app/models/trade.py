@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Text, Numeric, Index
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Date, Text, Numeric, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from decimal import Decimal
@@ -68,6 +68,7 @@ class Trade(Base):
         Index('idx_trades_symbol_time', 'symbol', 'open_time'),
         Index('idx_trades_status_time', 'status', 'open_time'),
         Index('idx_trades_user_time', 'user_id', 'open_time'),
+        Index('idx_trades_user_status_close', 'user_id', 'status', 'close_time'),
     )
     
     def update_pnl_metrics(self, current_unrealized_pnl: float) -> None:
@@ -191,4 +192,40 @@ class TradeExecution(Base):
         return f"Execution {self.id} - Account {self.broker_account_id} ({self.account_role}): {self.quantity} @ {self.execution_price}"
     
     def __repr__(self):
-        return f"<TradeExecution(id={self.id}, trade_id={self.trade_id}, account={self.broker_account_id})>"
\ No newline at end of file
+        return f"<TradeExecution(id={self.id}, trade_id={self.trade_id}, account={self.broker_account_id})>"
+
+
+class TradeDailyRollup(Base):
+    """Per-day closed trade aggregates, maintained incrementally as trades close."""
+    __tablename__ = "trade_daily_rollups"
+
+    # Primary Key
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Rollup Key (strategy_id 0 = trades without strategy attribution)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    strategy_id = Column(Integer, nullable=False, default=0)
+    symbol = Column(String(20), nullable=False)
+    trade_date = Column(Date, nullable=False)  # UTC date of close_time
+
+    # Counts
+    trade_count = Column(Integer, nullable=False, default=0)
+    winning_trades = Column(Integer, nullable=False, default=0)
+    losing_trades = Column(Integer, nullable=False, default=0)
+
+    # P&L Aggregates
+    total_pnl = Column(Numeric(14, 2), nullable=False, default=0)
+    gross_profit = Column(Numeric(14, 2), nullable=False, default=0)  # Sum of winning P&L
+    gross_loss = Column(Numeric(14, 2), nullable=False, default=0)  # Absolute sum of losing P&L
+    max_win = Column(Numeric(12, 2), nullable=True)  # Largest winning trade
+    max_loss = Column(Numeric(12, 2), nullable=True)  # Largest losing trade (most negative)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint('user_id', 'strategy_id', 'symbol', 'trade_date', name='uq_trade_rollups_key'),
+        Index('idx_trade_rollups_user_date', 'user_id', 'trade_date'),
+    )
+
+    def __repr__(self):
+        return f"<TradeDailyRollup(user_id={self.user_id}, strategy_id={self.strategy_id}, symbol={self.symbol}, date={self.trade_date})>"
\ No newline at end of file
@@ -53,6 +53,7 @@ class Webhook(Base):
     subscriber_count = Column(Integer, default=0)
     rating = Column(Float, default=0.0)
     total_ratings = Column(Integer, default=0)
+    rating_sum = Column(Integer, default=0, nullable=False)  # Sum of all ratings, maintained with total_ratings
     
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -153,13 +154,9 @@ class Webhook(Base):
 
     def update_rating(self, new_rating: int) -> None:
         """Update the webhook's rating"""
-        if not self.total_ratings:
-            self.rating = float(new_rating)
-            self.total_ratings = 1
-        else:
-            total_score = self.rating * self.total_ratings
-            self.total_ratings += 1
-            self.rating = (total_score + new_rating) / self.total_ratings
+        self.rating_sum = (self.rating_sum or 0) + new_rating
+        self.total_ratings = (self.total_ratings or 0) + 1
+        self.rating = self.rating_sum / self.total_ratings
 
     def increment_subscriber_count(self) -> None:
         """Increment the subscriber count"""
@@ -155,6 +155,26 @@ class WebhookOut(WebhookBase):
     class Config:
         from_attributes = True
 
+class MarketplaceStrategyOut(BaseModel):
+    """Shared strategy as listed in the marketplace (no secrets)"""
+    id: int
+    token: str
+    user_id: int
+    name: Optional[str] = None
+    details: Optional[str] = None
+    source_type: Optional[str] = None
+    strategy_type: Optional[StrategyType] = None
+    is_active: bool = True
+    is_shared: bool = True
+    created_at: Optional[datetime] = None
+    shared_at: Optional[datetime] = None
+    last_triggered: Optional[datetime] = None
+    webhook_url: str
+    subscriber_count: int = 0
+    rating: float = 0.0
+    total_ratings: int = 0
+    username: Optional[str] = None
+
 class WebhookStatistics(BaseModel):
     total_executions: int
     successful_executions: int
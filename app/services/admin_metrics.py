@@ -0,0 +1,261 @@
+"""
+Precomputed Admin Dashboard Metrics
+
+The admin overview and user metrics pages used to run a dozen COUNT queries
+per view. A background loop now computes the same aggregates every
+ADMIN_METRICS_REFRESH_INTERVAL seconds with a handful of grouped queries and
+index-friendly range predicates, and stores the result in a Redis hash that
+every worker serves from. A short Redis lease ensures only one worker
+recomputes per interval.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
+
+from redis.exceptions import RedisError
+from sqlalchemy import case, distinct, func
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.redis_manager import get_redis_connection
+from ..db.session import SessionLocal
+from ..models.strategy import ActivatedStrategy
+from ..models.subscription import Subscription
+from ..models.user import User
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_KEY = "admin:metrics_snapshot"
+REFRESH_LEASE_KEY = "admin:metrics_snapshot:refresh"
+
+# Simplified monthly revenue per active subscription
+REVENUE_BY_TIER = {
+    'starter': 47,
+    'pro': 97,
+    'elite': 197
+}
+
+def compute_admin_metrics(db: Session, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Compute all admin dashboard aggregates (four queries)"""
+    now = now or datetime.utcnow()
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    tomorrow_start = today_start + timedelta(days=1)
+    week_ago = today_start - timedelta(days=7)
+    month_ago = today_start - timedelta(days=30)
+    this_month_start = today_start.replace(day=1)
+    last_month_start = (this_month_start - timedelta(days=1)).replace(day=1)
+
+    def count_since(start, end=None):
+        condition = User.created_at >= start
+        if end is not None:
+            condition = condition & (User.created_at < end)
+        return func.sum(case((condition, 1), else_=0))
+
+    # Users: totals and signup windows in one pass
+    (
+        total_users, signups_today, signups_week, signups_month,
+        users_this_month, users_last_month
+    ) = db.query(
+        func.count(User.id),
+        count_since(today_start, tomorrow_start),
+        count_since(week_ago),
+        count_since(month_ago),
+        count_since(this_month_start),
+        count_since(last_month_start, this_month_start)
+    ).one()
+
+    # Active subscriptions per tier, plus distinct active users
+    by_tier = {tier: 0 for tier in REVENUE_BY_TIER}
+    tier_rows = db.query(
+        Subscription.tier,
+        func.count(Subscription.id)
+    ).filter(
+        Subscription.status == 'active'
+    ).group_by(Subscription.tier).all()
+    for tier, count in tier_rows:
+        if tier in by_tier:
+            by_tier[tier] = count
+
+    active_users = db.query(func.count(distinct(Subscription.user_id))).filter(
+        Subscription.status == 'active'
+    ).scalar() or 0
+
+    # Strategies triggered today
+    trades_today = db.query(func.count(ActivatedStrategy.id)).filter(
+        ActivatedStrategy.last_triggered >= today_start,
+        ActivatedStrategy.last_triggered < tomorrow_start
+    ).scalar() or 0
+
+    users_this_month = int(users_this_month or 0)
+    users_last_month = int(users_last_month or 0)
+    growth_rate = 0.0
+    if users_last_month > 0:
+        growth_rate = ((users_this_month - users_last_month) / users_last_month) * 100
+
+    return {
+        "total_users": int(total_users or 0),
+        "new_signups_today": int(signups_today or 0),
+        "new_signups_week": int(signups_week or 0),
+        "new_signups_month": int(signups_month or 0),
+        "users_this_month": users_this_month,
+        "users_last_month": users_last_month,
+        "growth_rate": round(growth_rate, 2),
+        "active_users": int(active_users),
+        "trades_today": int(trades_today),
+        "by_tier": by_tier,
+        "total_revenue": float(sum(by_tier[tier] * price for tier, price in REVENUE_BY_TIER.items())),
+        "computed_at": time.time()
+    }
+
+class AdminMetricsSnapshot:
+    """
+    Periodically refreshed admin metrics snapshot
+
+    Usage:
+        snapshot = admin_metrics_snapshot.get_snapshot()
+        snapshot["total_users"], snapshot["snapshot_age_seconds"]
+    """
+
+    def __init__(self, refresh_interval: int = 60):
+        self.refresh_interval = refresh_interval
+        # Serve a snapshot without recomputing for up to this many seconds
+        self.max_age = refresh_interval * 3
+        self._local: Optional[Dict[str, Any]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._running = False
+
+        # Stats
+        self._refreshes = 0
+        self._refresh_errors = 0
+        self._last_refresh_duration: Optional[float] = None
+
+    def refresh(self) -> Dict[str, Any]:
+        """Recompute the snapshot and publish it (blocking)"""
+        start_time = time.time()
+        db = SessionLocal()
+        try:
+            snapshot = compute_admin_metrics(db)
+        finally:
+            db.close()
+
+        self._local = snapshot
+        self._refreshes += 1
+        self._last_refresh_duration = time.time() - start_time
+
+        with get_redis_connection() as redis_client:
+            if redis_client:
+                try:
+                    redis_client.hset(SNAPSHOT_KEY, mapping={
+                        "data": json.dumps(snapshot),
+                        "computed_at": snapshot["computed_at"]
+                    })
+                except RedisError as e:
+                    logger.warning(f"Failed to publish admin metrics snapshot: {e}")
+
+        logger.debug(f"Admin metrics snapshot refreshed in {self._last_refresh_duration:.3f}s")
+        return snapshot
+
+    def _read_published(self) -> Optional[Dict[str, Any]]:
+        with get_redis_connection() as redis_client:
+            if not redis_client:
+                return None
+            try:
+                data = redis_client.hget(SNAPSHOT_KEY, "data")
+            except RedisError as e:
+                logger.warning(f"Failed to read admin metrics snapshot: {e}")
+                return None
+        if not data:
+            return None
+        try:
+            return json.loads(data)
+        except ValueError:
+            return None
+
+    def _acquire_refresh_lease(self) -> bool:
+        """Only one worker refreshes per interval; without Redis every worker does"""
+        with get_redis_connection() as redis_client:
+            if not redis_client:
+                return True
+            try:
+                return bool(redis_client.set(
+                    REFRESH_LEASE_KEY, "1", nx=True, ex=max(1, self.refresh_interval - 1)
+                ))
+            except RedisError:
+                return True
+
+    def get_snapshot(self) -> Dict[str, Any]:
+        """
+        Get the latest snapshot with its age
+
+        Falls back to computing inline only when no snapshot younger than
+        max_age exists (cold start, or the refresh loop is not running).
+        """
+        snapshot = self._read_published()
+        if snapshot is None or (
+            self._local is not None and self._local["computed_at"] > snapshot["computed_at"]
+        ):
+            snapshot = self._local
+
+        if snapshot is None or time.time() - snapshot["computed_at"] > self.max_age:
+            snapshot = self.refresh()
+
+        age = max(0.0, time.time() - snapshot["computed_at"])
+        return {
+            **snapshot,
+            "snapshot_at": datetime.utcfromtimestamp(snapshot["computed_at"]).isoformat(),
+            "snapshot_age_seconds": round(age, 1)
+        }
+
+    async def start(self):
+        """Start the periodic refresh loop"""
+        if self._running:
+            return
+
+        self._running = True
+        self._task = asyncio.create_task(self._refresh_loop())
+        logger.info(f"Admin metrics snapshot refresh started (every {self.refresh_interval}s)")
+
+    async def stop(self):
+        """Stop the refresh loop"""
+        self._running = False
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        logger.info("Admin metrics snapshot refresh stopped")
+
+    async def _refresh_loop(self):
+        try:
+            while self._running:
+                try:
+                    if await asyncio.to_thread(self._acquire_refresh_lease):
+                        await asyncio.to_thread(self.refresh)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self._refresh_errors += 1
+                    logger.error(f"Admin metrics snapshot refresh failed: {str(e)}")
+                await asyncio.sleep(self.refresh_interval)
+        except asyncio.CancelledError:
+            pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get refresh loop statistics"""
+        return {
+            "running": self._running,
+            "refresh_interval": self.refresh_interval,
+            "refreshes": self._refreshes,
+            "refresh_errors": self._refresh_errors,
+            "last_refresh_duration": self._last_refresh_duration,
+            "local_snapshot_at": self._local["computed_at"] if self._local else None
+        }
+
+# Global admin metrics snapshot instance
+admin_metrics_snapshot = AdminMetricsSnapshot(refresh_interval=settings.ADMIN_METRICS_REFRESH_INTERVAL)
@@ -0,0 +1,209 @@
+"""
+Admin User Directory Queries
+
+Users are listed together with their active chat roles, connected broker
+account count and subscription in a single statement: roles and account
+counts come from grouped subqueries and the subscription from a per-user
+MIN(id) subquery, so a page costs one query (plus its COUNT) however many
+users it holds. Exports stream the same statement through a server-side
+cursor so memory stays bounded regardless of the number of users.
+"""
+
+import csv
+import io
+import json
+import logging
+from typing import Any, Dict, Iterator, List, Tuple
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session
+
+from ..db.session import SessionLocal
+from ..models.broker import BrokerAccount
+from ..models.chat import UserChatRole
+from ..models.subscription import Subscription
+from ..models.user import User
+
+logger = logging.getLogger(__name__)
+
+ROLE_SEPARATOR = "\x1f"
+EXPORT_BATCH_SIZE = 500
+
+EXPORT_FIELDS = [
+    "id", "username", "email", "full_name", "phone", "is_active", "app_role",
+    "created_at", "roles", "connected_accounts",
+    "subscription_tier", "subscription_status"
+]
+
+def _aggregate_strings(dialect: str, column):
+    """Concatenate grouped strings with ROLE_SEPARATOR"""
+    if dialect == "postgresql":
+        return func.string_agg(column, ROLE_SEPARATOR)
+    return func.group_concat(column, ROLE_SEPARATOR)
+
+def _user_filters(search: str = "", status: str = "all") -> List[Any]:
+    filters = []
+    if search:
+        filters.append(or_(
+            User.username.ilike(f"%{search}%"),
+            User.email.ilike(f"%{search}%"),
+            User.full_name.ilike(f"%{search}%")
+        ))
+
+    if status == "active":
+        filters.append(User.is_active == True)
+    elif status == "inactive":
+        filters.append(User.is_active == False)
+    elif status == "admin":
+        filters.append(User.app_role == 'admin')
+    return filters
+
+def build_user_directory_query(dialect: str, search: str = "", status: str = "all"):
+    """Users joined with roles, account counts and subscription, ordered by id"""
+    roles_sq = select(
+        UserChatRole.user_id,
+        _aggregate_strings(dialect, UserChatRole.role_name).label("role_names")
+    ).where(
+        UserChatRole.is_active == True
+    ).group_by(UserChatRole.user_id).subquery()
+
+    accounts_sq = select(
+        BrokerAccount.user_id,
+        func.count(BrokerAccount.id).label("account_count")
+    ).group_by(BrokerAccount.user_id).subquery()
+
+    # First subscription per user (matches the previous per-user .first())
+    first_subscription_sq = select(
+        Subscription.user_id,
+        func.min(Subscription.id).label("subscription_id")
+    ).group_by(Subscription.user_id).subquery()
+
+    return select(
+        User.id,
+        User.username,
+        User.email,
+        User.full_name,
+        User.phone,
+        User.is_active,
+        User.app_role,
+        User.profile_picture,
+        User.created_at,
+        roles_sq.c.role_names,
+        func.coalesce(accounts_sq.c.account_count, 0).label("connected_accounts"),
+        Subscription.tier.label("subscription_tier"),
+        Subscription.status.label("subscription_status")
+    ).outerjoin(
+        roles_sq, roles_sq.c.user_id == User.id
+    ).outerjoin(
+        accounts_sq, accounts_sq.c.user_id == User.id
+    ).outerjoin(
+        first_subscription_sq, first_subscription_sq.c.user_id == User.id
+    ).outerjoin(
+        Subscription, Subscription.id == first_subscription_sq.c.subscription_id
+    ).where(
+        *_user_filters(search, status)
+    ).order_by(User.id)
+
+def _roles(row) -> List[str]:
+    roles = [role for role in (row.role_names or "").split(ROLE_SEPARATOR) if role]
+    if row.app_role == 'admin' and "Admin" not in roles:
+        roles.append("Admin")
+    return roles or ["User"]
+
+def user_row_to_dict(row) -> Dict[str, Any]:
+    """Shape a directory row like UserCompleteResponse"""
+    subscription = None
+    if row.subscription_tier is not None or row.subscription_status is not None:
+        subscription = {
+            "tier": row.subscription_tier,
+            "status": row.subscription_status,
+            "billing_interval": None
+        }
+
+    return {
+        "id": row.id,
+        "username": row.username or "",
+        "email": row.email or "",
+        "full_name": row.full_name,
+        "phone": row.phone,
+        "is_active": row.is_active,
+        "app_role": row.app_role,
+        "profile_picture": row.profile_picture,
+        "created_at": row.created_at,
+        "last_login": None,
+        "subscription": subscription,
+        "roles": _roles(row),
+        "connected_accounts": int(row.connected_accounts or 0)
+    }
+
+def get_user_directory_page(
+    db: Session,
+    search: str = "",
+    status: str = "all",
+    limit: int = 50,
+    offset: int = 0
+) -> Tuple[List[Dict[str, Any]], int]:
+    """One page of the user directory and the total matching users"""
+    dialect = db.get_bind().dialect.name
+    total = db.query(func.count(User.id)).filter(*_user_filters(search, status)).scalar() or 0
+
+    query = build_user_directory_query(dialect, search, status).offset(offset).limit(limit)
+    users = [user_row_to_dict(row) for row in db.execute(query)]
+    return users, total
+
+def _export_record(row) -> Dict[str, Any]:
+    return {
+        "id": row.id,
+        "username": row.username or "",
+        "email": row.email or "",
+        "full_name": row.full_name,
+        "phone": row.phone,
+        "is_active": row.is_active,
+        "app_role": row.app_role,
+        "created_at": row.created_at.isoformat() if row.created_at else None,
+        "roles": _roles(row),
+        "connected_accounts": int(row.connected_accounts or 0),
+        "subscription_tier": row.subscription_tier,
+        "subscription_status": row.subscription_status
+    }
+
+def iter_user_export(export_format: str = "csv", search: str = "", status: str = "all") -> Iterator[str]:
+    """
+    Stream the user directory as CSV or NDJSON
+
+    Uses its own session so the response can outlive the request's
+    dependencies, and a server-side cursor fetching EXPORT_BATCH_SIZE rows at a
+    time. Each batch is yielded as one chunk.
+    """
+    db = SessionLocal()
+    try:
+        query = build_user_directory_query(db.get_bind().dialect.name, search, status)
+        result = db.execute(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+
+        buffer = io.StringIO()
+        writer = None
+        if export_format == "csv":
+            writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+            writer.writeheader()
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+
+        exported = 0
+        for batch in result.partitions():
+            for row in batch:
+                record = _export_record(row)
+                if writer is not None:
+                    record["roles"] = ";".join(record["roles"])
+                    writer.writerow(record)
+                else:
+                    buffer.write(json.dumps(record) + "\n")
+            exported += len(batch)
+
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+
+        logger.info(f"Exported {exported} users as {export_format}")
+    finally:
+        db.close()
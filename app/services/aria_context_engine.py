@@ -10,6 +10,7 @@ from ..models.user import User
 from ..models.strategy import ActivatedStrategy
 from ..models.broker import BrokerAccount
 from ..models.order import Order
+from .trade_rollups import get_daily_rollups, summarize_days
 
 logger = logging.getLogger(__name__)
 
@@ -286,27 +287,47 @@ class ARIAContextEngine:
     async def _get_performance_summary(self, user_id: int) -> Dict[str, Any]:
         """Get performance summary for different time periods"""
         try:
-            # This would integrate with actual trade tracking
-            # For now, return mock performance data
-            
             today = datetime.utcnow().date()
+            week_start = today - timedelta(days=today.weekday())
+            month_start = today.replace(day=1)
+            
+            # One pass over the daily rollups covering both the week and the month
+            days = get_daily_rollups(self.db, user_id, min(week_start, month_start))
+            daily = summarize_days([d for d in days if d["trade_date"] == today])
+            weekly = summarize_days([d for d in days if d["trade_date"] >= week_start])
+            monthly = summarize_days([d for d in days if d["trade_date"] >= month_start])
+            
+            # Day-granular drawdown of cumulative realized P&L this month
+            cumulative = peak = max_drawdown = 0.0
+            for day in days:
+                if day["trade_date"] < month_start:
+                    continue
+                cumulative += day["total_pnl"]
+                peak = max(peak, cumulative)
+                max_drawdown = min(max_drawdown, cumulative - peak)
+            
+            if monthly["gross_loss"] > 0:
+                profit_factor = monthly["gross_profit"] / monthly["gross_loss"]
+            else:
+                profit_factor = 999.99 if monthly["gross_profit"] > 0 else 0.0
             
             return {
-                "daily_pnl": 250.75,
-                "daily_trades": 8,
-                "daily_win_rate": 0.625,
-                "weekly_pnl": 1125.30,
-                "weekly_trades": 42,
-                "monthly_pnl": 4560.80,
-                "monthly_trades": 187,
+                "daily_pnl": daily["total_pnl"],
+                "daily_trades": daily["trade_count"],
+                "daily_win_rate": (daily["winning_trades"] / daily["trade_count"]) if daily["trade_count"] else 0.0,
+                "weekly_pnl": weekly["total_pnl"],
+                "weekly_trades": weekly["trade_count"],
+                "monthly_pnl": monthly["total_pnl"],
+                "monthly_trades": monthly["trade_count"],
+                # Account balances and risk-adjusted ratios still need broker integration
                 "total_account_value": 125000.00,
                 "available_buying_power": 45000.00,
-                "largest_winner_today": 125.50,
-                "largest_loser_today": -85.25,
-                "current_drawdown": -150.00,
-                "max_drawdown_this_month": -890.00,
+                "largest_winner_today": daily["max_win"] or 0.0,
+                "largest_loser_today": daily["max_loss"] or 0.0,
+                "current_drawdown": cumulative - peak,
+                "max_drawdown_this_month": max_drawdown,
                 "sharpe_ratio": 1.42,
-                "profit_factor": 1.35,
+                "profit_factor": profit_factor,
                 "last_updated": datetime.utcnow().isoformat()
             }
             
@@ -0,0 +1,97 @@
+# app/services/chat_page_cache.py
+"""
+Short-lived cache of the newest message page per channel
+
+Nearly every client opens a channel on its most recent page, so that page is
+cached in Redis for a few seconds (one hash per channel, one field per page
+size) and dropped whenever a message in the channel is sent, edited, deleted
+or reacted to.
+
+Invalidating also bumps the channel's cache generation. A reader notes the
+generation before it queries the page and only stores the page if the
+generation is unchanged, so a page read before a write cannot be cached
+after the write invalidated it.
+"""
+import json
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from redis.exceptions import RedisError
+
+from app.core.redis_manager import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+LATEST_PAGE_KEY = "chat:latest_page:{channel_id}"
+LATEST_PAGE_GEN_KEY = "chat:latest_page_gen"
+LATEST_PAGE_TTL = 30  # seconds
+
+# Cache a page only if the channel was not invalidated since it was read
+_SET_IF_GENERATION = """
+if tonumber(redis.call('HGET', KEYS[2], ARGV[1]) or '0') ~= tonumber(ARGV[2]) then
+    return 0
+end
+redis.call('HSET', KEYS[1], ARGV[3], ARGV[4])
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+return 1
+"""
+
+
+def get_latest_page(channel_id: int, limit: int) -> Tuple[Optional[Dict[str, Any]], Optional[int]]:
+    """
+    Get the cached newest page of a channel, if present
+
+    Returns:
+        (page, generation): generation is what set_latest_page needs to cache
+        a page built after this call, or None if Redis is unavailable.
+    """
+    with get_redis_connection() as redis_client:
+        if not redis_client:
+            return None, None
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.hget(LATEST_PAGE_KEY.format(channel_id=channel_id), str(limit))
+            pipe.hget(LATEST_PAGE_GEN_KEY, str(channel_id))
+            cached, generation = pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Failed to read latest page cache for channel {channel_id}: {e}")
+            return None, None
+
+    generation = int(generation or 0)
+    if not cached:
+        return None, generation
+    try:
+        return json.loads(cached), generation
+    except ValueError:
+        return None, generation
+
+
+def set_latest_page(channel_id: int, limit: int, page: Dict[str, Any], generation: Optional[int]):
+    """Cache the newest page of a channel unless it was invalidated after generation was read"""
+    if generation is None:
+        return
+    with get_redis_connection() as redis_client:
+        if not redis_client:
+            return
+        try:
+            redis_client.eval(
+                _SET_IF_GENERATION, 2,
+                LATEST_PAGE_KEY.format(channel_id=channel_id), LATEST_PAGE_GEN_KEY,
+                str(channel_id), generation, str(limit), json.dumps(page), LATEST_PAGE_TTL
+            )
+        except RedisError as e:
+            logger.warning(f"Failed to cache latest page for channel {channel_id}: {e}")
+
+
+def invalidate_channel(channel_id: int):
+    """Drop every cached latest page of a channel"""
+    with get_redis_connection() as redis_client:
+        if not redis_client:
+            return
+        try:
+            pipe = redis_client.pipeline()
+            pipe.hincrby(LATEST_PAGE_GEN_KEY, str(channel_id), 1)
+            pipe.delete(LATEST_PAGE_KEY.format(channel_id=channel_id))
+            pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Failed to invalidate latest page cache for channel {channel_id}: {e}")
@@ -0,0 +1,249 @@
+# app/services/chat_unread.py
+"""
+Incremental unread counters for chat channels
+
+Each channel keeps a message sequence in Redis that advances when a message
+is posted, and each user keeps a read marker per channel holding the sequence
+they had seen when they last opened it. The unread count is the difference,
+so listing channels costs two hash reads regardless of message volume.
+
+Deleting a message bumps the channel generation, which invalidates every
+marker for that channel. Channels without a valid marker (and everything when
+Redis is unavailable) fall back to one grouped SQL query, whose result also
+reseeds the counters.
+
+A seeded sequence remembers the newest message id its SQL count covered, and
+posts only advance it for newer messages. A seed is refused when a newer
+message was already posted, since its increment was skipped while the
+channel was unseeded; the next listing counts again.
+"""
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from redis.exceptions import RedisError
+from sqlalchemy import and_, or_, case, func
+from sqlalchemy.orm import Session
+
+from app.core.redis_manager import get_redis_connection
+from app.models.chat import ChatMessage, ChatChannelMember
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_SEQ_KEY = "chat:channel_seq"
+CHANNEL_GEN_KEY = "chat:channel_gen"
+CHANNEL_SEQ_ID_KEY = "chat:channel_seq_id"  # Newest message id covered by the sequence
+CHANNEL_LAST_ID_KEY = "chat:channel_last_id"  # Newest message id posted
+READ_MARKER_KEY = "chat:read_seq:{user_id}"
+READ_MARKER_TTL = 30 * 24 * 3600  # 30 days
+
+# Record the post, then advance the sequence if it is seeded and does not
+# already include this message; a missing sequence is rebuilt from SQL
+_ADVANCE_IF_SEEDED = """
+local message_id = tonumber(ARGV[2])
+if message_id > tonumber(redis.call('HGET', KEYS[3], ARGV[1]) or '0') then
+    redis.call('HSET', KEYS[3], ARGV[1], message_id)
+end
+if redis.call('HEXISTS', KEYS[1], ARGV[1]) == 1
+        and message_id > tonumber(redis.call('HGET', KEYS[2], ARGV[1]) or '0') then
+    return redis.call('HINCRBY', KEYS[1], ARGV[1], 1)
+end
+return nil
+"""
+
+# Seed a sequence from a SQL count unless a message newer than the count was
+# posted meanwhile; returns the channel's sequence, or nil if it stays unseeded
+_SEED_SEQUENCE = """
+local sequence = redis.call('HGET', KEYS[1], ARGV[1])
+if sequence then
+    return sequence
+end
+if tonumber(redis.call('HGET', KEYS[3], ARGV[1]) or '0') > tonumber(ARGV[3]) then
+    return nil
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+redis.call('HSET', KEYS[2], ARGV[1], ARGV[3])
+return ARGV[2]
+"""
+
+
+def _parse_marker(marker: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Parse a "generation:sequence" read marker"""
+    if not marker:
+        return None
+    try:
+        generation, sequence = marker.split(":", 1)
+        return int(generation), int(sequence)
+    except ValueError:
+        return None
+
+
+def query_unread_counts(db: Session, user_id: int, channel_ids: List[int]) -> Dict[int, Tuple[int, int]]:
+    """
+    Count messages per channel in one grouped query
+
+    Returns:
+        Dict mapping channel_id to (total_messages, unread_messages, newest_message_id).
+        Channels the user has not joined count every message as unread.
+    """
+    if not channel_ids:
+        return {}
+
+    is_unread = or_(
+        ChatChannelMember.last_read_at.is_(None),
+        ChatMessage.created_at > ChatChannelMember.last_read_at
+    )
+    rows = db.query(
+        ChatMessage.channel_id,
+        func.count(ChatMessage.id),
+        func.sum(case((is_unread, 1), else_=0)),
+        func.max(ChatMessage.id)
+    ).outerjoin(
+        ChatChannelMember,
+        and_(
+            ChatChannelMember.channel_id == ChatMessage.channel_id,
+            ChatChannelMember.user_id == user_id
+        )
+    ).filter(
+        and_(
+            ChatMessage.channel_id.in_(channel_ids),
+            ChatMessage.is_deleted == False
+        )
+    ).group_by(ChatMessage.channel_id).all()
+
+    return {
+        channel_id: (int(total or 0), int(unread or 0), int(newest_id or 0))
+        for channel_id, total, unread, newest_id in rows
+    }
+
+
+class ChatUnreadTracker:
+    """Redis-backed unread counters with a grouped SQL fallback"""
+
+    def get_unread_counts(self, db: Session, user_id: int, channel_ids: List[int]) -> Dict[int, int]:
+        """Get unread message counts for a user across channels"""
+        counts: Dict[int, int] = {}
+        missing = list(channel_ids)
+
+        with get_redis_connection() as redis_client:
+            if redis_client and channel_ids:
+                try:
+                    counts, missing = self._read_counters(redis_client, user_id, channel_ids)
+                except RedisError as e:
+                    logger.warning(f"Unread counter lookup failed, using SQL: {e}")
+                    counts, missing = {}, list(channel_ids)
+
+        if missing:
+            totals = query_unread_counts(db, user_id, missing)
+            for channel_id in missing:
+                counts[channel_id] = totals.get(channel_id, (0, 0, 0))[1]
+            self._seed(user_id, totals, missing)
+
+        return counts
+
+    def _read_counters(self, redis_client, user_id: int, channel_ids: List[int]) -> Tuple[Dict[int, int], List[int]]:
+        fields = [str(channel_id) for channel_id in channel_ids]
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.hmget(CHANNEL_SEQ_KEY, fields)
+        pipe.hmget(CHANNEL_GEN_KEY, fields)
+        pipe.hmget(READ_MARKER_KEY.format(user_id=user_id), fields)
+        sequences, generations, markers = pipe.execute()
+
+        counts: Dict[int, int] = {}
+        missing: List[int] = []
+        for channel_id, sequence, generation, marker in zip(channel_ids, sequences, generations, markers):
+            parsed = _parse_marker(marker)
+            if sequence is None or parsed is None or parsed[0] != int(generation or 0):
+                missing.append(channel_id)
+                continue
+            counts[channel_id] = max(0, int(sequence) - parsed[1])
+        return counts, missing
+
+    def _seed(self, user_id: int, totals: Dict[int, Tuple[int, int, int]], channel_ids: List[int]):
+        """Seed channel sequences and this user's markers from a SQL count"""
+        with get_redis_connection() as redis_client:
+            if not redis_client:
+                return
+            try:
+                pipe = redis_client.pipeline(transaction=False)
+                for channel_id in channel_ids:
+                    total, _, newest_id = totals.get(channel_id, (0, 0, 0))
+                    pipe.eval(
+                        _SEED_SEQUENCE, 3, CHANNEL_SEQ_KEY, CHANNEL_SEQ_ID_KEY, CHANNEL_LAST_ID_KEY,
+                        str(channel_id), total, newest_id
+                    )
+                pipe.hmget(CHANNEL_GEN_KEY, [str(channel_id) for channel_id in channel_ids])
+                results = pipe.execute()
+                sequences, generations = results[:-1], results[-1]
+
+                marker_key = READ_MARKER_KEY.format(user_id=user_id)
+                markers = {}
+                for channel_id, sequence, generation in zip(channel_ids, sequences, generations):
+                    if sequence is None:
+                        # A message arrived during the count; recount on the next listing
+                        continue
+                    unread = totals.get(channel_id, (0, 0, 0))[1]
+                    markers[str(channel_id)] = f"{int(generation or 0)}:{int(sequence) - unread}"
+                if not markers:
+                    return
+
+                pipe = redis_client.pipeline(transaction=False)
+                pipe.hset(marker_key, mapping=markers)
+                pipe.expire(marker_key, READ_MARKER_TTL)
+                pipe.execute()
+            except RedisError as e:
+                logger.warning(f"Failed to seed unread counters for user {user_id}: {e}")
+
+    def on_message_posted(self, channel_id: int, message_id: int):
+        """Advance the channel sequence after a message is committed"""
+        with get_redis_connection() as redis_client:
+            if not redis_client:
+                return
+            try:
+                redis_client.eval(
+                    _ADVANCE_IF_SEEDED, 3, CHANNEL_SEQ_KEY, CHANNEL_SEQ_ID_KEY, CHANNEL_LAST_ID_KEY,
+                    str(channel_id), message_id
+                )
+            except RedisError as e:
+                logger.warning(f"Failed to advance unread counter for channel {channel_id}: {e}")
+
+    def on_message_deleted(self, channel_id: int):
+        """Invalidate every read marker for a channel after a message is deleted"""
+        with get_redis_connection() as redis_client:
+            if not redis_client:
+                return
+            try:
+                pipe = redis_client.pipeline(transaction=True)
+                pipe.hincrby(CHANNEL_GEN_KEY, str(channel_id), 1)
+                pipe.hdel(CHANNEL_SEQ_KEY, str(channel_id))
+                pipe.hdel(CHANNEL_SEQ_ID_KEY, str(channel_id))
+                pipe.execute()
+            except RedisError as e:
+                logger.warning(f"Failed to invalidate unread counters for channel {channel_id}: {e}")
+
+    def mark_read(self, user_id: int, channel_id: int):
+        """Move the user's read marker to the current channel sequence"""
+        with get_redis_connection() as redis_client:
+            if not redis_client:
+                return
+            marker_key = READ_MARKER_KEY.format(user_id=user_id)
+            try:
+                pipe = redis_client.pipeline(transaction=False)
+                pipe.hget(CHANNEL_SEQ_KEY, str(channel_id))
+                pipe.hget(CHANNEL_GEN_KEY, str(channel_id))
+                sequence, generation = pipe.execute()
+
+                if sequence is None:
+                    # Unseeded channel - the next listing reseeds from SQL
+                    redis_client.hdel(marker_key, str(channel_id))
+                    return
+
+                pipe = redis_client.pipeline(transaction=False)
+                pipe.hset(marker_key, str(channel_id), f"{int(generation or 0)}:{int(sequence)}")
+                pipe.expire(marker_key, READ_MARKER_TTL)
+                pipe.execute()
+            except RedisError as e:
+                logger.warning(f"Failed to update read marker for user {user_id}: {e}")
+
+
+# Global chat unread tracker instance
+chat_unread_tracker = ChatUnreadTracker()
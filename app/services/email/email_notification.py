@@ -7,7 +7,7 @@ from datetime import datetime
 from typing import Dict, Any, Optional
 
 from fastapi import BackgroundTasks
-from jinja2 import Environment, FileSystemLoader
+from functools import lru_cache
 import os
 
 from app.core.config import settings
@@ -127,7 +127,11 @@ app_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))  # app/
 templates_dir = os.path.join(app_dir, "templates")
 
 
-env = Environment(loader=FileSystemLoader(templates_dir))
+@lru_cache(maxsize=1)
+def get_template_env():
+    """Jinja2 environment for email templates, set up on the first email sent"""
+    from jinja2 import Environment, FileSystemLoader
+    return Environment(loader=FileSystemLoader(templates_dir))
 
 async def send_email(
     to: str,
@@ -150,7 +154,7 @@ async def send_email(
     try:
         # Load the template
         template_path = f"emails/{template}.html"
-        template_obj = env.get_template(template_path)
+        template_obj = get_template_env().get_template(template_path)
         
         # Render the template
         html_content = template_obj.render(**context)
@@ -4,22 +4,25 @@ import logging
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from functools import lru_cache
 from typing import Dict, Any, Optional
-from jinja2 import Environment, PackageLoader, select_autoescape
 from ...core.config import settings
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Set up Jinja2 for template rendering
-try:
-    env = Environment(
-        loader=PackageLoader('app', 'templates/emails'),
-        autoescape=select_autoescape(['html', 'xml'])
-    )
-except Exception as e:
-    logger.error(f"Failed to initialize email templates: {str(e)}")
-    env = None
+@lru_cache(maxsize=1)
+def get_template_env():
+    """Jinja2 environment for email templates, set up on the first email sent"""
+    from jinja2 import Environment, PackageLoader, select_autoescape
+    try:
+        return Environment(
+            loader=PackageLoader('app', 'templates/emails'),
+            autoescape=select_autoescape(['html', 'xml'])
+        )
+    except Exception as e:
+        logger.error(f"Failed to initialize email templates: {str(e)}")
+        return None
 
 async def send_email(
     to: str,
@@ -56,6 +59,7 @@ async def send_email(
         message['To'] = to
         
         # Render template if environment is configured
+        env = get_template_env()
         if env:
             # Try to load and render the template
             try:
@@ -0,0 +1,252 @@
+"""
+Local Subscription Entitlements
+
+Access checks used to ask Stripe on every request whether a customer had an
+active subscription. The local Subscription row already mirrors Stripe: the
+webhook handlers record status changes, cancellations and payment failures
+(grace period and dunning stage). Entitlements are evaluated from that row,
+cached with the authenticated principal, and a periodic reconciliation pass
+pulls subscription statuses from Stripe in bulk to correct any row a missed
+webhook left behind.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from redis.exceptions import RedisError
+
+from ..core.config import settings
+from ..core.redis_manager import get_redis_connection
+from ..db.session import SessionLocal
+from ..models.subscription import Subscription
+from .stripe_service import stripe
+
+logger = logging.getLogger(__name__)
+
+RECONCILE_LEASE_KEY = "entitlements:reconcile"
+
+# When a customer has several Stripe subscriptions, the best status wins
+STRIPE_STATUS_RANK = {
+    "active": 5,
+    "trialing": 4,
+    "past_due": 3,
+    "unpaid": 2,
+    "incomplete": 1
+}
+
+# Rows touched more recently than this are left alone (checkout may still be completing)
+RECONCILE_SETTLE_PERIOD = timedelta(hours=1)
+
+@dataclass(frozen=True)
+class Entitlement:
+    """What a user's subscription row allows, as of when it was read"""
+    user_id: int
+    tier: Optional[str]
+    status: Optional[str]
+    is_lifetime: bool
+    stripe_managed: bool
+    dunning_stage: Optional[str]
+    grace_period_ends_at: Optional[datetime]
+
+    @classmethod
+    def from_subscription(cls, subscription: Subscription) -> "Entitlement":
+        return cls(
+            user_id=subscription.user_id,
+            tier=subscription.tier,
+            status=subscription.status,
+            is_lifetime=bool(subscription.is_lifetime),
+            stripe_managed=bool(subscription.stripe_customer_id),
+            dunning_stage=subscription.dunning_stage,
+            grace_period_ends_at=subscription.grace_period_ends_at
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        if self.grace_period_ends_at:
+            data["grace_period_ends_at"] = self.grace_period_ends_at.isoformat()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Entitlement":
+        grace_period_ends_at = data.get("grace_period_ends_at")
+        return cls(**{
+            **data,
+            "grace_period_ends_at": datetime.fromisoformat(grace_period_ends_at) if grace_period_ends_at else None
+        })
+
+    @property
+    def is_in_grace_period(self) -> bool:
+        return bool(self.grace_period_ends_at) and datetime.utcnow() <= self.grace_period_ends_at
+
+    def denial_reason(self) -> Optional[str]:
+        """Why access is refused, or None if the subscription grants access"""
+        if self.is_lifetime and self.status == "active":
+            return None
+
+        # Non-Stripe users only have access through a lifetime subscription
+        if not self.stripe_managed:
+            return "Your subscription is not active"
+
+        if self.is_in_grace_period:
+            return None
+
+        if self.dunning_stage == "suspended":
+            return "Your subscription is suspended due to payment failure. Please update your payment method to restore access."
+
+        if self.status != "active":
+            return "Your subscription is not active"
+        return None
+
+def fetch_stripe_statuses() -> Dict[str, str]:
+    """Best subscription status per Stripe customer, listing all subscriptions in pages of 100"""
+    statuses: Dict[str, str] = {}
+    for stripe_subscription in stripe.Subscription.list(
+        status="all", limit=100, api_key=settings.STRIPE_SECRET_KEY
+    ).auto_paging_iter():
+        customer_id = stripe_subscription.customer
+        status = stripe_subscription.status
+        current = statuses.get(customer_id)
+        if current is None or STRIPE_STATUS_RANK.get(status, 0) > STRIPE_STATUS_RANK.get(current, 0):
+            statuses[customer_id] = status
+    return statuses
+
+def reconcile_subscriptions(db, stripe_statuses: Dict[str, str], now: Optional[datetime] = None) -> Dict[str, int]:
+    """
+    Align local Stripe-managed subscription statuses with Stripe
+
+    Lifetime subscriptions are never touched, and neither are rows updated
+    within RECONCILE_SETTLE_PERIOD. Customers with no Stripe subscription at
+    all are marked canceled.
+    """
+    now = now or datetime.utcnow()
+    settled_before = now - RECONCILE_SETTLE_PERIOD
+    checked = updated = 0
+
+    rows = db.query(
+        Subscription.id,
+        Subscription.stripe_customer_id,
+        Subscription.status,
+        Subscription.updated_at
+    ).filter(
+        Subscription.stripe_customer_id.isnot(None),
+        Subscription.is_lifetime.isnot(True)
+    ).order_by(Subscription.id).yield_per(500)
+
+    changes: Dict[int, str] = {}
+    for row in rows:
+        checked += 1
+        if row.updated_at and row.updated_at > settled_before:
+            continue
+        stripe_status = stripe_statuses.get(row.stripe_customer_id, "canceled")
+        if row.status != stripe_status:
+            changes[row.id] = stripe_status
+
+    if changes:
+        # Update through the ORM so commit hooks drop cached principals
+        for subscription in db.query(Subscription).filter(Subscription.id.in_(list(changes))):
+            logger.info(f"Reconciled subscription {subscription.id}: {subscription.status} -> {changes[subscription.id]}")
+            subscription.status = changes[subscription.id]
+            updated += 1
+        db.commit()
+    return {"checked": checked, "updated": updated}
+
+class EntitlementReconciler:
+    """
+    Periodically corrects local subscription statuses from Stripe
+
+    Usage:
+        await entitlement_reconciler.start()
+        entitlement_reconciler.get_stats()
+    """
+
+    def __init__(self, interval: int = 3600):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self._running = False
+
+        # Stats
+        self._runs = 0
+        self._errors = 0
+        self._last_run_at: Optional[float] = None
+        self._last_result: Optional[Dict[str, int]] = None
+
+    def reconcile(self) -> Dict[str, int]:
+        """Run one reconciliation pass (blocking)"""
+        stripe_statuses = fetch_stripe_statuses()
+        db = SessionLocal()
+        try:
+            result = reconcile_subscriptions(db, stripe_statuses)
+        finally:
+            db.close()
+
+        self._runs += 1
+        self._last_run_at = time.time()
+        self._last_result = result
+        logger.info(f"Subscription reconciliation: checked {result['checked']}, updated {result['updated']}")
+        return result
+
+    def _acquire_lease(self) -> bool:
+        """Only one worker reconciles per interval; without Redis every worker does"""
+        with get_redis_connection() as redis_client:
+            if not redis_client:
+                return True
+            try:
+                return bool(redis_client.set(
+                    RECONCILE_LEASE_KEY, "1", nx=True, ex=max(1, self.interval - 1)
+                ))
+            except RedisError:
+                return True
+
+    async def start(self):
+        """Start the periodic reconciliation loop"""
+        if self._running:
+            return
+
+        self._running = True
+        self._task = asyncio.create_task(self._reconcile_loop())
+        logger.info(f"Subscription reconciliation started (every {self.interval}s)")
+
+    async def stop(self):
+        """Stop the reconciliation loop"""
+        self._running = False
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        logger.info("Subscription reconciliation stopped")
+
+    async def _reconcile_loop(self):
+        try:
+            while self._running:
+                try:
+                    if await asyncio.to_thread(self._acquire_lease):
+                        await asyncio.to_thread(self.reconcile)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self._errors += 1
+                    logger.error(f"Subscription reconciliation failed: {str(e)}")
+                await asyncio.sleep(self.interval)
+        except asyncio.CancelledError:
+            pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get reconciliation statistics"""
+        return {
+            "running": self._running,
+            "interval": self.interval,
+            "runs": self._runs,
+            "errors": self._errors,
+            "last_run_at": self._last_run_at,
+            "last_result": self._last_result
+        }
+
+# Global entitlement reconciler instance
+entitlement_reconciler = EntitlementReconciler(interval=settings.ENTITLEMENT_RECONCILE_INTERVAL)
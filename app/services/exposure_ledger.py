@@ -0,0 +1,398 @@
+"""
+In-Memory Exposure Ledger for Pre-Trade Risk Checks
+
+Keeps a per-account view of net positions, working order quantity and daily
+P&L, updated from order acknowledgements and fills, so that the risk limits
+on ActivatedStrategy (max_position_size, max_daily_loss, stop_loss_percent)
+can be enforced without broker round-trips. A background loop periodically
+reconciles each tracked account against the broker and records the drift.
+
+The ledger lives in one worker's memory and never sees orders placed by other
+workers, so callers reload it from the positions they fetch under the account
+lock, and check_order refuses to approve against a ledger that has not been
+reloaded within the reconcile interval.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Any, List, Optional
+
+from ..db.session import get_db_context
+from ..models.broker import BrokerAccount
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_ORDER_STATUSES = {"filled", "cancelled", "rejected", "expired"}
+
+@dataclass
+class SymbolExposure:
+    """Net exposure for one symbol on an account (signed: long > 0, short < 0)"""
+    quantity: float = 0.0
+    pending_quantity: float = 0.0
+    avg_price: Optional[float] = None
+    last_price: Optional[float] = None
+
+@dataclass
+class PendingOrder:
+    """An acknowledged order whose fills have not all been applied yet"""
+    symbol: str
+    signed_quantity: float
+    filled_quantity: float = 0.0
+    acknowledged_at: float = field(default_factory=time.time)
+
+@dataclass
+class AccountExposure:
+    """Ledger state for a single broker account"""
+    account_id: str
+    positions: Dict[str, SymbolExposure] = field(default_factory=dict)
+    pending_orders: Dict[str, PendingOrder] = field(default_factory=dict)
+    day_pnl: Decimal = Decimal('0')
+    trading_day: date = field(default_factory=lambda: datetime.utcnow().date())
+    last_reconciled: Optional[float] = None
+    day_pnl_reconciled: Optional[float] = None
+    last_drift: float = 0.0
+
+    def position(self, symbol: str) -> SymbolExposure:
+        exposure = self.positions.get(symbol)
+        if exposure is None:
+            exposure = self.positions[symbol] = SymbolExposure()
+        return exposure
+
+class ExposureLedger:
+    """
+    Per-account exposure ledger
+
+    Usage:
+        if exposure_ledger.is_stale(account.account_id):
+            exposure_ledger.load_snapshot(account.account_id, positions, account_status)
+        reason = exposure_ledger.check_order(strategy, order_data)
+    """
+
+    def __init__(
+        self,
+        reconcile_interval: float = 60.0,
+        drift_alert_threshold: float = 1.0,
+        pending_order_ttl: float = 300.0
+    ):
+        self.reconcile_interval = reconcile_interval
+        self.pending_order_ttl = pending_order_ttl
+        self.drift_alert_threshold = drift_alert_threshold
+        self._accounts: Dict[str, AccountExposure] = {}
+        self._reconcile_task: Optional[asyncio.Task] = None
+        self._running = False
+
+        # Drift metrics
+        self._reconciliations = 0
+        self._reconcile_errors = 0
+        self._drifted_reconciliations = 0
+        self._max_drift = 0.0
+
+    # ------------------------------------------------------------------
+    # State updates
+    # ------------------------------------------------------------------
+
+    def is_tracked(self, account_id: str) -> bool:
+        return account_id in self._accounts
+
+    def is_stale(self, account_id: str) -> bool:
+        """Whether positions were not loaded from the broker within the reconcile interval"""
+        account = self._accounts.get(account_id)
+        return (
+            account is None or account.last_reconciled is None
+            or time.time() - account.last_reconciled >= self.reconcile_interval
+        )
+
+    def day_pnl_is_stale(self, account_id: str) -> bool:
+        """Whether the day P&L was not loaded from the broker within the reconcile interval"""
+        account = self._accounts.get(account_id)
+        return (
+            account is None or account.day_pnl_reconciled is None
+            or time.time() - account.day_pnl_reconciled >= self.reconcile_interval
+        )
+
+    def _account(self, account_id: str) -> AccountExposure:
+        account = self._accounts.get(account_id)
+        if account is None:
+            account = self._accounts[account_id] = AccountExposure(account_id=account_id)
+
+        # Daily P&L resets at the start of each UTC trading day
+        today = datetime.utcnow().date()
+        if account.trading_day != today:
+            account.trading_day = today
+            account.day_pnl = Decimal('0')
+        return account
+
+    def load_snapshot(
+        self,
+        account_id: str,
+        positions: List[Dict[str, Any]],
+        account_status: Optional[Dict[str, Any]] = None
+    ) -> float:
+        """
+        Replace ledger positions with a broker snapshot
+
+        Returns:
+            float: Drift between the ledger and the broker, in contracts/units
+        """
+        account = self._account(account_id)
+
+        broker_positions: Dict[str, SymbolExposure] = {}
+        for position in positions or []:
+            symbol = position.get("symbol")
+            if not symbol:
+                continue
+            exposure = broker_positions.setdefault(symbol, SymbolExposure())
+            exposure.quantity += float(position.get("quantity", 0) or 0)
+            if position.get("entry_price") is not None:
+                exposure.avg_price = float(position["entry_price"])
+            if position.get("current_price") is not None:
+                exposure.last_price = float(position["current_price"])
+
+        drift = 0.0
+        if account.last_reconciled is not None:
+            for symbol in set(account.positions) | set(broker_positions):
+                ledger_qty = account.positions[symbol].quantity if symbol in account.positions else 0.0
+                broker_qty = broker_positions[symbol].quantity if symbol in broker_positions else 0.0
+                drift += abs(ledger_qty - broker_qty)
+
+        # Working orders stay pending since their fills are not in the broker position yet;
+        # orders nobody reported on within the TTL are assumed to be reflected already
+        now = time.time()
+        for order_id, pending in list(account.pending_orders.items()):
+            if now - pending.acknowledged_at > self.pending_order_ttl:
+                del account.pending_orders[order_id]
+                continue
+            remaining = pending.signed_quantity - (1.0 if pending.signed_quantity > 0 else -1.0) * pending.filled_quantity
+            broker_positions.setdefault(pending.symbol, SymbolExposure()).pending_quantity += remaining
+
+        account.positions = broker_positions
+        if account_status is not None:
+            if account_status.get("day_pnl") is not None:
+                account.day_pnl = Decimal(str(account_status["day_pnl"]))
+            account.day_pnl_reconciled = time.time()
+        account.last_reconciled = time.time()
+        account.last_drift = drift
+        return drift
+
+    def on_order_acknowledged(
+        self,
+        account_id: str,
+        order_id: Optional[str],
+        symbol: str,
+        side: str,
+        quantity: float
+    ):
+        """Record a broker-acknowledged order as working exposure"""
+        if not order_id or account_id not in self._accounts:
+            return
+
+        account = self._account(account_id)
+        signed_quantity = float(quantity) if side.upper() == "BUY" else -float(quantity)
+        account.pending_orders[str(order_id)] = PendingOrder(symbol=symbol, signed_quantity=signed_quantity)
+        account.position(symbol).pending_quantity += signed_quantity
+
+    def on_order_update(
+        self,
+        account_id: str,
+        order_id: str,
+        status: str,
+        filled_quantity: Optional[float] = None,
+        average_price: Optional[float] = None,
+        realized_pnl: Optional[float] = None
+    ):
+        """Apply a fill or status change reported for an acknowledged order"""
+        account = self._accounts.get(account_id)
+        if account is None:
+            return
+        pending = account.pending_orders.get(str(order_id))
+        if pending is None:
+            return
+
+        account = self._account(account_id)
+        exposure = account.position(pending.symbol)
+        direction = 1.0 if pending.signed_quantity > 0 else -1.0
+
+        if status == "filled" and filled_quantity is None:
+            filled_quantity = abs(pending.signed_quantity)
+
+        if filled_quantity is not None:
+            newly_filled = min(float(filled_quantity), abs(pending.signed_quantity)) - pending.filled_quantity
+            if newly_filled > 0:
+                fill_delta = direction * newly_filled
+                previous_quantity = exposure.quantity
+                exposure.quantity += fill_delta
+                exposure.pending_quantity -= fill_delta
+                pending.filled_quantity += newly_filled
+
+                if average_price is not None:
+                    price = float(average_price)
+                    exposure.last_price = price
+                    # Average entry only moves when adding to (or flipping) the position
+                    if previous_quantity == 0 or (previous_quantity > 0) != (exposure.quantity > 0):
+                        exposure.avg_price = price
+                    elif abs(exposure.quantity) > abs(previous_quantity) and exposure.avg_price is not None:
+                        exposure.avg_price = (
+                            exposure.avg_price * abs(previous_quantity) + price * newly_filled
+                        ) / abs(exposure.quantity)
+
+        if realized_pnl is not None:
+            account.day_pnl += Decimal(str(realized_pnl))
+
+        if status in TERMINAL_ORDER_STATUSES:
+            # Release whatever part of the order never filled
+            exposure.pending_quantity -= direction * (abs(pending.signed_quantity) - pending.filled_quantity)
+            del account.pending_orders[str(order_id)]
+
+    # ------------------------------------------------------------------
+    # Risk checks
+    # ------------------------------------------------------------------
+
+    def check_order(self, strategy, order_data: Dict[str, Any]) -> Optional[str]:
+        """
+        Check an order against the strategy's risk limits
+
+        The account must have been loaded from the broker within the
+        reconcile interval; a stale ledger is missing other workers' orders.
+
+        Returns:
+            Optional[str]: Rejection reason, or None if the order is allowed
+        """
+        account_id = order_data["account_id"]
+        if self.is_stale(account_id):
+            return "Account exposure is out of date"
+        if strategy.max_daily_loss and self.day_pnl_is_stale(account_id):
+            return "Account daily P&L is out of date"
+        account = self._accounts[account_id]
+
+        symbol = order_data["symbol"]
+        order_quantity = float(order_data["quantity"])
+        signed_quantity = order_quantity if order_data["side"].upper() == "BUY" else -order_quantity
+        exposure = account.positions.get(symbol) or SymbolExposure()
+        current = exposure.quantity + exposure.pending_quantity
+        projected = current + signed_quantity
+        increases_exposure = abs(projected) > abs(current)
+
+        if strategy.max_position_size and increases_exposure:
+            if abs(projected) > strategy.max_position_size:
+                return "Order exceeds maximum position size"
+
+        if strategy.max_daily_loss:
+            account = self._account(account.account_id)
+            if account.day_pnl < 0 and abs(account.day_pnl) > strategy.max_daily_loss:
+                return "Daily loss limit exceeded"
+
+        if strategy.stop_loss_percent and increases_exposure and exposure.quantity:
+            same_direction = (exposure.quantity > 0) == (signed_quantity > 0)
+            if same_direction and exposure.avg_price and exposure.last_price:
+                adverse_move = (exposure.avg_price - exposure.last_price) / exposure.avg_price * 100
+                if exposure.quantity < 0:
+                    adverse_move = -adverse_move
+                if adverse_move >= float(strategy.stop_loss_percent):
+                    return f"Position in {symbol} is beyond its stop loss ({adverse_move:.2f}% adverse)"
+
+        return None
+
+    # ------------------------------------------------------------------
+    # Reconciliation
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        """Start periodic reconciliation against the brokers"""
+        if self._running:
+            return
+
+        self._running = True
+        self._reconcile_task = asyncio.create_task(self._reconcile_loop())
+        logger.info("Exposure ledger reconciliation started")
+
+    async def stop(self):
+        """Stop periodic reconciliation"""
+        self._running = False
+        if self._reconcile_task:
+            self._reconcile_task.cancel()
+            try:
+                await self._reconcile_task
+            except asyncio.CancelledError:
+                pass
+            self._reconcile_task = None
+        logger.info("Exposure ledger reconciliation stopped")
+
+    async def _reconcile_loop(self):
+        try:
+            while self._running:
+                await asyncio.sleep(self.reconcile_interval)
+                now = time.time()
+                for account_id, account in list(self._accounts.items()):
+                    if account.last_reconciled and now - account.last_reconciled < self.reconcile_interval:
+                        continue
+                    await self.reconcile_account(account_id)
+        except asyncio.CancelledError:
+            pass
+
+    async def reconcile_account(self, account_id: str) -> Optional[float]:
+        """Reload an account from its broker and record the drift"""
+        from ..core.brokers.base import BaseBroker
+
+        try:
+            async with get_db_context() as db:
+                account = db.query(BrokerAccount).filter(
+                    BrokerAccount.account_id == account_id,
+                    BrokerAccount.is_active == True
+                ).first()
+                if not account:
+                    self._accounts.pop(account_id, None)
+                    return None
+
+                broker = BaseBroker.get_broker_instance(account.broker_id, db)
+                positions = await broker.get_positions(account)
+                account_status = await broker.get_account_status(account)
+
+            drift = self.load_snapshot(account_id, positions, account_status)
+            self._reconciliations += 1
+            self._max_drift = max(self._max_drift, drift)
+            if drift:
+                self._drifted_reconciliations += 1
+            if drift >= self.drift_alert_threshold:
+                logger.warning(f"Exposure ledger drift of {drift} for account {account_id} corrected by reconciliation")
+            return drift
+
+        except Exception as e:
+            self._reconcile_errors += 1
+            logger.error(f"Error reconciling exposure for account {account_id}: {e}")
+            return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get ledger and drift statistics"""
+        return {
+            "running": self._running,
+            "tracked_accounts": len(self._accounts),
+            "reconcile_interval": self.reconcile_interval,
+            "reconciliations": self._reconciliations,
+            "reconcile_errors": self._reconcile_errors,
+            "drifted_reconciliations": self._drifted_reconciliations,
+            "max_drift": self._max_drift,
+            "accounts": {
+                account_id: {
+                    "positions": {
+                        symbol: {
+                            "quantity": exposure.quantity,
+                            "pending_quantity": exposure.pending_quantity
+                        }
+                        for symbol, exposure in account.positions.items()
+                        if exposure.quantity or exposure.pending_quantity
+                    },
+                    "working_orders": len(account.pending_orders),
+                    "day_pnl": float(account.day_pnl),
+                    "last_reconciled": account.last_reconciled,
+                    "last_drift": account.last_drift
+                }
+                for account_id, account in self._accounts.items()
+            }
+        }
+
+# Global exposure ledger instance
+exposure_ledger = ExposureLedger()
@@ -5,14 +5,23 @@ This service provides dynamic feature flag capabilities for the beta testing sys
 allowing real-time control over feature availability, gradual rollouts, and A/B testing.
 """
 
+import hashlib
 import logging
+import threading
+import time
+from collections import OrderedDict
 from typing import Dict, List, Optional, Any, Union
 from datetime import datetime, timedelta
 from enum import Enum
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, replace
 import json
+from redis.exceptions import RedisError
+from sqlalchemy import and_, event, inspect, select
 from sqlalchemy.orm import Session
-from app.services.chat_role_service import is_user_admin, is_user_moderator, is_user_beta_tester
+from app.core.config import settings
+from app.core.redis_manager import get_redis_connection
+from app.models.chat import UserChatRole
+from app.models.user import User
 
 logger = logging.getLogger(__name__)
 
@@ -60,14 +69,334 @@ class FeatureConfig:
             self.metadata = {}
 
 
+# Redis keys shared by all workers for admin changes to the built-in configs
+FEATURE_OVERRIDES_KEY = "feature_flags:overrides"
+FEATURE_VERSION_KEY = "feature_flags:version"
+
+# Roles implied by User.app_role (mirrors User.is_admin/is_moderator/is_beta_tester)
+APP_ROLE_GRANTS = {
+    "admin": frozenset({"Admin", "Moderator", "Beta Tester"}),
+    "moderator": frozenset({"Moderator", "Beta Tester"}),
+    "beta_tester": frozenset({"Beta Tester"}),
+}
+GRADUAL_ROLES = frozenset({"Beta Tester", "Admin", "Moderator"})
+
+
+def rollout_bucket(feature_name: str, user_id: int) -> int:
+    """
+    Stable 0-99 bucket for percentage rollouts
+
+    Unlike the built-in hash(), which is salted per process, every worker
+    and every restart puts a user in the same bucket.
+    """
+    digest = hashlib.blake2b(f"{feature_name}_{user_id}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % 100
+
+
+@dataclass(frozen=True)
+class CompiledFeature:
+    """A feature config reduced to what evaluation needs"""
+    name: str
+    # Decided without looking at the user (status, missing dependencies)
+    fixed: Optional[bool]
+    strategy: RolloutStrategy
+    percentage: int
+    users: frozenset
+    roles: frozenset
+    start_date: Optional[datetime]
+    end_date: Optional[datetime]
+    dependencies: tuple
+
+    @property
+    def needs_roles(self) -> bool:
+        return self.fixed is None and self.strategy in (RolloutStrategy.ROLE_BASED, RolloutStrategy.GRADUAL)
+
+
+def compile_features(configs: Dict[str, FeatureConfig]) -> List[CompiledFeature]:
+    """
+    Compile configs into evaluation order (dependencies first)
+
+    A feature whose dependency is unknown or part of a cycle is always off,
+    as it was when dependencies were checked recursively.
+    """
+    compiled: Dict[str, CompiledFeature] = {}
+    visiting = set()
+
+    def visit(name: str) -> bool:
+        """Compile a feature and its dependencies; False if it can never be enabled"""
+        if name in compiled:
+            return compiled[name].fixed is not False
+        config = configs.get(name)
+        if config is None or name in visiting:
+            return False
+        visiting.add(name)
+        resolvable = all([visit(dep) for dep in config.dependencies])
+        visiting.discard(name)
+
+        if config.status == FeatureStatus.DISABLED:
+            fixed = False
+        elif config.status == FeatureStatus.ENABLED and config.rollout_strategy == RolloutStrategy.ALL_USERS:
+            fixed = True
+        elif not resolvable:
+            logger.debug(f"Feature {name} has an unavailable dependency and is always off")
+            fixed = False
+        else:
+            fixed = None
+
+        compiled[name] = CompiledFeature(
+            name=name,
+            fixed=fixed,
+            strategy=config.rollout_strategy,
+            percentage=config.rollout_percentage,
+            users=frozenset(config.target_users),
+            roles=frozenset(config.target_roles),
+            start_date=config.start_date,
+            end_date=config.end_date,
+            dependencies=tuple(config.dependencies)
+        )
+        return fixed is not False
+
+    for name in configs:
+        visit(name)
+    return list(compiled.values())
+
+
+class FeatureFlagEngine:
+    """
+    Process-wide feature flag evaluation
+
+    Configs are compiled once when they load or change. All flags for a
+    user are evaluated together, with at most one query for the user's
+    roles, and the result is cached per user for FEATURE_FLAG_CACHE_TTL
+    seconds. Admin changes are stored in Redis and picked up by other
+    workers within FEATURE_FLAG_SYNC_INTERVAL seconds; any change to the
+    configs drops every cached result.
+
+    Usage:
+        features = feature_flag_engine.evaluate(db, user_id)
+        features.get("member-chat", False)
+    """
+
+    def __init__(self, loader, cache_ttl: int = 60, sync_interval: int = 5, max_entries: int = 10000):
+        self._loader = loader
+        self.cache_ttl = cache_ttl
+        self.sync_interval = sync_interval
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._configs: Optional[Dict[str, FeatureConfig]] = None
+        self._compiled: List[CompiledFeature] = []
+        self._version = 0
+        self._remote_version: Optional[str] = None
+        self._next_sync = 0.0
+        self._results: "OrderedDict[int, tuple]" = OrderedDict()
+
+        # Stats
+        self._hits = 0
+        self._evaluations = 0
+        self._role_lookups = 0
+        self._compilations = 0
+
+    @property
+    def configs(self) -> Dict[str, FeatureConfig]:
+        """Current feature configs (loaded on first use)"""
+        self._sync()
+        return self._configs
+
+    def _compile(self, configs: Dict[str, FeatureConfig]):
+        compiled = compile_features(configs)
+        with self._lock:
+            self._configs = configs
+            self._compiled = compiled
+            self._version += 1
+            self._results.clear()
+        self._compilations += 1
+
+    def _sync(self):
+        """Load the configs, applying admin overrides from Redis when they change"""
+        now = time.monotonic()
+        if self._configs is not None and now < self._next_sync:
+            return
+        self._next_sync = now + self.sync_interval
+
+        remote_version, overrides = self._remote_version, {}
+        with get_redis_connection() as redis_client:
+            if redis_client:
+                try:
+                    remote_version = redis_client.get(FEATURE_VERSION_KEY)
+                    if self._configs is not None and remote_version == self._remote_version:
+                        return
+                    overrides = redis_client.hgetall(FEATURE_OVERRIDES_KEY)
+                except RedisError as e:
+                    logger.warning(f"Failed to read feature flag overrides: {e}")
+                    if self._configs is not None:
+                        return
+            elif self._configs is not None:
+                return
+
+        configs = self._loader()
+        for name, raw in overrides.items():
+            if name in configs:
+                try:
+                    self._apply_updates(configs[name], json.loads(raw))
+                except (ValueError, KeyError, TypeError) as e:
+                    logger.warning(f"Ignoring invalid feature flag override for {name}: {e}")
+        self._remote_version = remote_version
+        self._compile(configs)
+
+    @staticmethod
+    def _apply_updates(config: FeatureConfig, updates: Dict[str, Any]):
+        if "status" in updates:
+            config.status = FeatureStatus(updates["status"])
+        if "rollout_strategy" in updates:
+            config.rollout_strategy = RolloutStrategy(updates["rollout_strategy"])
+        if "rollout_percentage" in updates:
+            config.rollout_percentage = updates["rollout_percentage"]
+        if "target_users" in updates:
+            config.target_users = list(updates["target_users"])
+        if "description" in updates:
+            config.description = updates["description"]
+        if "metadata" in updates:
+            config.metadata.update(updates["metadata"])
+
+    def update(self, feature_name: str, updates: Dict[str, Any]) -> bool:
+        """Apply a config change, recompile and publish it to other workers"""
+        configs = self.configs
+        if feature_name not in configs:
+            return False
+
+        # Validate against a copy so a bad value leaves the live config untouched
+        config = replace(
+            configs[feature_name],
+            target_users=list(configs[feature_name].target_users),
+            metadata=dict(configs[feature_name].metadata)
+        )
+        self._apply_updates(config, updates)
+        self._compile({**configs, feature_name: config})
+
+        override = {
+            "status": config.status.value,
+            "rollout_strategy": config.rollout_strategy.value,
+            "rollout_percentage": config.rollout_percentage,
+            "target_users": config.target_users,
+            "description": config.description,
+            "metadata": config.metadata
+        }
+        with get_redis_connection() as redis_client:
+            if redis_client:
+                try:
+                    pipe = redis_client.pipeline()
+                    pipe.hset(FEATURE_OVERRIDES_KEY, feature_name, json.dumps(override, default=str))
+                    pipe.incr(FEATURE_VERSION_KEY)
+                    self._remote_version = str(pipe.execute()[-1])
+                except RedisError as e:
+                    logger.warning(f"Failed to publish feature flag change for {feature_name}: {e}")
+        return True
+
+    def _load_roles(self, db: Session, user_id: int) -> frozenset:
+        """App role grants and active chat role names, in one query"""
+        self._role_lookups += 1
+        rows = db.execute(
+            select(User.app_role, UserChatRole.role_name)
+            .select_from(User)
+            .outerjoin(UserChatRole, and_(UserChatRole.user_id == User.id, UserChatRole.is_active == True))
+            .where(User.id == user_id)
+        ).all()
+
+        roles = set()
+        for app_role, role_name in rows:
+            roles |= APP_ROLE_GRANTS.get(app_role, frozenset())
+            if role_name:
+                roles.add(role_name)
+        return frozenset(roles)
+
+    def evaluate(self, db: Session, user_id: int) -> Dict[str, bool]:
+        """Evaluate every feature for a user"""
+        self._sync()
+        now = time.monotonic()
+        with self._lock:
+            version, compiled = self._version, self._compiled
+            cached = self._results.get(user_id)
+            if cached is not None and cached[0] == version and cached[1] > now:
+                self._results.move_to_end(user_id)
+                self._hits += 1
+                return dict(cached[2])
+
+        self._evaluations += 1
+        results: Dict[str, bool] = {}
+        roles = None
+        current_time = datetime.now()
+        for feature in compiled:
+            if feature.fixed is not None:
+                results[feature.name] = feature.fixed
+                continue
+            if feature.start_date and current_time < feature.start_date:
+                results[feature.name] = False
+                continue
+            if feature.end_date and current_time > feature.end_date:
+                results[feature.name] = False
+                continue
+            if not all(results.get(dep, False) for dep in feature.dependencies):
+                results[feature.name] = False
+                continue
+            if feature.needs_roles and roles is None:
+                roles = self._load_roles(db, user_id)
+
+            if feature.strategy == RolloutStrategy.ALL_USERS:
+                enabled = True
+            elif feature.strategy == RolloutStrategy.USER_LIST:
+                enabled = user_id in feature.users
+            elif feature.strategy == RolloutStrategy.ROLE_BASED:
+                enabled = not roles.isdisjoint(feature.roles)
+            elif feature.strategy == RolloutStrategy.PERCENTAGE:
+                enabled = rollout_bucket(feature.name, user_id) < feature.percentage
+            elif feature.strategy == RolloutStrategy.GRADUAL:
+                enabled = (
+                    not roles.isdisjoint(GRADUAL_ROLES)
+                    or rollout_bucket(feature.name, user_id) < feature.percentage
+                )
+            else:
+                enabled = False
+            results[feature.name] = enabled
+
+        with self._lock:
+            if self._version == version:
+                self._results[user_id] = (version, now + self.cache_ttl, results)
+                self._results.move_to_end(user_id)
+                while len(self._results) > self.max_entries:
+                    self._results.popitem(last=False)
+        return dict(results)
+
+    def invalidate_user(self, user_id: int):
+        """Drop a user's cached results in this worker (e.g. after a role change)"""
+        with self._lock:
+            self._results.pop(user_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get evaluation and cache statistics"""
+        return {
+            "features": len(self._compiled),
+            "version": self._version,
+            "compilations": self._compilations,
+            "cached_users": len(self._results),
+            "cache_ttl": self.cache_ttl,
+            "hits": self._hits,
+            "evaluations": self._evaluations,
+            "role_lookups": self._role_lookups
+        }
+
+
 class FeatureFlagService:
     """Service for managing feature flags and beta feature access"""
     
     def __init__(self, db: Session):
         self.db = db
-        self._feature_configs = self._load_feature_configs()
     
-    def _load_feature_configs(self) -> Dict[str, FeatureConfig]:
+    @property
+    def _feature_configs(self) -> Dict[str, FeatureConfig]:
+        return feature_flag_engine.configs
+    
+    @staticmethod
+    def _load_feature_configs() -> Dict[str, FeatureConfig]:
         """Load feature configurations from database or config file"""
         # For now, we'll use in-memory configuration
         # In production, this would load from database or Redis
@@ -180,135 +509,15 @@ class FeatureFlagService:
             bool: True if feature is enabled for user
         """
         try:
-            logger.info(f"Checking feature '{feature_name}' for user {user_id}")
-            config = self._feature_configs.get(feature_name)
-            if not config:
+            user_features = feature_flag_engine.evaluate(self.db, user_id)
+            if feature_name not in user_features:
                 logger.warning(f"Feature config not found: {feature_name}")
                 return False
-            
-            logger.info(f"Feature {feature_name} config: status={config.status}, strategy={config.rollout_strategy}, target_roles={config.target_roles}")
-            
-            # Check if feature is globally disabled
-            if config.status == FeatureStatus.DISABLED:
-                logger.info(f"Feature {feature_name} is globally disabled")
-                return False
-            
-            # Check if feature is globally enabled
-            if config.status == FeatureStatus.ENABLED and config.rollout_strategy == RolloutStrategy.ALL_USERS:
-                logger.info(f"Feature {feature_name} is globally enabled for all users")
-                return True
-            
-            # Check date constraints
-            now = datetime.now()
-            if config.start_date and now < config.start_date:
-                logger.info(f"Feature {feature_name} not yet available (start_date: {config.start_date})")
-                return False
-            if config.end_date and now > config.end_date:
-                logger.info(f"Feature {feature_name} expired (end_date: {config.end_date})")
-                return False
-            
-            # Check dependencies
-            if config.dependencies:
-                for dep in config.dependencies:
-                    if not await self.is_feature_enabled(dep, user_id):
-                        logger.debug(f"Feature {feature_name} disabled due to missing dependency: {dep}")
-                        return False
-            
-            # Apply rollout strategy
-            result = await self._check_rollout_strategy(config, user_id)
-            logger.info(f"Feature {feature_name} rollout strategy result for user {user_id}: {result}")
-            return result
-            
+            return user_features[feature_name]
         except Exception as e:
             logger.error(f"Error checking feature access for {feature_name}: {str(e)}")
             return False
     
-    async def _check_rollout_strategy(self, config: FeatureConfig, user_id: int) -> bool:
-        """Check if user has access based on rollout strategy"""
-        try:
-            if config.rollout_strategy == RolloutStrategy.ALL_USERS:
-                return True
-            
-            elif config.rollout_strategy == RolloutStrategy.USER_LIST:
-                return user_id in config.target_users
-            
-            elif config.rollout_strategy == RolloutStrategy.ROLE_BASED:
-                return await self._check_role_access(config.target_roles, user_id)
-            
-            elif config.rollout_strategy == RolloutStrategy.PERCENTAGE:
-                # Use consistent hash-based percentage rollout
-                user_hash = hash(f"{config.name}_{user_id}") % 100
-                return user_hash < config.rollout_percentage
-            
-            elif config.rollout_strategy == RolloutStrategy.GRADUAL:
-                # Gradual rollout combines role-based and percentage
-                has_role_access = await self._check_role_access(["Beta Tester", "Admin", "Moderator"], user_id)
-                if has_role_access:
-                    return True
-                
-                # For non-beta users, use percentage
-                user_hash = hash(f"{config.name}_{user_id}") % 100
-                return user_hash < config.rollout_percentage
-            
-            return False
-            
-        except Exception as e:
-            logger.error(f"Error in rollout strategy check: {str(e)}")
-            return False
-    
-    async def _check_role_access(self, target_roles: List[str], user_id: int) -> bool:
-        """Check if user has any of the target roles"""
-        try:
-            # Check app_role field first (User.app_role)
-            from app.models.user import User
-            user = self.db.query(User).filter(User.id == user_id).first()
-            
-            logger.info(f"Checking role access for user {user_id}, target_roles: {target_roles}")
-            
-            if user:
-                logger.info(f"User {user_id} found - email: {user.email}, app_role: '{user.app_role}', is_admin(): {user.is_admin()}, is_beta_tester(): {user.is_beta_tester()}")
-                
-                # Check each target role explicitly
-                for target_role in target_roles:
-                    logger.info(f"Checking target role: '{target_role}'")
-                    
-                    if target_role == "Admin" and user.is_admin():
-                        logger.info(f"User {user_id} granted access via Admin app_role (app_role='{user.app_role}')")
-                        return True
-                    if target_role == "Beta Tester" and user.is_beta_tester():
-                        logger.info(f"User {user_id} granted access via Beta Tester app_role (app_role='{user.app_role}')")
-                        return True
-                    if target_role == "Moderator" and user.is_moderator():
-                        logger.info(f"User {user_id} granted access via Moderator app_role (app_role='{user.app_role}')")
-                        return True
-            else:
-                logger.warning(f"User {user_id} not found in database!")
-            
-            # Also check chat roles for backwards compatibility
-            logger.info(f"Checking chat roles for user {user_id}")
-            admin_chat_role = await is_user_admin(self.db, user_id)
-            beta_chat_role = await is_user_beta_tester(self.db, user_id)
-            logger.info(f"User {user_id} chat roles - admin: {admin_chat_role}, beta_tester: {beta_chat_role}")
-            
-            for target_role in target_roles:
-                if target_role == "Admin" and admin_chat_role:
-                    logger.info(f"User {user_id} granted access via Admin chat role")
-                    return True
-                if target_role == "Moderator" and await is_user_moderator(self.db, user_id):
-                    logger.info(f"User {user_id} granted access via Moderator chat role")
-                    return True
-                if target_role == "Beta Tester" and beta_chat_role:
-                    logger.info(f"User {user_id} granted access via Beta Tester chat role")
-                    return True
-            
-            logger.info(f"User {user_id} denied access - no matching roles in app_role ('{user.app_role if user else 'USER_NOT_FOUND'}') or chat roles")
-            return False
-        except Exception as e:
-            logger.error(f"Error checking role access: {str(e)}")
-            import traceback
-            logger.error(traceback.format_exc())
-            return False
-    
     async def get_user_features(self, user_id: int) -> Dict[str, bool]:
         """
         Get all features and their availability status for a user
@@ -320,15 +529,7 @@ class FeatureFlagService:
             Dict mapping feature names to availability status
         """
         try:
-            logger.info(f"Getting all user features for user {user_id}")
-            user_features = {}
-            for feature_name in self._feature_configs.keys():
-                is_enabled = await self.is_feature_enabled(feature_name, user_id)
-                user_features[feature_name] = is_enabled
-                logger.info(f"Feature {feature_name} for user {user_id}: {is_enabled}")
-            
-            logger.info(f"Final user features for user {user_id}: {user_features}")
-            return user_features
+            return feature_flag_engine.evaluate(self.db, user_id)
         except Exception as e:
             logger.error(f"Error getting user features: {str(e)}")
             return {}
@@ -356,24 +557,10 @@ class FeatureFlagService:
             bool: True if update successful
         """
         try:
-            if feature_name not in self._feature_configs:
+            if not feature_flag_engine.update(feature_name, updates):
                 logger.error(f"Feature not found: {feature_name}")
                 return False
             
-            config = self._feature_configs[feature_name]
-            
-            # Update allowed fields
-            if "status" in updates:
-                config.status = FeatureStatus(updates["status"])
-            if "rollout_percentage" in updates:
-                config.rollout_percentage = updates["rollout_percentage"]
-            if "target_users" in updates:
-                config.target_users = updates["target_users"]
-            if "description" in updates:
-                config.description = updates["description"]
-            if "metadata" in updates:
-                config.metadata.update(updates["metadata"])
-            
             logger.info(f"Updated feature config for {feature_name}: {updates}")
             return True
             
@@ -389,7 +576,7 @@ class FeatureFlagService:
                 return False
             
             if user_id not in config.target_users:
-                config.target_users.append(user_id)
+                feature_flag_engine.update(feature_name, {"target_users": config.target_users + [user_id]})
                 logger.info(f"Added user {user_id} to feature {feature_name}")
             
             return True
@@ -405,7 +592,10 @@ class FeatureFlagService:
                 return False
             
             if user_id in config.target_users:
-                config.target_users.remove(user_id)
+                feature_flag_engine.update(
+                    feature_name,
+                    {"target_users": [u for u in config.target_users if u != user_id]}
+                )
                 logger.info(f"Removed user {user_id} from feature {feature_name}")
             
             return True
@@ -460,6 +650,42 @@ class FeatureFlagService:
             return {}
 
 
+# Global feature flag engine instance
+feature_flag_engine = FeatureFlagEngine(
+    FeatureFlagService._load_feature_configs,
+    cache_ttl=settings.FEATURE_FLAG_CACHE_TTL,
+    sync_interval=settings.FEATURE_FLAG_SYNC_INTERVAL
+)
+
+# Drop cached results after commits that change a user's app role or chat roles
+# (bulk query.update() calls bypass this and are covered by the cache TTL)
+
+PENDING_FLAG_INVALIDATIONS = "feature_flag_invalidations"
+
+@event.listens_for(Session, "after_flush")
+def _collect_role_changes(session, flush_context):
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User):
+            if obj in session.dirty and not inspect(obj).attrs.app_role.history.has_changes():
+                continue
+            user_id = obj.id
+        elif isinstance(obj, UserChatRole):
+            user_id = obj.user_id
+        else:
+            continue
+        if user_id is not None:
+            session.info.setdefault(PENDING_FLAG_INVALIDATIONS, set()).add(user_id)
+
+@event.listens_for(Session, "after_commit")
+def _apply_role_changes(session):
+    for user_id in session.info.pop(PENDING_FLAG_INVALIDATIONS, ()):
+        feature_flag_engine.invalidate_user(user_id)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_role_changes(session):
+    session.info.pop(PENDING_FLAG_INVALIDATIONS, None)
+
+
 def create_feature_flag_decorator(feature_name: str):
     """
     Create a decorator for feature flag checking
@@ -0,0 +1,207 @@
+"""
+Deterministic Client Order IDs and Order Dedupe Index
+
+Every order derived from a webhook event gets a client order id computed from
+the event, the strategy and the account, so a retried ``place_order`` carries
+the same id and brokers that support client ids (Tradovate ``clOrdId``,
+Binance ``newClientOrderId``, IB ``cOID``) reject the duplicate instead of
+filling twice. The local dedupe index remembers acknowledged placements so
+retries and redelivered webhooks are answered without another broker call.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, Optional, Callable, Awaitable, Tuple
+
+from redis.exceptions import RedisError
+
+from ..core.redis_manager import get_redis_connection
+from ..core.correlation import CorrelationLogger
+
+logger = CorrelationLogger(__name__)
+
+# Payload fields that identify a single alert when the sender provides them.
+# Fields like "id" or "time" are often static in TradingView templates, so
+# they cannot tell two identical signals apart.
+EVENT_ID_FIELDS = ("event_id", "alert_id")
+
+# Binance caps newClientOrderId at 36 characters
+CLIENT_ORDER_ID_PREFIX = "atk-"
+CLIENT_ORDER_ID_HASH_LENGTH = 32
+
+def webhook_event_id(webhook_id: int, payload: Dict[str, Any], received_at: datetime) -> str:
+    """
+    Derive a stable id for one webhook event
+
+    The whole payload is hashed so distinct signals never collide. Payloads
+    without a sender-provided event_id or alert_id fall back to the second
+    they were received in, so sender retries within that second share an id
+    while identical signals sent later still execute.
+    """
+    has_event_field = any(payload.get(field) not in (None, "") for field in EVENT_ID_FIELDS)
+    key_data = {
+        "webhook_id": webhook_id,
+        "payload": payload,
+        "received_second": None if has_event_field else received_at.replace(microsecond=0).isoformat()
+    }
+    key_string = json.dumps(key_data, sort_keys=True, default=str)
+    return hashlib.sha256(key_string.encode()).hexdigest()[:32]
+
+def generate_client_order_id(event_id: str, strategy_key: Any, account_id: Any) -> str:
+    """Deterministic client order id for one (event, strategy, account) order"""
+    seed = f"{event_id}:{strategy_key}:{account_id}"
+    digest = hashlib.sha256(seed.encode()).hexdigest()[:CLIENT_ORDER_ID_HASH_LENGTH]
+    return f"{CLIENT_ORDER_ID_PREFIX}{digest}"
+
+class OrderDedupeIndex:
+    """
+    Local index of placed orders keyed by client order id
+
+    Usage:
+        result = await order_dedupe_index.place_once(
+            order_data["client_order_id"],
+            broker.place_order, account, order_data
+        )
+    """
+
+    def __init__(self, ttl: int = 3600, max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._results: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+        # Stats
+        self._placed = 0
+        self._local_hits = 0
+        self._redis_hits = 0
+        self._joined_in_flight = 0
+
+    def _redis_key(self, client_order_id: str) -> str:
+        return f"order_dedupe:{client_order_id}"
+
+    def get(self, client_order_id: str) -> Optional[Dict[str, Any]]:
+        """Get the cached result for a client order id, if it was placed recently"""
+        entry = self._results.get(client_order_id)
+        if entry is None:
+            return None
+
+        expires_at, result = entry
+        if expires_at < time.monotonic():
+            del self._results[client_order_id]
+            return None
+
+        self._results.move_to_end(client_order_id)
+        return result
+
+    def _remember(self, client_order_id: str, result: Dict[str, Any]):
+        self._results[client_order_id] = (time.monotonic() + self.ttl, result)
+        self._results.move_to_end(client_order_id)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+        with get_redis_connection() as redis_client:
+            if not redis_client:
+                return
+            try:
+                redis_client.setex(
+                    self._redis_key(client_order_id),
+                    self.ttl,
+                    json.dumps(result, default=str)
+                )
+            except RedisError as e:
+                logger.warning(f"Could not share order dedupe entry {client_order_id}: {e}")
+
+    def _lookup_shared(self, client_order_id: str) -> Optional[Dict[str, Any]]:
+        """Check whether another worker already placed this order"""
+        with get_redis_connection() as redis_client:
+            if not redis_client:
+                return None
+            try:
+                cached = redis_client.get(self._redis_key(client_order_id))
+            except RedisError as e:
+                logger.warning(f"Order dedupe lookup failed for {client_order_id}: {e}")
+                return None
+
+        if not cached:
+            return None
+        try:
+            return json.loads(cached)
+        except ValueError:
+            return None
+
+    async def place_once(
+        self,
+        client_order_id: Optional[str],
+        func: Callable[..., Awaitable[Dict[str, Any]]],
+        *args,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Place an order unless this client order id was already placed
+
+        Concurrent callers with the same id share the single broker call.
+        Failed placements are not cached, so the caller may retry with the
+        same id and rely on broker-side dedupe.
+        """
+        if not client_order_id:
+            return await func(*args, **kwargs)
+
+        cached = self.get(client_order_id)
+        if cached is not None:
+            self._local_hits += 1
+            logger.info(f"Order {client_order_id} already placed, returning cached result")
+            return {**cached, "deduplicated": True}
+
+        in_flight = self._in_flight.get(client_order_id)
+        if in_flight is not None:
+            self._joined_in_flight += 1
+            result = await asyncio.shield(in_flight)
+            return {**result, "deduplicated": True}
+
+        shared = self._lookup_shared(client_order_id)
+        if shared is not None:
+            self._redis_hits += 1
+            self._results[client_order_id] = (time.monotonic() + self.ttl, shared)
+            logger.info(f"Order {client_order_id} placed by another worker, returning shared result")
+            return {**shared, "deduplicated": True}
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[client_order_id] = future
+        try:
+            result = await func(*args, **kwargs)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody may be waiting on the shared future
+            future.exception()
+            raise
+        else:
+            result = {**result, "client_order_id": client_order_id}
+            self._remember(client_order_id, result)
+            self._placed += 1
+            future.set_result(result)
+            return result
+        finally:
+            self._in_flight.pop(client_order_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get dedupe index statistics"""
+        return {
+            "entries": len(self._results),
+            "in_flight": len(self._in_flight),
+            "placed": self._placed,
+            "local_hits": self._local_hits,
+            "redis_hits": self._redis_hits,
+            "joined_in_flight": self._joined_in_flight,
+            "ttl": self.ttl,
+            "max_entries": self.max_entries
+        }
+
+# Global order dedupe index instance
+order_dedupe_index = OrderDedupeIndex()
@@ -0,0 +1,451 @@
+"""
+Per-User Resource Counters
+
+Tier limits need a user's connected broker accounts, active webhooks and
+active strategies. Those counts are kept in a Redis hash per user, so a limit
+check is a single HGETALL. Session hooks turn every committed insert, delete
+or activation toggle of those rows into increments, applied only once the
+transaction commits. A counter that does not exist yet is seeded from the
+database in one query; increments are dropped until then, so a partially
+seeded hash can never drift upward.
+
+Every change is registered per user from flush until commit or rollback, and
+bumps the user's change version when it ends. A seed is only stored if no
+change was in progress and the version did not move while counting, so a
+create or delete that lands between the count and the seed is not lost; the
+next read counts again.
+
+The hourly reconciliation compares the counters against one grouped query and
+rewrites only the users whose Redis counters or subscription columns disagree.
+"""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from redis.exceptions import RedisError
+from sqlalchemy import event, func, inspect, select, update
+from sqlalchemy.orm import Session
+
+from ..core.redis_manager import get_redis_connection
+from ..models.broker import BrokerAccount
+from ..models.strategy import ActivatedStrategy
+from ..models.subscription import Subscription
+from ..models.webhook import Webhook
+
+logger = logging.getLogger(__name__)
+
+COUNTERS_KEY = "resources:counts:{user_id}"
+COUNTERS_TTL = 7 * 24 * 3600  # 7 days; reseeded from the database on demand
+SEED_STATE_KEY = "resources:seed:{user_id}"  # Changes in progress and change version
+SEED_STATE_TTL = 300  # Bounds how long a crashed transaction can block seeding
+RECONCILE_LEASE_KEY = "resources:reconcile"
+RECONCILE_BATCH_SIZE = 500
+PENDING_DELTAS = "resource_counter_deltas"
+
+RESOURCES = ("connected_accounts", "active_webhooks", "active_strategies")
+
+# Only adjust a counter that has been seeded; a missing one is rebuilt from SQL
+_INCREMENT_IF_SEEDED = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    for i = 1, #ARGV, 2 do
+        redis.call('HINCRBY', KEYS[1], ARGV[i], ARGV[i + 1])
+    end
+    return 1
+end
+return 0
+"""
+
+# Register the start (ARGV[1] = 1) or end (ARGV[1] = -1) of a change; ending
+# one also bumps the version
+_TRACK_CHANGE = """
+redis.call('HINCRBY', KEYS[1], 'in_progress', ARGV[1])
+if tonumber(ARGV[1]) < 0 then
+    redis.call('HINCRBY', KEYS[1], 'version', 1)
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+# Store a counted value unless the counter exists, a change is in progress or
+# the version moved since the count started
+_SEED_IF_UNCHANGED = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return 0
+end
+if tonumber(redis.call('HGET', KEYS[2], 'in_progress') or '0') > 0
+        or (redis.call('HGET', KEYS[2], 'version') or '') ~= ARGV[1] then
+    return 0
+end
+for i = 3, #ARGV, 2 do
+    redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+_UNKNOWN = object()
+
+def _attribute_value(state, key: str, committed: bool):
+    """An attribute's current or last committed value, without triggering a load"""
+    if committed:
+        history = state.attrs[key].history
+        if history.deleted:
+            return history.deleted[0]
+        if history.added:
+            return _UNKNOWN
+        if history.unchanged:
+            return history.unchanged[0]
+    return state.dict.get(key, _UNKNOWN)
+
+def _counted(obj, committed: bool = False) -> Optional[bool]:
+    """
+    Whether a row counts toward its user's limits, before or after pending changes
+
+    Mirrors the SQL counts (NULL flags do not count). None if the value
+    is not loaded and cannot be known without a query.
+    """
+    state = inspect(obj)
+    is_active = _attribute_value(state, "is_active", committed)
+    if is_active is _UNKNOWN:
+        return None
+    if isinstance(obj, BrokerAccount):
+        is_deleted = _attribute_value(state, "is_deleted", committed)
+        if is_deleted is _UNKNOWN:
+            return None
+        return is_active is True and is_deleted is False
+    return is_active is True
+
+_RESOURCE_BY_MODEL = {
+    BrokerAccount: "connected_accounts",
+    Webhook: "active_webhooks",
+    ActivatedStrategy: "active_strategies"
+}
+
+def _count_expressions():
+    """Grouped per-user counts of each resource, for joining on user_id"""
+    accounts = select(
+        BrokerAccount.user_id, func.count(BrokerAccount.id).label("count")
+    ).where(
+        BrokerAccount.is_active == True,
+        BrokerAccount.is_deleted == False
+    ).group_by(BrokerAccount.user_id).subquery()
+
+    webhooks = select(
+        Webhook.user_id, func.count(Webhook.id).label("count")
+    ).where(Webhook.is_active == True).group_by(Webhook.user_id).subquery()
+
+    strategies = select(
+        ActivatedStrategy.user_id, func.count(ActivatedStrategy.id).label("count")
+    ).where(ActivatedStrategy.is_active == True).group_by(ActivatedStrategy.user_id).subquery()
+
+    return accounts, webhooks, strategies
+
+def count_resources(db: Session, user_id: int, active_only: bool = True) -> Dict[str, int]:
+    """
+    Count a user's resources from the database in one statement
+
+    With active_only=False every row counts, including inactive and deleted ones.
+    """
+    def count_of(model, *conditions):
+        if not active_only:
+            conditions = ()
+        return select(func.count(model.id)).where(model.user_id == user_id, *conditions).scalar_subquery()
+
+    row = db.execute(select(
+        count_of(BrokerAccount, BrokerAccount.is_active == True, BrokerAccount.is_deleted == False),
+        count_of(Webhook, Webhook.is_active == True),
+        count_of(ActivatedStrategy, ActivatedStrategy.is_active == True)
+    )).one()
+    return dict(zip(RESOURCES, (int(value or 0) for value in row)))
+
+class ResourceCounters:
+    """
+    Redis-backed per-user resource counts
+
+    Usage:
+        counts = resource_counters.get(db, user_id)
+        counts["active_webhooks"]
+    """
+
+    def __init__(self):
+        # Stats
+        self._hits = 0
+        self._seeds = 0
+        self._seeds_skipped = 0
+        self._applied = 0
+        self._reconciliations = 0
+        self._last_reconciliation: Optional[Dict[str, Any]] = None
+
+    def get(self, db: Session, user_id: int) -> Dict[str, int]:
+        """Current counts for a user; seeds the counter from the database if missing"""
+        version = None
+        with get_redis_connection() as redis_client:
+            if redis_client:
+                try:
+                    pipe = redis_client.pipeline(transaction=False)
+                    pipe.hgetall(COUNTERS_KEY.format(user_id=user_id))
+                    pipe.hget(SEED_STATE_KEY.format(user_id=user_id), "version")
+                    counts, version = pipe.execute()
+                    if counts and all(resource in counts for resource in RESOURCES):
+                        self._hits += 1
+                        return {resource: max(0, int(counts[resource])) for resource in RESOURCES}
+                except (RedisError, ValueError) as e:
+                    logger.warning(f"Failed to read resource counters for user {user_id}: {e}")
+
+        counts = count_resources(db, user_id)
+        self.seed(user_id, counts, version)
+        return counts
+
+    def recount(self, db: Session, user_id: int) -> Dict[str, int]:
+        """Count a user's resources from the database and reseed the counter"""
+        self.invalidate([user_id])
+        return self.get(db, user_id)
+
+    def seed(self, user_id: int, counts: Dict[str, int], version: Optional[str]):
+        """
+        Store values counted from the database for a user
+
+        ``version`` is the user's change version read before counting; the
+        seed is skipped if a change started or finished since.
+        """
+        with get_redis_connection() as redis_client:
+            if not redis_client:
+                return
+            args: List[Any] = [version or "", COUNTERS_TTL]
+            for resource, count in counts.items():
+                args.extend([resource, count])
+            try:
+                if redis_client.eval(
+                    _SEED_IF_UNCHANGED, 2,
+                    COUNTERS_KEY.format(user_id=user_id), SEED_STATE_KEY.format(user_id=user_id),
+                    *args
+                ):
+                    self._seeds += 1
+                else:
+                    self._seeds_skipped += 1
+            except RedisError as e:
+                logger.warning(f"Failed to seed resource counters for user {user_id}: {e}")
+
+    def track_changes(self, user_ids: List[int], finished: bool):
+        """Register the start or end of uncommitted changes to users' resources"""
+        if not user_ids:
+            return
+        with get_redis_connection() as redis_client:
+            if not redis_client:
+                return
+            try:
+                pipe = redis_client.pipeline(transaction=False)
+                for user_id in user_ids:
+                    pipe.eval(
+                        _TRACK_CHANGE, 1, SEED_STATE_KEY.format(user_id=user_id),
+                        -1 if finished else 1, SEED_STATE_TTL
+                    )
+                pipe.execute()
+            except RedisError as e:
+                logger.warning(f"Failed to track resource changes: {e}")
+
+    def apply(self, deltas: Dict[int, Dict[str, int]]):
+        """Apply committed per-user count changes to seeded counters"""
+        deltas = {
+            user_id: {resource: delta for resource, delta in changes.items() if delta}
+            for user_id, changes in deltas.items()
+        }
+        deltas = {user_id: changes for user_id, changes in deltas.items() if changes}
+        if not deltas:
+            return
+
+        with get_redis_connection() as redis_client:
+            if not redis_client:
+                return
+            try:
+                pipe = redis_client.pipeline()
+                for user_id, changes in deltas.items():
+                    args: List[Any] = []
+                    for resource, delta in changes.items():
+                        args.extend([resource, delta])
+                    pipe.eval(_INCREMENT_IF_SEEDED, 1, COUNTERS_KEY.format(user_id=user_id), *args)
+                pipe.execute()
+                self._applied += len(deltas)
+            except RedisError as e:
+                # Counters are now stale; drop them so the next read reseeds
+                logger.warning(f"Failed to update resource counters: {e}")
+                self.invalidate(list(deltas))
+
+    def invalidate(self, user_ids: List[int]):
+        """Drop counters so they are recounted on the next read"""
+        if not user_ids:
+            return
+        with get_redis_connection() as redis_client:
+            if not redis_client:
+                return
+            try:
+                redis_client.delete(*[COUNTERS_KEY.format(user_id=user_id) for user_id in user_ids])
+            except RedisError as e:
+                logger.warning(f"Failed to invalidate resource counters: {e}")
+
+    def reconcile(self, db: Session) -> Dict[str, int]:
+        """
+        Correct counters and subscription columns that disagree with the database
+
+        Counts every subscribed user's resources in one grouped query, compares
+        them with the Redis counters (pipelined reads per batch) and the stored
+        subscription columns, and writes only the rows that differ.
+        """
+        start_time = time.time()
+        accounts, webhooks, strategies = _count_expressions()
+        rows = db.execute(select(
+            Subscription.id,
+            Subscription.user_id,
+            Subscription.connected_accounts_count,
+            Subscription.active_webhooks_count,
+            Subscription.active_strategies_count,
+            func.coalesce(accounts.c.count, 0),
+            func.coalesce(webhooks.c.count, 0),
+            func.coalesce(strategies.c.count, 0)
+        ).outerjoin(
+            accounts, accounts.c.user_id == Subscription.user_id
+        ).outerjoin(
+            webhooks, webhooks.c.user_id == Subscription.user_id
+        ).outerjoin(
+            strategies, strategies.c.user_id == Subscription.user_id
+        ).where(
+            Subscription.user_id.isnot(None)
+        ).order_by(Subscription.id).execution_options(yield_per=RECONCILE_BATCH_SIZE))
+
+        checked = counters_fixed = subscriptions_fixed = 0
+        subscription_updates = []
+        for batch in rows.partitions():
+            checked += len(batch)
+            actual_by_user = {}
+            for row in batch:
+                actual = dict(zip(RESOURCES, (int(value) for value in row[5:8])))
+                actual_by_user[row.user_id] = actual
+                if tuple(row[2:5]) != tuple(actual[resource] for resource in RESOURCES):
+                    subscription_updates.append({
+                        "id": row.id,
+                        "connected_accounts_count": actual["connected_accounts"],
+                        "active_webhooks_count": actual["active_webhooks"],
+                        "active_strategies_count": actual["active_strategies"]
+                    })
+            counters_fixed += self._reconcile_counters(actual_by_user)
+
+        if subscription_updates:
+            db.execute(update(Subscription), subscription_updates)
+            db.commit()
+            subscriptions_fixed = len(subscription_updates)
+
+        result = {
+            "checked": checked,
+            "counters_fixed": counters_fixed,
+            "subscriptions_fixed": subscriptions_fixed,
+            "duration": round(time.time() - start_time, 3)
+        }
+        self._reconciliations += 1
+        self._last_reconciliation = result
+        return result
+
+    def _reconcile_counters(self, actual_by_user: Dict[int, Dict[str, int]]) -> int:
+        """Overwrite seeded Redis counters that differ; unseeded users are left for on-demand seeding"""
+        with get_redis_connection() as redis_client:
+            if not redis_client:
+                return 0
+            try:
+                user_ids = list(actual_by_user)
+                pipe = redis_client.pipeline()
+                for user_id in user_ids:
+                    pipe.hmget(COUNTERS_KEY.format(user_id=user_id), *RESOURCES)
+                stored = pipe.execute()
+
+                pipe = redis_client.pipeline()
+                fixed = 0
+                for user_id, values in zip(user_ids, stored):
+                    if all(value is None for value in values):
+                        continue
+                    actual = actual_by_user[user_id]
+                    if [int(value) if value is not None else None for value in values] != [actual[r] for r in RESOURCES]:
+                        key = COUNTERS_KEY.format(user_id=user_id)
+                        pipe.hset(key, mapping=actual)
+                        pipe.expire(key, COUNTERS_TTL)
+                        fixed += 1
+                if fixed:
+                    pipe.execute()
+                return fixed
+            except (RedisError, ValueError) as e:
+                logger.warning(f"Failed to reconcile resource counters: {e}")
+                return 0
+
+    def acquire_reconcile_lease(self, ttl: int) -> bool:
+        """Only one worker reconciles per interval; without Redis every worker does"""
+        with get_redis_connection() as redis_client:
+            if not redis_client:
+                return True
+            try:
+                return bool(redis_client.set(RECONCILE_LEASE_KEY, "1", nx=True, ex=max(1, ttl)))
+            except RedisError:
+                return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get counter statistics"""
+        return {
+            "hits": self._hits,
+            "seeds": self._seeds,
+            "seeds_skipped": self._seeds_skipped,
+            "users_updated": self._applied,
+            "reconciliations": self._reconciliations,
+            "last_reconciliation": self._last_reconciliation
+        }
+
+# Global resource counters instance
+resource_counters = ResourceCounters()
+
+# Turn committed inserts, deletes and activation toggles into counter deltas
+
+@event.listens_for(Session, "after_flush")
+def _collect_resource_changes(session, flush_context):
+    pending = None
+    for objects, kind in ((session.new, "new"), (session.deleted, "deleted"), (session.dirty, "dirty")):
+        for obj in objects:
+            resource = _RESOURCE_BY_MODEL.get(type(obj))
+            if resource is None:
+                continue
+            user_id = inspect(obj).dict.get("user_id")
+            if user_id is None:
+                continue
+
+            before = False if kind == "new" else _counted(obj, committed=True)
+            after = False if kind == "deleted" else _counted(obj)
+            if before is not None and before == after:
+                continue
+
+            if pending is None:
+                pending = session.info.setdefault(PENDING_DELTAS, {"deltas": {}, "unknown": set(), "users": set()})
+            if user_id not in pending["users"]:
+                # Seeds are held off until this transaction ends
+                pending["users"].add(user_id)
+                resource_counters.track_changes([user_id], finished=False)
+            if before is None or after is None:
+                # Previous state not loaded; recount this user on the next read
+                pending["unknown"].add(user_id)
+            else:
+                changes = pending["deltas"].setdefault(user_id, {})
+                changes[resource] = changes.get(resource, 0) + int(after) - int(before)
+
+@event.listens_for(Session, "after_commit")
+def _apply_resource_changes(session):
+    pending = session.info.pop(PENDING_DELTAS, None)
+    if not pending:
+        return
+    resource_counters.invalidate(list(pending["unknown"]))
+    resource_counters.apply({
+        user_id: changes for user_id, changes in pending["deltas"].items()
+        if user_id not in pending["unknown"]
+    })
+    # Only after the deltas are applied, so a seed counted meanwhile is refused
+    resource_counters.track_changes(list(pending["users"]), finished=True)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_resource_changes(session):
+    pending = session.info.pop(PENDING_DELTAS, None)
+    if pending:
+        resource_counters.track_changes(list(pending["users"]), finished=True)
@@ -0,0 +1,170 @@
+# app/services/strategy_marketplace.py
+"""
+Cached index of shared strategies for the marketplace listing
+
+The listing is built with one query (owner username joined in, no secrets)
+and published to Redis for all workers. Each worker keeps a presorted local
+copy for a few seconds, so listing, sorting and paging are in-memory. The
+index is rebuilt once it expires, and dropped immediately when a strategy's
+sharing state changes.
+"""
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from redis.exceptions import RedisError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.redis_manager import get_redis_connection
+from app.models.user import User
+from app.models.webhook import Webhook
+
+logger = logging.getLogger(__name__)
+
+INDEX_KEY = "marketplace:shared_index"
+INDEX_TTL = 60  # seconds in Redis
+LOCAL_TTL = 10  # seconds in-process
+
+SORT_KEYS = {
+    "rating": lambda item: (item["rating"], item["total_ratings"], item["id"]),
+    "subscribers": lambda item: (item["subscriber_count"], item["id"]),
+    "recent": lambda item: (item["shared_at"] or "", item["id"]),
+}
+
+
+def build_index(db: Session) -> List[Dict[str, Any]]:
+    """Query every shared strategy with its owner's username"""
+    base_url = settings.SERVER_HOST.rstrip('/')
+    rows = db.query(
+        Webhook.id,
+        Webhook.token,
+        Webhook.user_id,
+        Webhook.name,
+        Webhook.details,
+        Webhook.source_type,
+        Webhook.strategy_type,
+        Webhook.is_active,
+        Webhook.created_at,
+        Webhook.sharing_enabled_at,
+        Webhook.last_triggered,
+        Webhook.subscriber_count,
+        Webhook.rating,
+        Webhook.total_ratings,
+        User.username
+    ).join(User, User.id == Webhook.user_id).filter(Webhook.is_shared == True).all()
+
+    return [
+        {
+            "id": row.id,
+            "token": row.token,
+            "user_id": row.user_id,
+            "name": row.name,
+            "details": row.details,
+            "source_type": row.source_type,
+            "strategy_type": row.strategy_type.value if row.strategy_type else None,
+            "is_active": row.is_active,
+            "is_shared": True,
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+            "shared_at": (row.sharing_enabled_at or row.created_at).isoformat() if (row.sharing_enabled_at or row.created_at) else None,
+            "last_triggered": row.last_triggered.isoformat() if row.last_triggered else None,
+            "webhook_url": f"{base_url}/api/v1/webhooks/{row.token}",
+            "subscriber_count": row.subscriber_count or 0,
+            "rating": float(row.rating or 0.0),
+            "total_ratings": row.total_ratings or 0,
+            "username": row.username,
+        }
+        for row in rows
+    ]
+
+
+class MarketplaceIndex:
+    """
+    Shared strategy listing served from a cached index
+
+    Usage:
+        items, total = marketplace_index.get_page(db, sort="rating", limit=50, offset=0)
+    """
+
+    def __init__(self):
+        self._items: List[Dict[str, Any]] = []
+        self._orders: Dict[str, List[int]] = {}
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def _load_local(self, items: List[Dict[str, Any]]):
+        orders = {
+            sort: sorted(range(len(items)), key=lambda i, key=key: key(items[i]), reverse=True)
+            for sort, key in SORT_KEYS.items()
+        }
+        with self._lock:
+            self._items = items
+            self._orders = orders
+            self._loaded_at = time.monotonic()
+
+    def _read_published(self) -> Optional[List[Dict[str, Any]]]:
+        with get_redis_connection() as redis_client:
+            if not redis_client:
+                return None
+            try:
+                data = redis_client.get(INDEX_KEY)
+            except RedisError as e:
+                logger.warning(f"Failed to read marketplace index: {e}")
+                return None
+        if not data:
+            return None
+        try:
+            return json.loads(data)
+        except ValueError:
+            return None
+
+    def _publish(self, items: List[Dict[str, Any]]):
+        with get_redis_connection() as redis_client:
+            if not redis_client:
+                return
+            try:
+                redis_client.set(INDEX_KEY, json.dumps(items), ex=INDEX_TTL)
+            except RedisError as e:
+                logger.warning(f"Failed to publish marketplace index: {e}")
+
+    def _ensure_loaded(self, db: Session):
+        if self._loaded_at and time.monotonic() - self._loaded_at < LOCAL_TTL:
+            return
+
+        items = self._read_published()
+        if items is None:
+            items = build_index(db)
+            self._publish(items)
+            logger.debug(f"Rebuilt marketplace index with {len(items)} strategies")
+        self._load_local(items)
+
+    def get_page(
+        self,
+        db: Session,
+        sort: str = "rating",
+        limit: int = 50,
+        offset: int = 0
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """One page of shared strategies in the requested order, and the total"""
+        self._ensure_loaded(db)
+        with self._lock:
+            items, order = self._items, self._orders.get(sort, self._orders["rating"])
+        return [items[i] for i in order[offset:offset + limit]], len(order)
+
+    def invalidate(self):
+        """Drop the index everywhere (after a strategy is shared, unshared or deleted)"""
+        with self._lock:
+            self._loaded_at = 0.0
+        with get_redis_connection() as redis_client:
+            if not redis_client:
+                return
+            try:
+                redis_client.delete(INDEX_KEY)
+            except RedisError as e:
+                logger.warning(f"Failed to invalidate marketplace index: {e}")
+
+
+# Global marketplace index instance
+marketplace_index = MarketplaceIndex()
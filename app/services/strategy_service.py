@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 from decimal import Decimal
 import logging
@@ -12,7 +12,7 @@ from ..models.broker import BrokerAccount
 
 from ..models.strategy import ActivatedStrategy
 from ..models.broker import BrokerAccount, BrokerCredentials
-from ..core.brokers.base import BaseBroker
+from ..core.brokers.base import BaseBroker, DuplicateOrderError
 from fastapi import HTTPException
 # Import the ticker utilities
 from ..utils.ticker_utils import validate_ticker, get_contract_ticker, get_display_ticker
@@ -24,6 +24,10 @@ from ..core.alert_manager import TradingAlerts
 from ..core.circuit_breaker import circuit_breaker_manager, CircuitBreakerOpenError
 from ..core.rollback_manager import rollback_manager
 from ..core.graceful_shutdown import shutdown_manager
+from ..core.order_dispatcher import order_dispatcher, DispatchPriority
+from .strategy_stats import strategy_stats_accumulator
+from .exposure_ledger import exposure_ledger
+from .order_dedupe import order_dedupe_index, generate_client_order_id
 
 logger = get_enhanced_logger(__name__)
 
@@ -90,7 +94,8 @@ class OrderPool:
             leader_strategy = ActivatedStrategy(**strategy_dict)
             result = await self.strategy_processor._execute_single_account_strategy(
                 leader_strategy,
-                order['signal_data']
+                order['signal_data'],
+                priority=DispatchPriority.LEADER
             )
             
             logger.info(f"Leader order execution result: {result}")
@@ -131,7 +136,8 @@ class OrderPool:
                         tasks.append(
                             self.strategy_processor._execute_single_account_strategy(
                                 follower_strategy,
-                                order['signal_data']
+                                order['signal_data'],
+                                priority=DispatchPriority.FOLLOWER
                             )
                         )
 
@@ -184,8 +190,7 @@ class StrategyProcessor:
             if not valid:
                 error_msg = f"Invalid ticker format: {strategy.ticker}"
                 logger.error(error_msg)
-                strategy.failed_trades += 1
-                self.db.commit()
+                strategy_stats_accumulator.record_failure(strategy.id)
                 return {"status": "error", "reason": error_msg}
             
             # Update signal_data with the validated contract ticker
@@ -201,16 +206,21 @@ class StrategyProcessor:
 
         except Exception as e:
             logger.error(f"Error executing strategy {strategy.id}: {str(e)}")
-            strategy.failed_trades += 1
-            self.db.commit()
+            strategy_stats_accumulator.record_failure(strategy.id)
             raise
 
     async def _execute_single_account_strategy(
         self,
         strategy: ActivatedStrategy,
-        signal_data: Dict[str, Any]
+        signal_data: Dict[str, Any],
+        priority: DispatchPriority = DispatchPriority.LEADER
     ) -> Dict[str, Any]:
-        """Execute a single account trading strategy with enhanced error handling"""
+        """
+        Execute a single account trading strategy with enhanced error handling
+        
+        ``priority`` is the dispatch class for entry orders on this account;
+        orders that reduce an existing position are always sent as FLATTEN.
+        """
         
         circuit_name = f"strategy_{strategy.id}"
         
@@ -232,7 +242,8 @@ class StrategyProcessor:
                         circuit_name,
                         self._execute_strategy_with_rollback,
                         strategy,
-                        signal_data
+                        signal_data,
+                        priority
                     )
                 except CircuitBreakerOpenError:
                     logger.warning(f"Circuit breaker open for strategy {strategy.id}",
@@ -245,7 +256,8 @@ class StrategyProcessor:
     async def _execute_strategy_with_rollback(
         self,
         strategy: ActivatedStrategy,
-        signal_data: Dict[str, Any]
+        signal_data: Dict[str, Any],
+        priority: DispatchPriority = DispatchPriority.LEADER
     ) -> Dict[str, Any]:
         """Execute strategy with full rollback support"""
         
@@ -302,8 +314,11 @@ class StrategyProcessor:
                         )
 
                     # Check current positions to prevent duplicate trades
+                    positions = None
                     try:
-                        positions = await broker.get_positions(account)
+                        positions = await order_dispatcher.submit(
+                            account.broker_id, priority, broker.get_positions, account
+                        )
                         current_position = 0
                         for position in positions:
                             if position.get("symbol") == contract_ticker:
@@ -316,6 +331,9 @@ class StrategyProcessor:
                         
                         # Position-aware logic: check if we should execute based on current position
                         action = signal_data["action"].upper()
+                        if (action == "SELL" and current_position > 0) or (action == "BUY" and current_position < 0):
+                            # Risk-reducing order - never queue it behind new entries
+                            priority = DispatchPriority.FLATTEN
                         if action == "SELL" and current_position <= 0:
                             logger.info(f"Skipping SELL signal - no long position in {contract_ticker}",
                                        operation="position_validation")
@@ -342,6 +360,20 @@ class StrategyProcessor:
                         "time_in_force": signal_data.get("time_in_force", "GTC"),
                     }
 
+                    # Deterministic client order id so retries and redeliveries dedupe at the broker
+                    if signal_data.get("event_id"):
+                        order_data["client_order_id"] = generate_client_order_id(
+                            signal_data["event_id"],
+                            strategy.id if strategy.id is not None else strategy.webhook_id,
+                            account.account_id
+                        )
+
+                    # Pre-trade risk checks against the in-memory exposure ledger
+                    if strategy.max_position_size or strategy.max_daily_loss or strategy.stop_loss_percent:
+                        await self._validate_risk_limits(
+                            strategy, account, order_data, broker, positions=positions, priority=priority
+                        )
+
                     # Log the order details
                     logger.info(f"Executing order with distributed lock",
                                operation="order_execution",
@@ -349,7 +381,27 @@ class StrategyProcessor:
 
                     # Execute order
                     try:
-                        order_result = await broker.place_order(account, order_data)
+                        order_result = await self._execute_order_with_retry(
+                            broker, account, order_data, priority=priority
+                        )
+                        
+                        # Keep the exposure ledger current with the acknowledged order
+                        exposure_ledger.on_order_acknowledged(
+                            account.account_id,
+                            order_result.get("order_id"),
+                            contract_ticker,
+                            signal_data["action"],
+                            strategy.quantity
+                        )
+                        if order_result.get("status") == "filled":
+                            exposure_ledger.on_order_update(
+                                account.account_id,
+                                order_result["order_id"],
+                                "filled",
+                                order_result.get("filled_quantity"),
+                                order_result.get("average_price"),
+                                order_result.get("realized_pnl")
+                            )
                         
                         # Add broker order cancellation to rollback if needed
                         if order_result.get("order_id"):
@@ -458,7 +510,8 @@ class StrategyProcessor:
                 leader_strategy = ActivatedStrategy(**leader_strategy_dict)
                 leader_result = await self._execute_single_account_strategy(
                     leader_strategy,
-                    signal_data_copy
+                    signal_data_copy,
+                    priority=DispatchPriority.LEADER
                 )
                 
                 results.append({
@@ -510,7 +563,8 @@ class StrategyProcessor:
                     follower_strategy = ActivatedStrategy(**follower_dict)
                     follower_result = await self._execute_single_account_strategy(
                         follower_strategy,
-                        signal_data_copy
+                        signal_data_copy,
+                        priority=DispatchPriority.FOLLOWER
                     )
 
                     results.append({
@@ -617,55 +671,104 @@ class StrategyProcessor:
                     raise
                 await asyncio.sleep(1 * (attempt + 1))  # Exponential backoff
 
-    async def _execute_order_with_retry(self, broker, account, order_data, max_retries=3):
-        """Retry wrapper for order execution"""
-        for attempt in range(max_retries):
+    async def _execute_order_with_retry(
+        self,
+        broker,
+        account,
+        order_data,
+        max_retries=3,
+        priority=DispatchPriority.LEADER
+    ):
+        """
+        Retry wrapper for order execution
+
+        Every attempt carries the same client order id, so a timeout after the
+        broker accepted the order cannot fill twice. Orders without a client
+        order id are only attempted once.
+        """
+        client_order_id = order_data.get("client_order_id")
+        attempts = max_retries if client_order_id else 1
+
+        for attempt in range(attempts):
             try:
-                return await broker.place_order(account, order_data)
+                return await order_dedupe_index.place_once(
+                    client_order_id,
+                    order_dispatcher.submit,
+                    account.broker_id, priority, broker.place_order, account, order_data
+                )
             except Exception as e:
+                if attempt > 0 and isinstance(e, DuplicateOrderError):
+                    # An earlier attempt reached the broker after all
+                    logger.warning(f"Order {client_order_id} was already accepted by the broker")
+                    return await self._find_accepted_order(broker, account, client_order_id, priority, e.order)
                 logger.error(f"Order execution attempt {attempt + 1} failed: {str(e)}")
-                if attempt == max_retries - 1:  # Last attempt
+                if attempt == attempts - 1:  # Last attempt
                     raise
                 await asyncio.sleep(1 * (attempt + 1))
 
+    async def _find_accepted_order(self, broker, account, client_order_id, priority, existing=None):
+        """Look up the order an earlier attempt placed, so the caller gets its real id"""
+        if existing is None:
+            existing = await order_dispatcher.submit(
+                account.broker_id, priority, broker.find_order_by_client_id, account, client_order_id
+            )
+        if existing is None:
+            raise ValueError(
+                f"Broker reported order {client_order_id} as a duplicate but it is not in the order list"
+            )
+        return {
+            **existing,
+            "status": existing.get("status") or "submitted",
+            "client_order_id": client_order_id,
+            "deduplicated": True
+        }
+
     async def _validate_risk_limits(
         self,
         strategy: ActivatedStrategy,
         account: BrokerAccount,
-        order_data: Dict[str, Any]
+        order_data: Dict[str, Any],
+        broker: BaseBroker = None,
+        positions: Optional[List[Dict[str, Any]]] = None,
+        priority: DispatchPriority = DispatchPriority.LEADER
     ) -> None:
-        """Validate order against risk management rules"""
+        """
+        Validate order against risk management rules
+        
+        Checks run against the in-memory exposure ledger, which is reloaded
+        from the positions the caller fetched under the account lock, so fills
+        placed by other workers are included. The broker is only asked for
+        what is missing: positions if the caller has none and the ledger is
+        stale, and the day P&L if the daily loss check needs it and it is
+        stale.
+        """
         try:
-            # Get broker instance
-            broker = BaseBroker.get_broker_instance(account.broker_id, self.db)
+            account_id = account.account_id
+            refresh_day_pnl = bool(strategy.max_daily_loss) and exposure_ledger.day_pnl_is_stale(account_id)
+            if positions is None and (refresh_day_pnl or exposure_ledger.is_stale(account_id)):
+                if broker is None:
+                    broker = BaseBroker.get_broker_instance(account.broker_id, self.db)
+                positions = await order_dispatcher.submit(
+                    account.broker_id, priority, broker.get_positions, account
+                )
 
-            # Get account positions
-            positions = await broker.get_positions(account)
-            
-            # Check position size limits
-            if strategy.max_position_size:
-                current_position = sum(
-                    abs(float(p["quantity"]))
-                    for p in positions
-                    if p["symbol"] == order_data["symbol"]  # Use the already validated symbol from order_data
+            account_status = None
+            if refresh_day_pnl:
+                if broker is None:
+                    broker = BaseBroker.get_broker_instance(account.broker_id, self.db)
+                account_status = await order_dispatcher.submit(
+                    account.broker_id, priority, broker.get_account_status, account
                 )
-                if current_position + order_data["quantity"] > strategy.max_position_size:
-                    raise HTTPException(
-                        status_code=400,
-                        detail="Order exceeds maximum position size"
-                    )
 
-            # Check account risk limits
-            account_status = await broker.get_account_status(account)
-            available_margin = Decimal(str(account_status.get("available_margin", 0)))
-            
-            if strategy.max_daily_loss:
-                daily_pnl = Decimal(str(account_status.get("day_pnl", 0)))
-                if abs(daily_pnl) > strategy.max_daily_loss:
-                    raise HTTPException(
-                        status_code=400,
-                        detail="Daily loss limit exceeded"
-                    )
+            if positions is not None:
+                exposure_ledger.load_snapshot(account_id, positions, account_status)
+
+            rejection = exposure_ledger.check_order(strategy, order_data)
+            if rejection:
+                raise HTTPException(
+                    status_code=400,
+                    detail=rejection
+                )
 
         except HTTPException as he:
             raise he
@@ -681,18 +784,21 @@ class StrategyProcessor:
         strategy: ActivatedStrategy,
         order_result: Dict[str, Any]
     ) -> None:
-        """Update strategy statistics after order execution"""
+        """
+        Update strategy statistics after order execution
+        
+        Deltas are coalesced by the write-behind accumulator and flushed to
+        activated_strategies in bulk, keeping the hot table free of per-order
+        row updates.
+        """
         try:
             with logging_context(strategy_id=strategy.id, order_status=order_result.get("status")):
-                strategy.total_trades += 1
-                
                 if order_result.get("status") == "filled":
-                    strategy.successful_trades += 1
+                    pnl_value = None
                     
                     # Calculate P&L if available
                     if "realized_pnl" in order_result:
                         pnl_value = Decimal(str(order_result["realized_pnl"]))
-                        strategy.total_pnl += pnl_value
                         
                         logger.log_performance_metric(
                             "strategy_pnl",
@@ -701,29 +807,15 @@ class StrategyProcessor:
                             strategy_id=strategy.id
                         )
                     
-                    # Update other metrics
-                    if strategy.total_trades > 0:
-                        strategy.win_rate = (strategy.successful_trades / strategy.total_trades) * 100
-                    
-                    logger.info(f"Strategy stats updated - successful trade",
-                               operation="stats_update",
-                               extra_context={
-                                   "total_trades": strategy.total_trades,
-                                   "successful_trades": strategy.successful_trades,
-                                   "win_rate": float(strategy.win_rate) if strategy.win_rate else 0
-                               })
+                    strategy_stats_accumulator.record_trade(strategy.id, success=True, pnl=pnl_value)
+                    logger.info(f"Strategy stats recorded - successful trade",
+                               operation="stats_update")
                     
                 else:
-                    strategy.failed_trades += 1
-                    logger.warning(f"Strategy stats updated - failed trade",
+                    strategy_stats_accumulator.record_trade(strategy.id, success=False)
+                    logger.warning(f"Strategy stats recorded - failed trade",
                                  operation="stats_update",
-                                 extra_context={
-                                     "total_trades": strategy.total_trades,
-                                     "failed_trades": strategy.failed_trades,
-                                     "order_status": order_result.get("status")
-                                 })
-
-                self.db.commit()
+                                 extra_context={"order_status": order_result.get("status")})
 
         except Exception as e:
             logger.exception(f"Error updating strategy statistics", 
@@ -0,0 +1,261 @@
+"""
+Write-Behind Aggregation for Strategy Performance Stats
+
+Coalesces per-strategy trade outcome deltas in memory and applies them to
+``activated_strategies`` in a single bulk UPDATE every few seconds (or after
+N events), instead of a row-level UPDATE after every order.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Any, Optional
+
+from sqlalchemy import update, bindparam, case, func
+
+from ..db.session import SessionLocal
+from ..models.strategy import ActivatedStrategy
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class StrategyStatsDelta:
+    """Unflushed stat changes for a single strategy"""
+    total_trades: int = 0
+    successful_trades: int = 0
+    failed_trades: int = 0
+    total_pnl: Decimal = Decimal('0')
+    events: int = 0
+
+    def merge(self, other: "StrategyStatsDelta"):
+        self.events += other.events
+        self.total_trades += other.total_trades
+        self.successful_trades += other.successful_trades
+        self.failed_trades += other.failed_trades
+        self.total_pnl += other.total_pnl
+
+class StrategyStatsAccumulator:
+    """
+    In-memory accumulator for strategy performance stats
+
+    Usage:
+        strategy_stats_accumulator.record_trade(strategy.id, success=True, pnl=pnl)
+    """
+
+    def __init__(self, flush_interval: float = 5.0, flush_threshold: int = 200):
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self._pending: Dict[int, StrategyStatsDelta] = {}
+        self._pending_events = 0
+        self._lock = threading.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._threshold_flush: Optional[asyncio.Task] = None
+        self._running = False
+
+        # Stats
+        self._flushes = 0
+        self._rows_flushed = 0
+        self._flush_errors = 0
+        self._last_flush_at: Optional[float] = None
+        self._last_flush_duration: Optional[float] = None
+
+    def record_trade(
+        self,
+        strategy_id: Optional[int],
+        success: bool,
+        pnl: Optional[Decimal] = None
+    ):
+        """Record the outcome of one order against a strategy (no I/O)"""
+        if strategy_id is None:
+            # Transient per-account strategies built for group execution have no row
+            return
+
+        with self._lock:
+            delta = self._pending.get(strategy_id)
+            if delta is None:
+                delta = self._pending[strategy_id] = StrategyStatsDelta()
+
+            delta.events += 1
+            delta.total_trades += 1
+            if success:
+                delta.successful_trades += 1
+                if pnl is not None:
+                    delta.total_pnl += pnl
+            else:
+                delta.failed_trades += 1
+
+            self._pending_events += 1
+            threshold_reached = self._pending_events >= self.flush_threshold
+
+        if threshold_reached and self._running and (
+            self._threshold_flush is None or self._threshold_flush.done()
+        ):
+            self._threshold_flush = asyncio.get_running_loop().create_task(
+                asyncio.to_thread(self.flush)
+            )
+
+    def record_failure(self, strategy_id: Optional[int]):
+        """Record a failed trade that never produced an order"""
+        if strategy_id is None:
+            return
+
+        with self._lock:
+            delta = self._pending.get(strategy_id)
+            if delta is None:
+                delta = self._pending[strategy_id] = StrategyStatsDelta()
+            delta.events += 1
+            delta.failed_trades += 1
+            self._pending_events += 1
+
+    def _take_pending(self) -> Dict[int, StrategyStatsDelta]:
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+            self._pending_events = 0
+        return pending
+
+    def _restore_pending(self, pending: Dict[int, StrategyStatsDelta]):
+        """Merge a batch that failed to flush back into the pending deltas"""
+        with self._lock:
+            for strategy_id, delta in pending.items():
+                current = self._pending.get(strategy_id)
+                if current is None:
+                    self._pending[strategy_id] = delta
+                else:
+                    current.merge(delta)
+                self._pending_events += delta.events
+
+    def flush(self) -> int:
+        """
+        Apply all pending deltas in one bulk UPDATE
+
+        Returns:
+            int: Number of strategy rows updated
+        """
+        pending = self._take_pending()
+        if not pending:
+            return 0
+
+        table = ActivatedStrategy.__table__
+        c = table.c
+        new_total = func.coalesce(c.total_trades, 0) + bindparam("d_total")
+        new_successful = func.coalesce(c.successful_trades, 0) + bindparam("d_successful")
+
+        stmt = (
+            update(table)
+            .where(c.id == bindparam("b_id"))
+            .values(
+                total_trades=new_total,
+                successful_trades=new_successful,
+                failed_trades=func.coalesce(c.failed_trades, 0) + bindparam("d_failed"),
+                total_pnl=func.coalesce(c.total_pnl, 0) + bindparam("d_pnl"),
+                win_rate=case(
+                    (new_total > 0, new_successful * 100.0 / new_total),
+                    else_=c.win_rate
+                )
+            )
+        )
+        params = [
+            {
+                "b_id": strategy_id,
+                "d_total": delta.total_trades,
+                "d_successful": delta.successful_trades,
+                "d_failed": delta.failed_trades,
+                "d_pnl": delta.total_pnl
+            }
+            for strategy_id, delta in pending.items()
+        ]
+
+        start_time = time.time()
+        db = SessionLocal()
+        try:
+            db.execute(stmt, params)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            self._flush_errors += 1
+            self._restore_pending(pending)
+            logger.error(f"Failed to flush strategy stats for {len(pending)} strategies: {e}")
+            return 0
+        finally:
+            db.close()
+
+        self._flushes += 1
+        self._rows_flushed += len(params)
+        self._last_flush_at = time.time()
+        self._last_flush_duration = self._last_flush_at - start_time
+        logger.debug(f"Flushed strategy stats for {len(params)} strategies in {self._last_flush_duration:.3f}s")
+        return len(params)
+
+    async def start(self):
+        """Start the periodic flush loop"""
+        if self._running:
+            return
+
+        self._running = True
+        self._flush_task = asyncio.create_task(self._flush_loop())
+        logger.info("Strategy stats accumulator started")
+
+    async def stop(self):
+        """Stop the flush loop and flush whatever is still pending"""
+        self._running = False
+        for task in (self._flush_task, self._threshold_flush):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._flush_task = None
+        self._threshold_flush = None
+
+        flushed = self.flush()
+        logger.info(f"Strategy stats accumulator stopped (final flush: {flushed} strategies)")
+
+    async def _flush_loop(self):
+        """Flush pending deltas every flush_interval seconds"""
+        try:
+            while self._running:
+                await asyncio.sleep(self.flush_interval)
+                await asyncio.to_thread(self.flush)
+        except asyncio.CancelledError:
+            pass
+
+    def get_pending(self, strategy_id: int) -> Optional[StrategyStatsDelta]:
+        """Get unflushed deltas for a strategy, if any"""
+        with self._lock:
+            return self._pending.get(strategy_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get accumulator statistics including unflushed counts"""
+        with self._lock:
+            unflushed = {
+                strategy_id: {
+                    "total_trades": delta.total_trades,
+                    "successful_trades": delta.successful_trades,
+                    "failed_trades": delta.failed_trades,
+                    "total_pnl": float(delta.total_pnl)
+                }
+                for strategy_id, delta in self._pending.items()
+            }
+            pending_events = self._pending_events
+
+        return {
+            "running": self._running,
+            "flush_interval": self.flush_interval,
+            "flush_threshold": self.flush_threshold,
+            "pending_events": pending_events,
+            "pending_strategies": len(unflushed),
+            "unflushed": unflushed,
+            "flushes": self._flushes,
+            "rows_flushed": self._rows_flushed,
+            "flush_errors": self._flush_errors,
+            "last_flush_at": self._last_flush_at,
+            "last_flush_duration": self._last_flush_duration
+        }
+
+# Global strategy stats accumulator instance
+strategy_stats_accumulator = StrategyStatsAccumulator()
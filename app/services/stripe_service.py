@@ -1,4 +1,3 @@
-import stripe
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 from typing import Dict, Any, Optional
@@ -8,12 +7,19 @@ from datetime import datetime
 from ..models.subscription import Subscription
 from ..models.user import User
 from ..core.config import settings
+from ..core.lazy_imports import lazy_module
+from .subscription_presence import subscription_presence
 
 logger = logging.getLogger(__name__)
 
+def _configure_stripe(module):
+    module.api_key = settings.STRIPE_SECRET_KEY
+
+# The Stripe SDK is only imported (and given the API key) on first use
+stripe = lazy_module("stripe", on_load=_configure_stripe)
+
 class StripeService:
     def __init__(self):
-        stripe.api_key = settings.STRIPE_SECRET_KEY
         self.logger = logging.getLogger(__name__)
 
     async def verify_subscription_status(self, customer_id: str) -> bool:
@@ -292,8 +298,11 @@ class StripeService:
                     Subscription.stripe_customer_id == customer_id
                 ).first()
                 if subscription:
+                    user_email = subscription.user.email if subscription.user else None
                     db.delete(subscription)
                     db.commit()
+                    if user_email:
+                        subscription_presence.forget(user_email)
                     self.logger.info(f"Removed deleted customer {customer_id} from database")
 
             elif event_type == "customer.updated":
@@ -0,0 +1,160 @@
+"""
+Subscription Presence Cache
+
+Every authenticated API request must belong to a user with a subscription
+row (a starter subscription is created for users that lack one). Users
+known to have one are remembered by token subject, in a small in-process
+LRU and in a Redis set shared by all workers, so the check normally costs
+no database queries. Only a miss in both looks the user up, and the rare
+user without a subscription gets one created.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any
+
+from redis.exceptions import RedisError
+from sqlalchemy.orm import Session
+
+from ..core.redis_manager import get_redis_connection
+from ..db.session import SessionLocal
+from ..models.subscription import Subscription
+from ..models.user import User
+
+logger = logging.getLogger(__name__)
+
+PRESENCE_KEY = "subscriptions:present_subjects"
+
+class SubscriptionPresenceCache:
+    """
+    Remembers which token subjects (user emails) have a subscription
+
+    Usage:
+        if not subscription_presence.is_known(email):
+            await asyncio.to_thread(subscription_presence.ensure, email)
+    """
+
+    def __init__(self, max_entries: int = 10000, local_ttl: int = 300):
+        self.max_entries = max_entries
+        # Local entries expire so a forget() on another worker is honoured eventually
+        self.local_ttl = local_ttl
+        self._local: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Stats
+        self._local_hits = 0
+        self._redis_hits = 0
+        self._db_checks = 0
+        self._created = 0
+
+    def is_known(self, subject: str) -> bool:
+        """Check the in-process LRU only (never blocks)"""
+        with self._lock:
+            expires_at = self._local.get(subject)
+            if expires_at is None:
+                return False
+            if expires_at < time.monotonic():
+                del self._local[subject]
+                return False
+            self._local.move_to_end(subject)
+            self._local_hits += 1
+            return True
+
+    def _remember_local(self, subject: str):
+        with self._lock:
+            self._local[subject] = time.monotonic() + self.local_ttl
+            self._local.move_to_end(subject)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+
+    def _is_published(self, subject: str) -> bool:
+        with get_redis_connection() as redis_client:
+            if not redis_client:
+                return False
+            try:
+                return bool(redis_client.sismember(PRESENCE_KEY, subject))
+            except RedisError as e:
+                logger.warning(f"Failed to read subscription presence: {e}")
+                return False
+
+    def _publish(self, subject: str):
+        with get_redis_connection() as redis_client:
+            if not redis_client:
+                return
+            try:
+                redis_client.sadd(PRESENCE_KEY, subject)
+            except RedisError as e:
+                logger.warning(f"Failed to publish subscription presence: {e}")
+
+    def _ensure_in_db(self, db: Session, subject: str) -> bool:
+        """Create a starter subscription if the user has none; False if there is no such user"""
+        row = db.query(User.id, Subscription.id).outerjoin(
+            Subscription, Subscription.user_id == User.id
+        ).filter(User.email == subject).first()
+        if row is None:
+            return False
+
+        user_id, subscription_id = row
+        if subscription_id is None:
+            logger.warning(f"User {subject} had no subscription. Creating starter subscription.")
+            db.add(Subscription(
+                user_id=user_id,
+                tier="starter",
+                status="active",
+                is_lifetime=False,
+                created_at=datetime.utcnow(),
+                updated_at=datetime.utcnow()
+            ))
+            db.commit()
+            self._created += 1
+            logger.info(f"Created starter subscription for user {subject}")
+        return True
+
+    def ensure(self, subject: str):
+        """Make sure the user behind this token subject has a subscription (blocking)"""
+        if self.is_known(subject):
+            return
+
+        if self._is_published(subject):
+            self._redis_hits += 1
+            self._remember_local(subject)
+            return
+
+        self._db_checks += 1
+        db = SessionLocal()
+        try:
+            if not self._ensure_in_db(db, subject):
+                return
+        finally:
+            db.close()
+
+        self._publish(subject)
+        self._remember_local(subject)
+
+    def forget(self, subject: str):
+        """Drop a subject after its subscription row is deleted"""
+        with self._lock:
+            self._local.pop(subject, None)
+        with get_redis_connection() as redis_client:
+            if not redis_client:
+                return
+            try:
+                redis_client.srem(PRESENCE_KEY, subject)
+            except RedisError as e:
+                logger.warning(f"Failed to clear subscription presence: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        return {
+            "local_entries": len(self._local),
+            "local_hits": self._local_hits,
+            "redis_hits": self._redis_hits,
+            "db_checks": self._db_checks,
+            "subscriptions_created": self._created
+        }
+
+# Global subscription presence cache instance
+subscription_presence = SubscriptionPresenceCache()
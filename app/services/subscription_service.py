@@ -1,6 +1,5 @@
 from typing import Dict, Any, Optional, List, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 import logging
 from datetime import datetime, timedelta
 
@@ -12,10 +11,8 @@ from app.core.subscription_tiers import (
     get_tier_display_name
 )
 from app.models.subscription import Subscription
-from app.models.broker import BrokerAccount
-from app.models.webhook import Webhook
-from app.models.strategy import ActivatedStrategy
 from app.models.user import User
+from app.services.resource_counters import resource_counters
 
 logger = logging.getLogger(__name__)
 
@@ -42,55 +39,12 @@ class SubscriptionService:
     def count_user_resources(self, user_id: int) -> Dict[str, int]:
         """
         Count all resources currently used by a user
-        Uses stored counters when available for better performance
+        Served from the Redis resource counters, seeded from the database when missing
         
         Returns:
             Dict with counts of connected_accounts, active_webhooks, and active_strategies
         """
-        # Try to get counts from subscription first
-        subscription = self.get_user_subscription(user_id)
-        
-        if subscription and all(counter is not None for counter in [
-            subscription.connected_accounts_count,
-            subscription.active_webhooks_count,
-            subscription.active_strategies_count
-        ]):
-            # Use stored counters if available
-            return {
-                "connected_accounts": subscription.connected_accounts_count,
-                "active_webhooks": subscription.active_webhooks_count,
-                "active_strategies": subscription.active_strategies_count
-            }
-        
-        # Fall back to counting from database if counters aren't available
-        connected_accounts = self.db.query(func.count(BrokerAccount.id)).filter(
-            BrokerAccount.user_id == user_id,
-            BrokerAccount.is_active == True,
-            BrokerAccount.is_deleted == False
-        ).scalar() or 0
-        
-        active_webhooks = self.db.query(func.count(Webhook.id)).filter(
-            Webhook.user_id == user_id,
-            Webhook.is_active == True
-        ).scalar() or 0
-        
-        active_strategies = self.db.query(func.count(ActivatedStrategy.id)).filter(
-            ActivatedStrategy.user_id == user_id,
-            ActivatedStrategy.is_active == True
-        ).scalar() or 0
-        
-        # If subscription exists but counters aren't set, update them
-        if subscription:
-            subscription.connected_accounts_count = connected_accounts
-            subscription.active_webhooks_count = active_webhooks
-            subscription.active_strategies_count = active_strategies
-            self.db.commit()
-        
-        return {
-            "connected_accounts": connected_accounts,
-            "active_webhooks": active_webhooks,
-            "active_strategies": active_strategies
-        }
+        return resource_counters.get(self.db, user_id)
     
     def can_add_resource(self, user_id: int, resource: str) -> Tuple[bool, str]:
         """
@@ -108,7 +62,7 @@ class SubscriptionService:
         if subscription and subscription.is_lifetime and subscription.status == "active":
             return True, f"Unlimited access (lifetime user)"
         
-        tier = self.get_user_tier(user_id)
+        tier = subscription.tier if subscription else SubscriptionTier.STARTER
         resources = self.count_user_resources(user_id)
         
         current_count = resources.get(resource, 0)
@@ -222,22 +176,11 @@ class SubscriptionService:
             Dict with updated resource counts
         """
         try:
-            # Get actual counts from database
-            connected_accounts = self.db.query(func.count(BrokerAccount.id)).filter(
-                BrokerAccount.user_id == user_id,
-                BrokerAccount.is_active == True,
-                BrokerAccount.is_deleted == False
-            ).scalar() or 0
-            
-            active_webhooks = self.db.query(func.count(Webhook.id)).filter(
-                Webhook.user_id == user_id,
-                Webhook.is_active == True
-            ).scalar() or 0
-            
-            active_strategies = self.db.query(func.count(ActivatedStrategy.id)).filter(
-                ActivatedStrategy.user_id == user_id,
-                ActivatedStrategy.is_active == True
-            ).scalar() or 0
+            # Get actual counts from database and reseed the Redis counters
+            counts = resource_counters.recount(self.db, user_id)
+            connected_accounts = counts["connected_accounts"]
+            active_webhooks = counts["active_webhooks"]
+            active_strategies = counts["active_strategies"]
             
             # Get subscription and update counts
             subscription = self.get_user_subscription(user_id)
@@ -0,0 +1,247 @@
+# app/services/trade_rollups.py
+"""
+Daily performance rollups for closed trades
+
+Every closed trade is folded into one row per (user, strategy, symbol, day)
+in the same transaction that closes it, so performance summaries aggregate
+O(days) rollup rows instead of loading O(trades) trade records. Existing
+history is rebuilt with ``backfill_rollups`` (see app/db/backfill_trade_rollups.py).
+"""
+import logging
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, case, func
+from sqlalchemy import insert as sa_insert
+from sqlalchemy.orm import Session
+
+from ..models.trade import Trade, TradeDailyRollup
+
+logger = logging.getLogger(__name__)
+
+UNATTRIBUTED_STRATEGY_ID = 0
+
+_KEY_COLUMNS = ["user_id", "strategy_id", "symbol", "trade_date"]
+
+
+def _dialect_insert(db: Session):
+    """Dialect insert construct supporting ON CONFLICT, if the backend has one"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+        return insert
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+        return insert
+    return None
+
+
+def _rollup_delta(trade: Trade) -> Dict[str, Any]:
+    """Rollup row contribution of a single closed trade"""
+    pnl = Decimal(str(trade.realized_pnl or 0))
+    close_time = trade.close_time or datetime.utcnow()
+    return {
+        "user_id": trade.user_id,
+        "strategy_id": trade.strategy_id or UNATTRIBUTED_STRATEGY_ID,
+        "symbol": trade.symbol,
+        "trade_date": close_time.date(),
+        "trade_count": 1,
+        "winning_trades": 1 if pnl > 0 else 0,
+        "losing_trades": 1 if pnl < 0 else 0,
+        "total_pnl": pnl,
+        "gross_profit": pnl if pnl > 0 else Decimal("0"),
+        "gross_loss": -pnl if pnl < 0 else Decimal("0"),
+        "max_win": pnl if pnl > 0 else None,
+        "max_loss": pnl if pnl < 0 else None,
+        "updated_at": datetime.utcnow(),
+    }
+
+
+def _merge_extreme(current, incoming, prefer_incoming):
+    """SQL expression keeping the more extreme of two nullable values"""
+    return case(
+        (incoming.is_(None), current),
+        (current.is_(None), incoming),
+        (prefer_incoming, incoming),
+        else_=current
+    )
+
+
+def apply_closed_trade(db: Session, trade: Trade) -> None:
+    """
+    Fold a closed trade into its daily rollup row
+
+    Runs inside the caller's transaction and does not commit, so the rollup
+    is persisted atomically with the trade close.
+    """
+    delta = _rollup_delta(trade)
+    insert = _dialect_insert(db)
+
+    if insert is None:
+        _apply_closed_trade_locked(db, delta)
+        return
+
+    table = TradeDailyRollup.__table__
+    stmt = insert(table).values(**delta)
+    excluded = stmt.excluded
+    stmt = stmt.on_conflict_do_update(
+        index_elements=_KEY_COLUMNS,
+        set_={
+            "trade_count": table.c.trade_count + excluded.trade_count,
+            "winning_trades": table.c.winning_trades + excluded.winning_trades,
+            "losing_trades": table.c.losing_trades + excluded.losing_trades,
+            "total_pnl": table.c.total_pnl + excluded.total_pnl,
+            "gross_profit": table.c.gross_profit + excluded.gross_profit,
+            "gross_loss": table.c.gross_loss + excluded.gross_loss,
+            "max_win": _merge_extreme(table.c.max_win, excluded.max_win, excluded.max_win > table.c.max_win),
+            "max_loss": _merge_extreme(table.c.max_loss, excluded.max_loss, excluded.max_loss < table.c.max_loss),
+            "updated_at": excluded.updated_at,
+        }
+    )
+    db.execute(stmt)
+
+
+def _apply_closed_trade_locked(db: Session, delta: Dict[str, Any]) -> None:
+    """Read-modify-write fallback for backends without ON CONFLICT"""
+    rollup = db.query(TradeDailyRollup).filter(
+        and_(*(getattr(TradeDailyRollup, column) == delta[column] for column in _KEY_COLUMNS))
+    ).with_for_update().first()
+
+    if rollup is None:
+        db.add(TradeDailyRollup(**delta))
+        return
+
+    rollup.trade_count += delta["trade_count"]
+    rollup.winning_trades += delta["winning_trades"]
+    rollup.losing_trades += delta["losing_trades"]
+    rollup.total_pnl += delta["total_pnl"]
+    rollup.gross_profit += delta["gross_profit"]
+    rollup.gross_loss += delta["gross_loss"]
+    if delta["max_win"] is not None and (rollup.max_win is None or delta["max_win"] > rollup.max_win):
+        rollup.max_win = delta["max_win"]
+    if delta["max_loss"] is not None and (rollup.max_loss is None or delta["max_loss"] < rollup.max_loss):
+        rollup.max_loss = delta["max_loss"]
+    rollup.updated_at = delta["updated_at"]
+
+
+def backfill_rollups(db: Session, user_id: Optional[int] = None) -> int:
+    """
+    Rebuild rollups from the trades table with one INSERT ... SELECT
+
+    Existing rollups in scope (one user, or everyone) are replaced. Does not
+    commit. Returns the number of rollup rows written.
+    """
+    pnl = func.coalesce(Trade.realized_pnl, 0)
+
+    filters = [Trade.status == "closed", Trade.close_time.isnot(None)]
+    if user_id is not None:
+        filters.append(Trade.user_id == user_id)
+
+    trade_date = func.date(Trade.close_time)
+    strategy_id = func.coalesce(Trade.strategy_id, UNATTRIBUTED_STRATEGY_ID)
+
+    aggregate = db.query(
+        Trade.user_id,
+        strategy_id,
+        Trade.symbol,
+        trade_date,
+        func.count(Trade.id),
+        func.sum(case((pnl > 0, 1), else_=0)),
+        func.sum(case((pnl < 0, 1), else_=0)),
+        func.sum(pnl),
+        func.sum(case((pnl > 0, pnl), else_=0)),
+        func.sum(case((pnl < 0, -pnl), else_=0)),
+        func.max(case((pnl > 0, pnl))),
+        func.min(case((pnl < 0, pnl))),
+        func.current_timestamp(),
+    ).filter(*filters).group_by(
+        Trade.user_id, strategy_id, Trade.symbol, trade_date
+    )
+
+    delete_query = db.query(TradeDailyRollup)
+    if user_id is not None:
+        delete_query = delete_query.filter(TradeDailyRollup.user_id == user_id)
+    delete_query.delete(synchronize_session=False)
+
+    result = db.execute(
+        sa_insert(TradeDailyRollup).from_select(
+            [
+                "user_id", "strategy_id", "symbol", "trade_date",
+                "trade_count", "winning_trades", "losing_trades",
+                "total_pnl", "gross_profit", "gross_loss",
+                "max_win", "max_loss", "updated_at",
+            ],
+            aggregate.statement
+        )
+    )
+    return result.rowcount or 0
+
+
+def get_daily_rollups(
+    db: Session,
+    user_id: int,
+    since_date: date,
+    strategy_id: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Per-day totals for a user since a date (inclusive), oldest first"""
+    filters = [
+        TradeDailyRollup.user_id == user_id,
+        TradeDailyRollup.trade_date >= since_date
+    ]
+    if strategy_id is not None:
+        filters.append(TradeDailyRollup.strategy_id == strategy_id)
+
+    rows = db.query(
+        TradeDailyRollup.trade_date,
+        func.sum(TradeDailyRollup.trade_count),
+        func.sum(TradeDailyRollup.winning_trades),
+        func.sum(TradeDailyRollup.losing_trades),
+        func.sum(TradeDailyRollup.total_pnl),
+        func.sum(TradeDailyRollup.gross_profit),
+        func.sum(TradeDailyRollup.gross_loss),
+        func.max(TradeDailyRollup.max_win),
+        func.min(TradeDailyRollup.max_loss),
+    ).filter(*filters).group_by(
+        TradeDailyRollup.trade_date
+    ).order_by(TradeDailyRollup.trade_date).all()
+
+    return [
+        {
+            "trade_date": _as_date(trade_date),
+            "trade_count": int(trade_count or 0),
+            "winning_trades": int(winning or 0),
+            "losing_trades": int(losing or 0),
+            "total_pnl": float(total_pnl or 0),
+            "gross_profit": float(gross_profit or 0),
+            "gross_loss": float(gross_loss or 0),
+            "max_win": float(max_win) if max_win is not None else None,
+            "max_loss": float(max_loss) if max_loss is not None else None,
+        }
+        for trade_date, trade_count, winning, losing, total_pnl, gross_profit, gross_loss, max_win, max_loss in rows
+    ]
+
+
+def summarize_days(days: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine per-day rollups into period totals"""
+    max_wins = [day["max_win"] for day in days if day["max_win"] is not None]
+    max_losses = [day["max_loss"] for day in days if day["max_loss"] is not None]
+    return {
+        "trade_count": sum(day["trade_count"] for day in days),
+        "winning_trades": sum(day["winning_trades"] for day in days),
+        "losing_trades": sum(day["losing_trades"] for day in days),
+        "total_pnl": sum(day["total_pnl"] for day in days),
+        "gross_profit": sum(day["gross_profit"] for day in days),
+        "gross_loss": sum(day["gross_loss"] for day in days),
+        "max_win": max(max_wins) if max_wins else None,
+        "max_loss": min(max_losses) if max_losses else None,
+    }
+
+
+def _as_date(value) -> date:
+    # SQLite returns aggregated DATE columns as ISO strings
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    if isinstance(value, datetime):
+        return value.date()
+    return value
@@ -5,7 +5,7 @@ Updated: Cache busting
 """
 
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime, timedelta
 from decimal import Decimal
 from sqlalchemy.orm import Session
@@ -15,6 +15,7 @@ from ..models.trade import Trade, TradeExecution
 from ..models.strategy import ActivatedStrategy
 from ..models.user import User
 from ..models.order import Order
+from .trade_rollups import apply_closed_trade, get_daily_rollups, summarize_days
 
 logger = logging.getLogger(__name__)
 
@@ -177,6 +178,9 @@ class TradeService:
                 close_time=datetime.utcnow()
             )
             
+            # Fold into the daily rollup in the same transaction
+            apply_closed_trade(self.db, trade)
+            
             self.db.commit()
             self.db.refresh(trade)
             
@@ -202,6 +206,41 @@ class TradeService:
             logger.error(f"Error getting live trades: {str(e)}")
             return []
     
+    def _historical_trades_query(
+        self,
+        user_id: int,
+        symbol: Optional[str] = None,
+        strategy_id: Optional[int] = None,
+        days_back: Optional[int] = None,
+        profitable_only: Optional[bool] = None
+    ):
+        """Build the filtered query for closed trades (served by idx_trades_user_status_close)"""
+        # Trades without a close_time have no place in the keyset order
+        query = self.db.query(Trade).filter(
+            Trade.user_id == user_id,
+            Trade.status == "closed",
+            Trade.close_time.isnot(None)
+        )
+        
+        # Apply filters
+        if symbol:
+            query = query.filter(Trade.symbol == symbol)
+        
+        if strategy_id:
+            query = query.filter(Trade.strategy_id == strategy_id)
+        
+        if days_back:
+            cutoff_date = datetime.utcnow() - timedelta(days=days_back)
+            query = query.filter(Trade.close_time >= cutoff_date)
+        
+        if profitable_only is not None:
+            if profitable_only:
+                query = query.filter(Trade.realized_pnl > 0)
+            else:
+                query = query.filter(Trade.realized_pnl <= 0)
+        
+        return query
+    
     async def get_historical_trades(
         self,
         user_id: int,
@@ -209,7 +248,9 @@ class TradeService:
         strategy_id: Optional[int] = None,
         days_back: Optional[int] = None,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        profitable_only: Optional[bool] = None,
+        before: Optional[Tuple[datetime, int]] = None
     ) -> List[Trade]:
         """
         Get historical (closed) trades with filtering options.
@@ -220,40 +261,57 @@ class TradeService:
             strategy_id: Optional strategy filter
             days_back: Optional number of days to look back
             limit: Maximum number of results
-            offset: Pagination offset
+            offset: Pagination offset (ignored when ``before`` is given)
+            profitable_only: True for winners, False for losers, None for all
+            before: Keyset cursor - (close_time, id) of the last trade already seen
             
         Returns:
-            List of historical trades
+            List of historical trades, most recently closed first
         """
         try:
-            query = self.db.query(Trade).filter(
-                Trade.user_id == user_id,
-                Trade.status == "closed"
+            query = self._historical_trades_query(
+                user_id, symbol, strategy_id, days_back, profitable_only
             )
             
-            # Apply filters
-            if symbol:
-                query = query.filter(Trade.symbol == symbol)
-            
-            if strategy_id:
-                query = query.filter(Trade.strategy_id == strategy_id)
-            
-            if days_back:
-                cutoff_date = datetime.utcnow() - timedelta(days=days_back)
-                query = query.filter(Trade.close_time >= cutoff_date)
+            if before:
+                before_close_time, before_id = before
+                query = query.filter(
+                    or_(
+                        Trade.close_time < before_close_time,
+                        and_(Trade.close_time == before_close_time, Trade.id < before_id)
+                    )
+                )
             
             # Order by most recent first
-            trades = query.order_by(desc(Trade.close_time))\
-                         .limit(limit)\
-                         .offset(offset)\
-                         .all()
+            query = query.order_by(desc(Trade.close_time), desc(Trade.id)).limit(limit)
+            if not before and offset:
+                query = query.offset(offset)
             
-            return trades
+            return query.all()
             
         except Exception as e:
             logger.error(f"Error getting historical trades: {str(e)}")
             return []
     
+    async def count_historical_trades(
+        self,
+        user_id: int,
+        symbol: Optional[str] = None,
+        strategy_id: Optional[int] = None,
+        days_back: Optional[int] = None,
+        profitable_only: Optional[bool] = None
+    ) -> int:
+        """Count historical trades matching the same filters as get_historical_trades."""
+        try:
+            query = self._historical_trades_query(
+                user_id, symbol, strategy_id, days_back, profitable_only
+            )
+            return query.with_entities(func.count(Trade.id)).scalar() or 0
+            
+        except Exception as e:
+            logger.error(f"Error counting historical trades: {str(e)}")
+            return 0
+    
     async def get_trade_by_id(self, trade_id: int, user_id: int) -> Optional[Trade]:
         """Get a specific trade by ID with user ownership check."""
         try:
@@ -269,18 +327,14 @@ class TradeService:
             return None
     
     async def get_trade_performance_summary(self, user_id: int, days_back: int = 30) -> Dict[str, Any]:
-        """Get comprehensive trade performance metrics for a user."""
+        """Get comprehensive trade performance metrics for a user (from daily rollups)."""
         try:
-            cutoff_date = datetime.utcnow() - timedelta(days=days_back)
+            since_date = (datetime.utcnow() - timedelta(days=days_back)).date()
             
-            # Get closed trades in the period
-            trades = self.db.query(Trade).filter(
-                Trade.user_id == user_id,
-                Trade.status == "closed",
-                Trade.close_time >= cutoff_date
-            ).all()
+            # Aggregate the per-day rollups in the period
+            totals = summarize_days(get_daily_rollups(self.db, user_id, since_date))
             
-            if not trades:
+            if not totals["trade_count"]:
                 return {
                     "total_trades": 0,
                     "winning_trades": 0,
@@ -296,25 +350,24 @@ class TradeService:
                 }
             
             # Calculate metrics
-            total_trades = len(trades)
-            winning_trades = [t for t in trades if t.realized_pnl and t.realized_pnl > 0]
-            losing_trades = [t for t in trades if t.realized_pnl and t.realized_pnl < 0]
+            total_trades = totals["trade_count"]
+            winning_trades = totals["winning_trades"]
+            losing_trades = totals["losing_trades"]
             
-            total_pnl = sum(float(t.realized_pnl or 0) for t in trades)
-            total_wins = sum(float(t.realized_pnl or 0) for t in winning_trades)
-            total_losses = abs(sum(float(t.realized_pnl or 0) for t in losing_trades))
+            total_wins = totals["gross_profit"]
+            total_losses = totals["gross_loss"]
             
             return {
                 "total_trades": total_trades,
-                "winning_trades": len(winning_trades),
-                "losing_trades": len(losing_trades),
-                "win_rate": (len(winning_trades) / total_trades * 100) if total_trades > 0 else 0,
-                "total_pnl": total_pnl,
-                "average_win": (total_wins / len(winning_trades)) if winning_trades else 0,
-                "average_loss": (total_losses / len(losing_trades)) if losing_trades else 0,
+                "winning_trades": winning_trades,
+                "losing_trades": losing_trades,
+                "win_rate": (winning_trades / total_trades * 100) if total_trades > 0 else 0,
+                "total_pnl": totals["total_pnl"],
+                "average_win": (total_wins / winning_trades) if winning_trades else 0,
+                "average_loss": (total_losses / losing_trades) if losing_trades else 0,
                 "profit_factor": (total_wins / total_losses) if total_losses > 0 else 999.99 if total_wins > 0 else 0,
-                "max_win": max((float(t.realized_pnl or 0) for t in winning_trades), default=0),
-                "max_loss": min((float(t.realized_pnl or 0) for t in losing_trades), default=0),
+                "max_win": totals["max_win"] or 0,
+                "max_loss": totals["max_loss"] or 0,
                 "period_days": days_back
             }
             
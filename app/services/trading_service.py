@@ -10,6 +10,8 @@ from app.models.order import Order, OrderStatus, OrderSide, OrderType
 from app.models.broker import BrokerAccount
 from app.core.brokers.base import BaseBroker
 from app.core.subscription_tiers import SubscriptionTier
+from app.services.exposure_ledger import exposure_ledger
+from app.core.order_dispatcher import order_dispatcher, DispatchPriority
 
 logger = logging.getLogger(__name__)
 
@@ -147,8 +149,14 @@ class OrderStatusMonitoringService:
                 # Get broker instance
                 broker = BaseBroker.get_broker_instance(account.broker_id, db)
                 
-                # Call get_order_status (need to implement in TradovateBroker)
-                status_result = await broker.get_order_status(account, order_id)
+                # Status polls only use broker capacity left over by the trading path
+                status_result = await order_dispatcher.submit(
+                    account.broker_id,
+                    DispatchPriority.BACKGROUND,
+                    broker.get_order_status,
+                    account,
+                    order_id
+                )
                 
                 # Update the order in database
                 order = db.query(Order).get(monitor_data["order_db_id"])
@@ -176,6 +184,16 @@ class OrderStatusMonitoringService:
                     # Save changes
                     db.commit()
                     
+                    # Feed fills into the pre-trade exposure ledger
+                    exposure_ledger.on_order_update(
+                        account.account_id,
+                        order_id,
+                        status_result.get("status", ""),
+                        status_result.get("filled_quantity"),
+                        status_result.get("average_price"),
+                        status_result.get("realized_pnl")
+                    )
+                    
                     # Log status change
                     if old_status != order.status:
                         logger.info(f"Order {order_id} status changed: {old_status} -> {order.status}")
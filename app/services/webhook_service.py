@@ -21,6 +21,7 @@ from ..core.correlation import CorrelationManager
 from ..core.enhanced_logging import get_enhanced_logger, logging_context, operation_logging
 from ..core.alert_manager import TradingAlerts
 from ..core.graceful_shutdown import shutdown_manager
+from .order_dedupe import webhook_event_id, generate_client_order_id, order_dedupe_index
 
 logger = get_enhanced_logger(__name__)
 
@@ -29,17 +30,9 @@ class WebhookProcessor:
         self.db = db
         self.strategy_processor = StrategyProcessor(db)
     
-    def _generate_idempotency_key(self, webhook_id: int, payload: Dict[str, Any]) -> str:
-        """Generate idempotency key from webhook ID and payload content"""
-        key_data = {
-            "webhook_id": webhook_id,
-            "action": payload.get("action"),
-            "timestamp": payload.get("timestamp", ""),
-            "source": payload.get("source", "")
-        }
-        key_string = json.dumps(key_data, sort_keys=True)
-        key_hash = hashlib.sha256(key_string.encode()).hexdigest()
-        return f"webhook_idempotency:{webhook_id}:{key_hash[:16]}"
+    def _generate_idempotency_key(self, webhook_id: int, event_id: str) -> str:
+        """Generate idempotency key from webhook ID and the webhook event id"""
+        return f"webhook_idempotency:{webhook_id}:{event_id[:16]}"
     
     def _check_and_set_idempotency(self, key: str, response_data: Dict[str, Any], ttl: int = 300) -> Optional[Dict[str, Any]]:
         """Check if request is duplicate and set idempotency key. Returns existing response if duplicate."""
@@ -146,7 +139,8 @@ class WebhookProcessor:
         """Internal webhook processing with enhanced error handling"""
         
         # Check for duplicate request using idempotency protection
-        idempotency_key = self._generate_idempotency_key(webhook.id, payload)
+        event_id = webhook_event_id(webhook.id, payload, start_time)
+        idempotency_key = self._generate_idempotency_key(webhook.id, event_id)
         
         # Create response structure for caching
         processing_response = {
@@ -198,6 +192,7 @@ class WebhookProcessor:
                                 "quantity": strategy.quantity if strategy.strategy_type == 'single' else strategy.leader_quantity,
                                 "order_type": "MARKET",  # Default to market orders for now
                                 "time_in_force": "GTC",  # Good Till Cancelled
+                                "event_id": event_id,
                             }
 
                             logger.info(f"Executing strategy {strategy.id} with signal", 
@@ -470,8 +465,9 @@ class RailwayOptimizedWebhookProcessor:
         # Essential logging only - webhook accepted
         logger.info(f"Webhook {webhook.id} accepted")
         
-        # Check for duplicate request using optimized pipeline (1 second TTL for HFT support)
-        idempotency_key = self._generate_idempotency_key(webhook.id, payload)
+        # Check for duplicate request using optimized pipeline
+        event_id = webhook_event_id(webhook.id, payload, start_time)
+        idempotency_key = self._generate_idempotency_key(webhook.id, event_id)
         
         # Pre-built response structure for faster caching (avoid repeated timestamp conversion)
         processing_response = {
@@ -482,7 +478,7 @@ class RailwayOptimizedWebhookProcessor:
             "railway_optimized": True
         }
         
-        cached_response = self._check_and_set_idempotency_pipeline(idempotency_key, processing_response, ttl=1)
+        cached_response = self._check_and_set_idempotency_pipeline(idempotency_key, processing_response, ttl=300)
         if cached_response:
             return cached_response
             
@@ -524,6 +520,7 @@ class RailwayOptimizedWebhookProcessor:
                             "quantity": strategy.quantity if strategy.strategy_type == 'single' else strategy.leader_quantity,
                             "order_type": "MARKET",
                             "time_in_force": "GTC",
+                            "event_id": event_id,
                         }
                         
                         # Process with strategy processor (this can be optimized further if needed)
@@ -568,19 +565,11 @@ class RailwayOptimizedWebhookProcessor:
                 "railway_optimized": True
             }
     
-    def _generate_idempotency_key(self, webhook_id: int, payload: Dict[str, Any]) -> str:
-        """Generate idempotency key from webhook ID and payload content"""
-        key_data = {
-            "webhook_id": webhook_id,
-            "action": payload.get("action"),
-            "timestamp": payload.get("timestamp", ""),
-            "source": payload.get("source", "")
-        }
-        key_string = json.dumps(key_data, sort_keys=True)
-        key_hash = hashlib.sha256(key_string.encode()).hexdigest()
-        return f"webhook_idempotency:{webhook_id}:{key_hash[:16]}"
+    def _generate_idempotency_key(self, webhook_id: int, event_id: str) -> str:
+        """Generate idempotency key from webhook ID and the webhook event id"""
+        return f"webhook_idempotency:{webhook_id}:{event_id[:16]}"
     
-    def _check_and_set_idempotency_pipeline(self, key: str, response_data: Dict[str, Any], ttl: int = 1) -> Optional[Dict[str, Any]]:
+    def _check_and_set_idempotency_pipeline(self, key: str, response_data: Dict[str, Any], ttl: int = 300) -> Optional[Dict[str, Any]]:
         """Optimized idempotency check using Redis pipeline with orjson for faster performance."""
         with get_redis_connection() as redis_client:
             if not redis_client:
@@ -617,7 +606,7 @@ class RailwayOptimizedWebhookProcessor:
                 except:
                     return None
     
-    def _check_and_set_idempotency(self, key: str, response_data: Dict[str, Any], ttl: int = 1) -> Optional[Dict[str, Any]]:
+    def _check_and_set_idempotency(self, key: str, response_data: Dict[str, Any], ttl: int = 300) -> Optional[Dict[str, Any]]:
         """Check if request is duplicate and set idempotency key. Returns existing response if duplicate."""
         with get_redis_connection() as redis_client:
             if not redis_client:
@@ -631,7 +620,7 @@ class RailwayOptimizedWebhookProcessor:
                     logger.info(f"Duplicate request detected for key: {key}")
                     return json.loads(existing_response)
                 
-                # Set the key with TTL (1 second for HFT support)
+                # Set the key with TTL (the key already separates repeated signals)
                 redis_client.setex(key, ttl, json.dumps(response_data))
                 return None
                 
@@ -695,13 +684,20 @@ class RailwayOptimizedWebhookProcessor:
                     "type": signal_data.get("order_type", "MARKET"),
                     "time_in_force": signal_data.get("time_in_force", "GTC"),
                 }
+                if signal_data.get("event_id"):
+                    order_data["client_order_id"] = generate_client_order_id(
+                        signal_data["event_id"], strategy.id, account.account_id
+                    )
 
                 # Log the order details
                 logger.info(f"Executing order directly via broker API", extra_context={"order_data": order_data})
 
                 # Execute order
                 try:
-                    order_result = await broker.place_order(account, order_data)
+                    order_result = await order_dedupe_index.place_once(
+                        order_data.get("client_order_id"),
+                        broker.place_order, account, order_data
+                    )
                     
                     # Log successful order execution
                     logger.info(f"Order executed successfully for strategy {strategy.id}: {order_result}")
@@ -0,0 +1,82 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Cold import of main must stay under this many seconds (override on slow runners)
+IMPORT_BUDGET_SECONDS = float(os.environ.get("MAIN_IMPORT_BUDGET_SECONDS", "3.0"))
+
+# Subsystems that are loaded on first use, never while a worker boots
+LAZY_MODULES = [
+    "stripe",
+    "jinja2",
+    "aiohttp",
+    "yaml",
+    "app.api.v1.endpoints.admin",
+    "app.api.v1.endpoints.interactivebrokers",
+    "app.api.v1.endpoints.affiliate",
+    "app.api.v1.endpoints.aria",
+    "app.services.aria_assistant",
+    "app.services.digital_ocean_server_manager",
+    "app.services.strategy_templates",
+]
+
+# Runs in a fresh interpreter so nothing is already imported; any attempt to
+# resolve a host or open a connection is recorded and refused
+IMPORT_SCRIPT = """
+import json, socket, sys, time
+
+network_calls = []
+
+def refuse(kind):
+    def blocked(*args, **kwargs):
+        network_calls.append(f"{kind}{args[:2]!r}")
+        raise OSError(f"network I/O during import: {kind}")
+    return blocked
+
+socket.getaddrinfo = refuse("getaddrinfo")
+socket.create_connection = refuse("create_connection")
+socket.socket.connect = refuse("connect")
+
+started_at = time.perf_counter()
+import main
+seconds = time.perf_counter() - started_at
+
+sys.stdout.write("\\n" + json.dumps({
+    "seconds": seconds,
+    "network_calls": network_calls,
+    "modules": sorted(sys.modules),
+}) + "\\n")
+"""
+
+
+@pytest.fixture(scope="module")
+def cold_import():
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=120
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_import_within_budget(cold_import):
+    assert cold_import["seconds"] < IMPORT_BUDGET_SECONDS, (
+        f"import main took {cold_import['seconds']:.2f}s, budget is {IMPORT_BUDGET_SECONDS:.2f}s"
+    )
+
+
+def test_no_network_io_at_import(cold_import):
+    assert cold_import["network_calls"] == []
+
+
+def test_rarely_used_subsystems_not_imported(cold_import):
+    modules = set(cold_import["modules"])
+    assert [name for name in LAZY_MODULES if name in modules] == []
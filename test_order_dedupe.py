@@ -0,0 +1,99 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.brokers.base import OrderError
+from app.core.brokers.implementations.tradovate import TradovateBroker
+from app.services.strategy_service import StrategyProcessor
+
+CLIENT_ORDER_ID = "atk-0123456789abcdef0123456789abcdef"
+
+# Response shapes of Tradovate's /order/list and /command/list
+ORDER_LIST = [
+    {"id": 9001, "accountId": 123, "contractId": 42, "timestamp": "2026-10-18T14:30:00Z",
+     "action": "Buy", "ordStatus": "Working", "archived": False},
+    {"id": 9002, "accountId": 123, "contractId": 42, "timestamp": "2026-10-18T14:31:00Z",
+     "action": "Sell", "ordStatus": "Filled", "archived": False},
+]
+COMMAND_LIST = [
+    {"id": 7001, "orderId": 9001, "clOrdId": CLIENT_ORDER_ID, "commandType": "New", "commandStatus": "ExecutionStopped"},
+    {"id": 7002, "orderId": 9002, "commandType": "New", "commandStatus": "ExecutionStopped"},
+]
+REJECTED = {"failureReason": "UnknownReason", "failureText": "Order rejected"}
+
+
+class FakeTradovate(TradovateBroker):
+    """Tradovate adapter whose HTTP calls return canned API responses."""
+
+    def __init__(self, place_responses, listed_orders=ORDER_LIST):
+        super().__init__("tradovate", None)
+        self.place_responses = list(place_responses)
+        self.listed_orders = listed_orders
+
+    def _get_auth_headers(self, credentials):
+        return {}
+
+    async def _make_request(self, method, url, data=None, headers=None, params=None):
+        if url.endswith("/order/list"):
+            return self.listed_orders
+        if url.endswith("/command/list"):
+            return COMMAND_LIST
+        response = self.place_responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture
+def account():
+    return SimpleNamespace(
+        broker_id="tradovate",
+        account_id="123",
+        name="Demo 123",
+        environment="demo",
+        user_id=1,
+        credentials=SimpleNamespace(is_valid=True)
+    )
+
+
+def place(broker, account, client_order_id, max_retries=3):
+    processor = StrategyProcessor.__new__(StrategyProcessor)
+    order_data = {
+        "account_id": account.account_id,
+        "symbol": "ESZ6",
+        "quantity": 1,
+        "side": "BUY",
+        "type": "MARKET",
+        "client_order_id": client_order_id
+    }
+    return asyncio.run(processor._execute_order_with_retry(broker, account, order_data, max_retries=max_retries))
+
+
+def test_tradovate_orders_carry_client_order_id(account):
+    orders = asyncio.run(FakeTradovate([]).get_orders(account))
+
+    assert [(order["order_id"], order["client_order_id"], order["status"]) for order in orders] == [
+        ("9001", CLIENT_ORDER_ID, "working"),
+        ("9002", None, "filled"),
+    ]
+
+
+def test_retry_rejected_as_duplicate_returns_accepted_order(account):
+    # The first attempt timed out after Tradovate accepted it; the retry is rejected
+    broker = FakeTradovate([ConnectionError("Request timed out"), REJECTED])
+
+    result = place(broker, account, CLIENT_ORDER_ID)
+
+    assert result["order_id"] == "9001"
+    assert result["deduplicated"] is True
+    assert result["client_order_id"] == CLIENT_ORDER_ID
+
+
+def test_rejection_without_accepted_order_is_not_a_duplicate(account):
+    broker = FakeTradovate([ConnectionError("Request timed out"), REJECTED], listed_orders=ORDER_LIST[1:])
+
+    with pytest.raises(OrderError) as error:
+        place(broker, account, "atk-ffffffffffffffffffffffffffffffff", max_retries=2)
+
+    assert "Order rejected" in str(error.value)
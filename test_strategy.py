@@ -0,0 +1,185 @@
+import asyncio
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.db.base  # noqa: F401 - registers the core models
+import app.models.promo_code  # noqa: F401
+from app.api.v1.endpoints import strategy as strategy_endpoints
+from app.core.config import settings
+from app.db.base_class import Base
+from app.models.broker import BrokerAccount
+from app.models.strategy import ActivatedStrategy, strategy_follower_quantities
+from app.models.user import User
+from app.models.webhook import Webhook
+from app.schemas.strategy import MultipleStrategyCreate, StrategyUpdate
+
+
+class QueryCounter:
+    """Counts statements executed on an engine."""
+
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._increment)
+
+    def _increment(self, *args):
+        self.count += 1
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(settings, "SKIP_SUBSCRIPTION_CHECK", True)
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, autoflush=False)()
+    session.counter = QueryCounter(engine)
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def seed_user(db, email: str, accounts: int):
+    """Create a user with a webhook and `accounts` active broker accounts."""
+    user = User(email=email, username=email.split("@")[0], hashed_password="x")
+    db.add(user)
+    db.flush()
+    webhook = Webhook(user_id=user.id, name="Signals")
+    db.add(webhook)
+    for i in range(accounts):
+        db.add(BrokerAccount(
+            user_id=user.id,
+            broker_id="tradovate",
+            account_id=f"{user.id}-{i}",
+            name=f"Account {i}",
+            environment="demo",
+            is_active=True
+        ))
+    db.commit()
+    return user, webhook
+
+
+def seed_strategies(db, user, webhook, singles: int, groups: int, followers_per_group: int):
+    """Create single and group strategies; group followers cycle through the user's accounts."""
+    for i in range(singles):
+        db.add(ActivatedStrategy(
+            user_id=user.id,
+            strategy_type="single",
+            webhook_id=webhook.token,
+            ticker="ES",
+            account_id=f"{user.id}-{i % 5}",
+            quantity=1
+        ))
+    for i in range(groups):
+        group = ActivatedStrategy(
+            user_id=user.id,
+            strategy_type="multiple",
+            webhook_id=webhook.token,
+            ticker="NQ",
+            leader_account_id=f"{user.id}-0",
+            leader_quantity=1,
+            group_name=f"Group {i}"
+        )
+        db.add(group)
+        db.flush()
+        db.execute(strategy_follower_quantities.insert(), [
+            {"strategy_id": group.id, "account_id": f"{user.id}-{j + 1}", "quantity": j + 1}
+            for j in range(followers_per_group)
+        ])
+    db.commit()
+
+
+def count_queries(db, coroutine_factory):
+    db.expire_all()
+    before = db.counter.count
+    result = asyncio.run(coroutine_factory())
+    return db.counter.count - before, result
+
+
+class TestStrategyQueryCounts:
+    """Strategy endpoints must issue a fixed number of queries regardless of size."""
+
+    def test_list_strategies_query_count_is_constant(self, db):
+        small_user, small_webhook = seed_user(db, "small@example.com", accounts=8)
+        seed_strategies(db, small_user, small_webhook, singles=1, groups=1, followers_per_group=2)
+
+        large_user, large_webhook = seed_user(db, "large@example.com", accounts=21)
+        seed_strategies(db, large_user, large_webhook, singles=40, groups=10, followers_per_group=20)
+
+        small_queries, small_result = count_queries(
+            db, lambda: strategy_endpoints.list_strategies(db=db, current_user=small_user)
+        )
+        large_queries, large_result = count_queries(
+            db, lambda: strategy_endpoints.list_strategies(db=db, current_user=large_user)
+        )
+
+        assert len(small_result) == 2
+        assert len(large_result) == 50
+        assert sum(len(s["follower_accounts"]) for s in large_result) == 200
+        assert large_queries == small_queries
+
+    def test_list_strategies_returns_follower_quantities(self, db):
+        user, webhook = seed_user(db, "trader@example.com", accounts=4)
+        seed_strategies(db, user, webhook, singles=0, groups=1, followers_per_group=3)
+
+        _, result = count_queries(
+            db, lambda: strategy_endpoints.list_strategies(db=db, current_user=user)
+        )
+
+        assert result[0]["follower_accounts"] == [
+            {"account_id": f"{user.id}-1", "quantity": 1},
+            {"account_id": f"{user.id}-2", "quantity": 2},
+            {"account_id": f"{user.id}-3", "quantity": 3},
+        ]
+
+    def test_activate_group_strategy_query_count_is_constant(self, db):
+        def activate(user, webhook, followers: int):
+            request = MultipleStrategyCreate(
+                strategy_type="multiple",
+                webhook_id=webhook.token,
+                ticker="ES",
+                leader_account_id=f"{user.id}-0",
+                leader_quantity=1,
+                follower_account_ids=[f"{user.id}-{i + 1}" for i in range(followers)],
+                follower_quantities=[1] * followers,
+                group_name="Group"
+            )
+            return lambda: strategy_endpoints.activate_strategy(
+                db=db, strategy=request, current_user=user
+            )
+
+        small_user, small_webhook = seed_user(db, "small@example.com", accounts=3)
+        large_user, large_webhook = seed_user(db, "large@example.com", accounts=31)
+
+        small_queries, small_result = count_queries(db, activate(small_user, small_webhook, 2))
+        large_queries, large_result = count_queries(db, activate(large_user, large_webhook, 30))
+
+        assert len(small_result.follower_accounts) == 2
+        assert len(large_result.follower_accounts) == 30
+        assert large_queries == small_queries
+
+    def test_update_follower_quantities_query_count_is_constant(self, db):
+        small_user, small_webhook = seed_user(db, "small@example.com", accounts=3)
+        seed_strategies(db, small_user, small_webhook, singles=0, groups=1, followers_per_group=2)
+        large_user, large_webhook = seed_user(db, "large@example.com", accounts=31)
+        seed_strategies(db, large_user, large_webhook, singles=0, groups=1, followers_per_group=30)
+
+        def update(user, followers: int):
+            strategy_id = db.query(ActivatedStrategy.id).filter(
+                ActivatedStrategy.user_id == user.id
+            ).scalar()
+            request = StrategyUpdate(follower_quantities=[5] * followers)
+            return lambda: strategy_endpoints.update_strategy(
+                strategy_id=strategy_id, strategy_update=request, db=db, current_user=user
+            )
+
+        small_queries, small_result = count_queries(db, update(small_user, 2))
+        large_queries, large_result = count_queries(db, update(large_user, 30))
+
+        assert [f["quantity"] for f in large_result.follower_accounts] == [5] * 30
+        assert len(small_result.follower_accounts) == 2
+        assert large_queries == small_queries